@@ -14,6 +14,13 @@ import io
 import streamlit_nested_layout
 import requests
 import json
+import threading
+from cachetools import LRUCache
+from artifact_store import ARTIFACT_DIR, artifacts_exist, load_artifacts
+from data_cache import (MIRROR_DIR, code_fingerprint, content_hash, download_json_assets, load_cached,
+                        load_latest_cached, load_mirrored_json_asset, save_cached)
+from ranking import APP_WEIGHTS, RankedCandidates, RankingCache, UncachedRanking, weights_key
+from vector_search import LOCAL_INDEX_DIR, LocalVectorIndex, build_local_index, local_index_exists
 
 # Importar Pinecone
 try:
@@ -177,7 +184,10 @@ def get_dynamic_css():
 
 # Cabeçalho personalizado
 def render_header():
-    connection_type = "GitHub + Pinecone" if st.session_state.get('pinecone_available') else "GitHub Only"
+    connection_type = {
+        'pinecone': "GitHub + Pinecone",
+        'local': "GitHub + Índice Local"
+    }.get(st.session_state.get('vector_backend'), "GitHub Only")
     st.markdown(f"""
     <div class="header">
         <h1 style="margin-bottom: 0.5rem;">Decision Recruiter</h1>
@@ -254,118 +264,271 @@ def init_pinecone():
         st.warning(f"⚠️ Pinecone não disponível: {e}")
         return None
 
+# Backend de busca vetorial: "auto" (índice local se existir, senão Pinecone), "local" ou "pinecone"
+VECTOR_BACKEND = os.environ.get("DECISION_VECTOR_BACKEND", "auto")
+
+@st.cache_resource
+def init_local_index():
+    """
+    Carrega o índice vetorial local (memory-map).
+    Se ainda não existir, constrói a partir dos artefatos locais e persiste em disco.
+    """
+    try:
+        if not local_index_exists(LOCAL_INDEX_DIR):
+            artifacts = load_local_artifacts()
+            if not artifacts:
+                return None
+            build_local_index(artifacts['job_embeddings'], artifacts['applicant_embeddings']).save(LOCAL_INDEX_DIR)
+        return LocalVectorIndex.load(LOCAL_INDEX_DIR)
+    except Exception as e:
+        st.warning(f"⚠️ Índice vetorial local não disponível: {e}")
+        return None
+
+@st.cache_resource
+def init_vector_backend():
+    """
+    Escolhe o backend de busca vetorial e retorna (nome, índice).
+    Os dois backends respondem à mesma interface de consulta (index.query).
+    """
+    if VECTOR_BACKEND == "local" or (VECTOR_BACKEND == "auto" and local_index_exists(LOCAL_INDEX_DIR)):
+        index = init_local_index()
+        if index is not None:
+            return 'local', index
+    
+    if VECTOR_BACKEND in ("auto", "pinecone"):
+        index = init_pinecone()
+        if index is not None:
+            return 'pinecone', index
+    
+    # Sem índice persistido nem Pinecone: tentar construir o índice local a partir dos artefatos
+    if VECTOR_BACKEND == "auto":
+        index = init_local_index()
+        if index is not None:
+            return 'local', index
+    
+    return None, None
+
+# Arquivos individuais do GitHub Releases (mais rápido que o arquivo grande)
+GITHUB_DATA_URLS = {
+    'vagas': "https://github.com/guilcalazans/decision/releases/download/v1.0/vagas.json",
+    'candidates': "https://github.com/guilcalazans/decision/releases/download/v1.0/applicants.json",
+    'prospects': "https://github.com/guilcalazans/decision/releases/download/v1.0/prospects.json"
+}
+
+# Hierarquias simplificadas de níveis (profissional, acadêmico e idiomas)
+LEVEL_HIERARCHIES = [
+    {'junior': 1, 'pleno': 2, 'senior': 3, 'sênior': 3},
+    {'médio': 1, 'técnico': 2, 'superior': 3, 'mestrado': 4, 'doutorado': 5},
+    {'básico': 1, 'intermediário': 2, 'avançado': 3, 'fluente': 4}
+]
+
+LEVEL_FIELDS = ['nivel_profissional', 'nivel_academico', 'nivel_ingles', 'nivel_espanhol']
+
+def level_ordinals(level):
+    """Ordinal do texto em cada hierarquia de LEVEL_HIERARCHIES (0 = não encontrado)"""
+    text = (level or '').lower()
+    return tuple(
+        max([score for name, score in hierarchy.items() if name in text], default=0)
+        for hierarchy in LEVEL_HIERARCHIES
+    )
+
+def record_level_ordinals(record):
+    """Ordinais de todos os campos de nível de uma vaga ou candidato (calculados uma vez no carregamento)"""
+    return {field: level_ordinals(record.get(field, '')) for field in LEVEL_FIELDS}
+
+def process_job(job_data):
+    """Extrai as características importantes de uma vaga"""
+    basic_info = job_data.get('informacoes_basicas', {})
+    job_profile = job_data.get('perfil_vaga', {})
+    
+    job = {
+        'titulo': basic_info.get('titulo_vaga', ''),
+        'cliente': basic_info.get('cliente', ''),
+        'empresa': basic_info.get('empresa_divisao', ''),
+        'tipo_contratacao': basic_info.get('tipo_contratacao', ''),
+        'cidade': job_profile.get('cidade', ''),
+        'estado': job_profile.get('estado', ''),
+        'pais': job_profile.get('pais', ''),
+        'localizacao': f"{job_profile.get('cidade', '')} {job_profile.get('estado', '')} {job_profile.get('pais', '')}",
+        'nivel_profissional': job_profile.get('nivel profissional', ''),
+        'nivel_academico': job_profile.get('nivel_academico', ''),
+        'nivel_ingles': job_profile.get('nivel_ingles', ''),
+        'nivel_espanhol': job_profile.get('nivel_espanhol', ''),
+        'areas_atuacao': job_profile.get('areas_atuacao', ''),
+        'principais_atividades': job_profile.get('principais_atividades', ''),
+        'competencias': job_profile.get('competencia_tecnicas_e_comportamentais', ''),
+        'keywords': extract_keywords_from_job(job_profile)
+    }
+    job['niveis_ordinais'] = record_level_ordinals(job)
+    return job
+
+def process_applicant(candidate_data):
+    """Extrai as características importantes de um candidato"""
+    basic_info = candidate_data.get('infos_basicas', {})
+    prof_info = candidate_data.get('informacoes_profissionais', {})
+    education = candidate_data.get('formacao_e_idiomas', {})
+    
+    cv_text = candidate_data.get('cv_pt', '')
+    cv_enrichment = enrich_cv(cv_text)
+    
+    candidate = {
+        'nome': basic_info.get('nome', ''),
+        'codigo': basic_info.get('codigo_profissional', ''),
+        'email': basic_info.get('email', ''),
+        'telefone': basic_info.get('telefone', ''),
+        'cidade': cv_enrichment['cidade'],
+        'estado': cv_enrichment['estado'],
+        'pais': 'Brasil',
+        'localizacao': f"{cv_enrichment['cidade']} {cv_enrichment['estado']} Brasil",
+        'nivel_profissional': prof_info.get('nivel_profissional', ''),
+        'nivel_academico': education.get('nivel_academico', ''),
+        'nivel_ingles': education.get('nivel_ingles', ''),
+        'nivel_espanhol': education.get('nivel_espanhol', ''),
+        'conhecimentos_tecnicos': prof_info.get('conhecimentos_tecnicos', ''),
+        'conhecimentos_tecnicos_extraidos': ', '.join(cv_enrichment['keywords']),
+        'keywords': list(cv_enrichment['keywords']),
+        'cv': cv_text,
+        'infos_basicas': basic_info
+    }
+    candidate['niveis_ordinais'] = record_level_ordinals(candidate)
+    return candidate
+
+def process_prospects(prospect_data):
+    """Retorna os códigos dos candidatos contratados em uma vaga"""
+    return [
+        prospect.get('codigo', '')
+        for prospect in prospect_data.get('prospects', [])
+        if prospect.get('situacao_candidado') == 'Contratado pela Decision'
+    ]
+
+# Processamento aplicado a cada registro de cada arquivo, durante o download
+GITHUB_DATA_PROCESSORS = {
+    'vagas': process_job,
+    'candidates': process_applicant,
+    'prospects': process_prospects
+}
+
+def process_github_data(data_loaded):
+    """Deriva processed_jobs, processed_applicants e hired_candidates dos JSONs brutos"""
+    return {
+        'processed_jobs': {job_id: process_job(job_data) for job_id, job_data in data_loaded['vagas'].items()},
+        'processed_applicants': {
+            candidate_id: process_applicant(candidate_data)
+            for candidate_id, candidate_data in data_loaded['candidates'].items()
+        },
+        'hired_candidates': {
+            job_id: process_prospects(prospect_data)
+            for job_id, prospect_data in data_loaded['prospects'].items()
+        }
+    }
+
+def extractors_version():
+    """Versão do código de extração (entra na chave do cache em disco)"""
+    functions_version = code_fingerprint(process_job, process_applicant, process_prospects,
+                                         extract_keywords_from_job, enrich_cv, level_ordinals)
+    return content_hash(functions_version, TECH_KEYWORDS, CV_STATES, LEVEL_HIERARCHIES)[:16]
+
 @st.cache_data
 def load_data_from_github():
     """
     OTIMIZADO: Carrega dados do GitHub de forma rápida
     Retorna dados no formato exato que o app.py espera
+    
+    Os arquivos brutos ficam em um espelho local revalidado com requisições
+    condicionais, e o resultado processado fica em um cache em disco endereçado
+    pelo hash dos arquivos e pela versão dos extratores: reinícios e réplicas
+    novas leem o disco em vez de baixar e reprocessar os JSONs, inclusive sem rede.
     """
     try:
+        code_version = extractors_version()
+        
         with st.status("📥 Carregando dados do GitHub..."):
             st.write("🔗 Conectando ao GitHub Releases...")
+            try:
+                # Revalida o espelho local em paralelo (304 = nada transferido);
+                # arquivos novos são processados durante o download
+                assets = download_json_assets(GITHUB_DATA_URLS, GITHUB_DATA_PROCESSORS,
+                                              mirror_dir=MIRROR_DIR, parse_unchanged=False)
+            except requests.RequestException:
+                # Sem rede e sem espelho: usar o cache processado mais recente, se houver
+                processed = load_latest_cached("github_data", code_version)
+                if processed is None:
+                    raise
+                data_key = None
+            else:
+                data_key = content_hash(*(digest for digest, _ in assets.values()))
+                processed = load_cached("github_data", code_version, data_key)
             
-            # URLs dos arquivos individuais (mais rápido que o arquivo grande)
-            urls = {
-                'vagas': "https://github.com/guilcalazans/decision/releases/download/v1.0/vagas.json",
-                'candidates': "https://github.com/guilcalazans/decision/releases/download/v1.0/applicants.json", 
-                'prospects': "https://github.com/guilcalazans/decision/releases/download/v1.0/prospects.json"
-            }
-            
-            data_loaded = {}
-            
-            for data_type, url in urls.items():
-                st.write(f"📊 Carregando {data_type}...")
-                response = requests.get(url, timeout=30)
-                response.raise_for_status()
-                data_loaded[data_type] = response.json()
-            
-            st.write("✅ Dados carregados!")
-        
-        # Processar dados no formato que o app.py espera
-        with st.status("🔄 Processando dados..."):
-            # 1. Processar vagas (extrair características importantes)
-            processed_jobs = {}
-            for job_id, job_data in data_loaded['vagas'].items():
-                basic_info = job_data.get('informacoes_basicas', {})
-                job_profile = job_data.get('perfil_vaga', {})
-                
-                processed_jobs[job_id] = {
-                    'titulo': basic_info.get('titulo_vaga', ''),
-                    'cliente': basic_info.get('cliente', ''),
-                    'empresa': basic_info.get('empresa_divisao', ''),
-                    'tipo_contratacao': basic_info.get('tipo_contratacao', ''),
-                    'cidade': job_profile.get('cidade', ''),
-                    'estado': job_profile.get('estado', ''),
-                    'pais': job_profile.get('pais', ''),
-                    'localizacao': f"{job_profile.get('cidade', '')} {job_profile.get('estado', '')} {job_profile.get('pais', '')}",
-                    'nivel_profissional': job_profile.get('nivel profissional', ''),
-                    'nivel_academico': job_profile.get('nivel_academico', ''),
-                    'nivel_ingles': job_profile.get('nivel_ingles', ''),
-                    'nivel_espanhol': job_profile.get('nivel_espanhol', ''),
-                    'areas_atuacao': job_profile.get('areas_atuacao', ''),
-                    'principais_atividades': job_profile.get('principais_atividades', ''),
-                    'competencias': job_profile.get('competencia_tecnicas_e_comportamentais', ''),
-                    'keywords': extract_keywords_from_job(job_profile)
+            if processed is None:
+                st.write("🔄 Processando dados...")
+                loaded = {
+                    name: records if records is not None
+                    else load_mirrored_json_asset(MIRROR_DIR, name, GITHUB_DATA_PROCESSORS[name])
+                    for name, (_, records) in assets.items()
                 }
-            
-            # 2. Processar candidatos (extrair características importantes)
-            processed_applicants = {}
-            for candidate_id, candidate_data in data_loaded['candidates'].items():
-                basic_info = candidate_data.get('infos_basicas', {})
-                personal_info = candidate_data.get('informacoes_pessoais', {})
-                prof_info = candidate_data.get('informacoes_profissionais', {})
-                education = candidate_data.get('formacao_e_idiomas', {})
-                
-                processed_applicants[candidate_id] = {
-                    'nome': basic_info.get('nome', ''),
-                    'codigo': basic_info.get('codigo_profissional', ''),
-                    'email': basic_info.get('email', ''),
-                    'telefone': basic_info.get('telefone', ''),
-                    'cidade': extract_location_from_cv(candidate_data.get('cv_pt', '')).get('cidade', ''),
-                    'estado': extract_location_from_cv(candidate_data.get('cv_pt', '')).get('estado', ''),
-                    'pais': 'Brasil',
-                    'localizacao': f"{extract_location_from_cv(candidate_data.get('cv_pt', '')).get('cidade', '')} {extract_location_from_cv(candidate_data.get('cv_pt', '')).get('estado', '')} Brasil",
-                    'nivel_profissional': prof_info.get('nivel_profissional', ''),
-                    'nivel_academico': education.get('nivel_academico', ''),
-                    'nivel_ingles': education.get('nivel_ingles', ''),
-                    'nivel_espanhol': education.get('nivel_espanhol', ''),
-                    'conhecimentos_tecnicos': prof_info.get('conhecimentos_tecnicos', ''),
-                    'conhecimentos_tecnicos_extraidos': ', '.join(extract_keywords_from_cv(candidate_data.get('cv_pt', ''))),
-                    'keywords': extract_keywords_from_cv(candidate_data.get('cv_pt', '')),
-                    'cv': candidate_data.get('cv_pt', ''),
-                    'infos_basicas': basic_info
+                processed = {
+                    'processed_jobs': loaded['vagas'],
+                    'processed_applicants': loaded['candidates'],
+                    'hired_candidates': loaded['prospects']
                 }
+                
+                try:
+                    save_cached("github_data", code_version, data_key, processed)
+                except OSError as e:
+                    st.warning(f"⚠️ Não foi possível salvar o cache em disco: {e}")
             
-            # 3. Processar contratações
-            hired_candidates = {}
-            for job_id, prospect_data in data_loaded['prospects'].items():
-                hired_candidates[job_id] = []
-                for prospect in prospect_data.get('prospects', []):
-                    if prospect.get('situacao_candidado') == 'Contratado pela Decision':
-                        hired_candidates[job_id].append(prospect.get('codigo', ''))
-        
-        # Conectar ao Pinecone se disponível
-        pinecone_index = init_pinecone()
-        if pinecone_index:
-            st.session_state['pinecone_index'] = pinecone_index
-            st.session_state['pinecone_available'] = True
-        else:
-            st.session_state['pinecone_available'] = False
+            st.write("✅ Dados carregados!")
         
         # Retornar no formato exato que o app.py espera
         return {
-            'processed_jobs': processed_jobs,
-            'processed_applicants': processed_applicants,
-            'hired_candidates': hired_candidates,
+            'processed_jobs': processed['processed_jobs'],
+            'processed_applicants': processed['processed_applicants'],
+            'hired_candidates': processed['hired_candidates'],
             'job_embeddings': {},  # Será populado conforme necessário
             'applicant_embeddings': {},  # Será populado conforme necessário  
-            'match_details': {}  # Será calculado dinamicamente
+            'match_details': {},  # Será calculado dinamicamente
+            'data_version': content_hash(code_version, data_key or "offline")[:16]
         }
         
     except Exception as e:
         st.error(f"❌ Erro ao carregar dados do GitHub: {e}")
         return None
 
+@st.cache_resource
+def load_local_artifacts():
+    """
+    Carrega embeddings e detalhes de match dos artefatos locais (memory-map), se existirem.
+    
+    Fica fora de load_data_from_github porque st.cache_data copiaria as matrizes
+    mapeadas; com st.cache_resource elas são compartilhadas por todas as sessões.
+    """
+    if not artifacts_exist(ARTIFACT_DIR):
+        return None
+    try:
+        return load_artifacts(ARTIFACT_DIR)
+    except Exception as e:
+        st.warning(f"⚠️ Artefatos locais indisponíveis: {e}")
+        return None
+
+# Lista de tecnologias comuns
+TECH_KEYWORDS = [
+    "python", "java", "javascript", "js", "c#", "c++", "php", "ruby", "go", "swift",
+    "html", "css", "react", "angular", "vue", "node", "django", "flask", "spring",
+    "aws", "azure", "gcp", "cloud", "docker", "kubernetes", "terraform",
+    "sql", "mysql", "postgresql", "mongodb", "oracle", "redis",
+    "git", "jenkins", "devops", "agile", "scrum",
+    "excel", "power bi", "tableau", "sap", "erp", "totvs"
+]
+
+# Estados brasileiros (sigla, nome, nome em minúsculas)
+CV_STATES = [
+    (abbr, full_name, full_name.lower())
+    for abbr, full_name in {
+        'sp': 'São Paulo', 'rj': 'Rio de Janeiro', 'mg': 'Minas Gerais',
+        'pr': 'Paraná', 'rs': 'Rio Grande do Sul', 'sc': 'Santa Catarina'
+    }.items()
+]
+
 def extract_keywords_from_job(job_profile):
     """Extrai palavras-chave técnicas da vaga"""
     keywords = []
@@ -379,290 +542,364 @@ def extract_keywords_from_job(job_profile):
     
     combined_text = ' '.join(text_fields).lower()
     
-    # Lista de tecnologias comuns
-    tech_keywords = [
-        "python", "java", "javascript", "js", "c#", "c++", "php", "ruby", "go", "swift",
-        "html", "css", "react", "angular", "vue", "node", "django", "flask", "spring",
-        "aws", "azure", "gcp", "cloud", "docker", "kubernetes", "terraform",
-        "sql", "mysql", "postgresql", "mongodb", "oracle", "redis",
-        "git", "jenkins", "devops", "agile", "scrum",
-        "excel", "power bi", "tableau", "sap", "erp", "totvs"
-    ]
-    
-    for keyword in tech_keywords:
+    for keyword in TECH_KEYWORDS:
         if keyword in combined_text:
             keywords.append(keyword)
     
     return keywords
 
-def extract_keywords_from_cv(cv_text):
-    """Extrai palavras-chave técnicas do CV"""
+# Enriquecimentos já calculados, indexados pelo hash do conteúdo do CV (os mais recentes)
+CV_ENRICHMENT_CACHE_SIZE = 4096
+CV_ENRICHMENT_CACHE = LRUCache(maxsize=CV_ENRICHMENT_CACHE_SIZE)
+CV_ENRICHMENT_LOCK = threading.Lock()
+
+def enrich_cv(cv_text):
+    """
+    Extrai localização e palavras-chave do CV em uma única passada.
+    
+    O texto é convertido para minúsculas uma vez e o resultado dos CVs mais
+    recentes é memorizado pelo hash do conteúdo (CVs repetidos não custam nada).
+    Retorna {'cidade', 'estado', 'keywords'}: o primeiro estado de CV_STATES
+    citado no CV e as palavras de TECH_KEYWORDS encontradas.
+    """
     if not cv_text:
-        return []
-        
-    keywords = []
-    cv_lower = cv_text.lower()
+        return {'cidade': '', 'estado': '', 'keywords': []}
     
-    # Lista de tecnologias comuns
-    tech_keywords = [
-        "python", "java", "javascript", "js", "c#", "c++", "php", "ruby", "go", "swift",
-        "html", "css", "react", "angular", "vue", "node", "django", "flask", "spring",
-        "aws", "azure", "gcp", "cloud", "docker", "kubernetes", "terraform",
-        "sql", "mysql", "postgresql", "mongodb", "oracle", "redis",
-        "git", "jenkins", "devops", "agile", "scrum",
-        "excel", "power bi", "tableau", "sap", "erp", "totvs"
-    ]
+    cv_key = content_hash(cv_text)
+    with CV_ENRICHMENT_LOCK:
+        enrichment = CV_ENRICHMENT_CACHE.get(cv_key)
+    if enrichment is not None:
+        return enrichment
     
-    for keyword in tech_keywords:
-        if keyword in cv_lower:
-            keywords.append(keyword)
+    cv_lower = cv_text.lower()
     
-    return keywords
+    enrichment = {'cidade': '', 'estado': '', 'keywords': [keyword for keyword in TECH_KEYWORDS if keyword in cv_lower]}
+    for abbr, full_name, full_name_lower in CV_STATES:
+        if abbr in cv_lower or full_name_lower in cv_lower:
+            enrichment['cidade'] = 'São Paulo' if abbr == 'sp' else ''
+            enrichment['estado'] = full_name
+            break
+    
+    with CV_ENRICHMENT_LOCK:
+        CV_ENRICHMENT_CACHE[cv_key] = enrichment
+    return enrichment
 
-def extract_location_from_cv(cv_text):
-    """Extrai localização básica do CV"""
-    if not cv_text:
-        return {'cidade': '', 'estado': ''}
+# Cache das buscas no Pinecone, compartilhado por todas as sessões
+PINECONE_CACHE_TTL = 3600  # segundos
+PINECONE_CACHE_SIZE = 512  # vagas
+
+def query_pinecone_candidates(index, job_id, top_k):
+    """
+    Consulta o Pinecone: busca o vetor da vaga e depois os candidatos mais similares.
+    Levanta exceção em caso de erro (para que falhas não fiquem em cache).
+    """
+    # Buscar vetor da vaga
+    job_response = index.query(
+        id=f"job_{job_id}",
+        top_k=1,
+        include_values=True
+    )
     
-    # Estados brasileiros
-    states = {
-        'sp': 'São Paulo', 'rj': 'Rio de Janeiro', 'mg': 'Minas Gerais',
-        'pr': 'Paraná', 'rs': 'Rio Grande do Sul', 'sc': 'Santa Catarina'
-    }
+    if not job_response['matches']:
+        return []
     
-    cv_lower = cv_text.lower()
+    job_vector = job_response['matches'][0]['values']
+    
+    # Buscar candidatos similares (mais resultados para filtrar melhor)
+    candidates_response = index.query(
+        vector=job_vector,
+        top_k=top_k * 3,  # Buscar mais para filtrar depois
+        include_metadata=True
+    )
     
-    for abbr, full_name in states.items():
-        if abbr in cv_lower or full_name.lower() in cv_lower:
-            return {'cidade': 'São Paulo' if abbr == 'sp' else '', 'estado': full_name}
+    # Filtrar apenas candidatos
+    candidates = []
+    for match in candidates_response['matches']:
+        metadata = match['metadata']
+        if (metadata.get('type') == 'candidate' or 
+            'candidate_id' in metadata or 
+            match['id'].startswith('candidate_')):
+            
+            candidate_id = metadata.get('candidate_id') or match['id'].replace('candidate_', '')
+            candidates.append({
+                'id': candidate_id,
+                'score': match['score'],
+                'pinecone_similarity': match['score']
+            })
+            
+            if len(candidates) >= top_k:
+                break
     
-    return {'cidade': '', 'estado': ''}
+    return candidates
+
+@st.cache_data(ttl=PINECONE_CACHE_TTL, max_entries=PINECONE_CACHE_SIZE, show_spinner=False)
+def fetch_pinecone_candidates(job_id, top_k):
+    """Resultado da busca vetorial por vaga, em cache (TTL e tamanho limitados) entre sessões"""
+    _, index = init_vector_backend()
+    if index is None:
+        raise RuntimeError("Busca vetorial não disponível")
+    return query_pinecone_candidates(index, job_id, top_k)
 
 def search_candidates_pinecone(job_id, top_k=50):
     """
-    OTIMIZADO: Busca rápida no Pinecone
+    OTIMIZADO: Busca rápida no Pinecone (ou no índice local, conforme o backend configurado)
     Retorna apenas os melhores candidatos para processamento detalhado
     """
-    if not st.session_state.get('pinecone_available'):
+    if not st.session_state.get('vector_backend'):
         return []
     
     try:
-        index = st.session_state['pinecone_index']
-        
-        # Buscar vetor da vaga
-        job_response = index.query(
-            id=f"job_{job_id}",
-            top_k=1,
-            include_values=True
-        )
-        
-        if not job_response['matches']:
-            return []
-        
-        job_vector = job_response['matches'][0]['values']
-        
-        # Buscar candidatos similares (mais resultados para filtrar melhor)
-        candidates_response = index.query(
-            vector=job_vector,
-            top_k=top_k * 3,  # Buscar mais para filtrar depois
-            include_metadata=True
-        )
-        
-        # Filtrar apenas candidatos
-        candidates = []
-        for match in candidates_response['matches']:
-            metadata = match['metadata']
-            if (metadata.get('type') == 'candidate' or 
-                'candidate_id' in metadata or 
-                match['id'].startswith('candidate_')):
-                
-                candidate_id = metadata.get('candidate_id') or match['id'].replace('candidate_', '')
-                candidates.append({
-                    'id': candidate_id,
-                    'score': match['score'],
-                    'pinecone_similarity': match['score']
-                })
-                
-                if len(candidates) >= top_k:
-                    break
-        
-        return candidates
-        
+        return fetch_pinecone_candidates(job_id, top_k)
     except Exception as e:
-        st.warning(f"⚠️ Erro no Pinecone: {e}")
+        st.warning(f"⚠️ Erro na busca vetorial: {e}")
         return []
 
-def calculate_similarity_optimized(job_id, candidate_id, processed_jobs, processed_applicants):
-    """
-    OTIMIZADO: Cálculo rápido de similaridade
-    Mantém a mesma lógica do app.py mas otimizada
+def get_job_semantic_scores(job_id, top_k=100):
     """
-    job = processed_jobs[job_id]
-    candidate = processed_applicants[candidate_id]
-    
-    # 1. Similaridade semântica (via Pinecone se disponível)
-    semantic_score = 0.5  # Valor padrão
-    
-    if st.session_state.get('pinecone_available'):
-        # Usar busca do Pinecone se disponível
-        try:
-            candidates = search_candidates_pinecone(job_id, top_k=100)
-            for c in candidates:
-                if c['id'] == candidate_id:
-                    semantic_score = c['pinecone_similarity']
-                    break
-        except:
-            semantic_score = 0.5
-    
-    # 2. Similaridade de keywords (rápida)
-    job_keywords = set(job.get('keywords', []))
-    candidate_keywords = set(candidate.get('keywords', []))
-    
-    if job_keywords and candidate_keywords:
-        keywords_score = len(job_keywords.intersection(candidate_keywords)) / len(job_keywords)
-    else:
-        keywords_score = 0.0
-    
-    # 3. Similaridade de localização (rápida)
-    location_score = 0.0
-    if job.get('cidade') and candidate.get('cidade'):
-        if job['cidade'].lower() == candidate['cidade'].lower():
-            location_score = 1.0
-    elif job.get('estado') and candidate.get('estado'):
-        if job['estado'].lower() == candidate['estado'].lower():
-            location_score = 0.7
-    else:
-        location_score = 0.3  # Mesmo país
+    Mapa {candidate_id: similaridade semântica} de uma vaga.
     
-    # 4. Outros scores (simplificados para velocidade)
-    professional_level_score = compare_levels(
-        job.get('nivel_profissional', ''),
-        candidate.get('nivel_profissional', '')
-    )
-    
-    academic_level_score = compare_levels(
-        job.get('nivel_academico', ''),
-        candidate.get('nivel_academico', '')
-    )
-    
-    english_score = compare_levels(
-        job.get('nivel_ingles', ''),
-        candidate.get('nivel_ingles', '')
-    )
+    Uma única busca no Pinecone por vaga (em cache), em vez de uma busca por candidato pontuado.
+    """
+    return {c['id']: c['pinecone_similarity'] for c in search_candidates_pinecone(job_id, top_k=top_k)}
+
+def stored_level_ordinals(record, field):
+    """Ordinais do campo guardados no registro (process_job / process_applicant), ou None"""
+    return (record.get('niveis_ordinais') or {}).get(field)
+
+# ==== Score Vetorizado do Pool de Candidatos ====
+# Score de compatibilidade (semântica, palavras-chave, localização e níveis) calculado
+# para todos os candidatos de uma vez sobre arrays pré-calculados (um por característica).
+# Atualizações da barra de progresso por vaga (cada uma é uma mensagem ao navegador)
+PROGRESS_UPDATES = 4
+
+def build_applicant_arrays(processed_applicants):
+    """
+    Pré-calcula as características dos candidatos em arrays alinhados com a ordem de processed_applicants:
+    índice invertido de palavras-chave, códigos de localização, códigos dos textos de nível
+    e seus ordinais em cada hierarquia.
+    """
+    ids = list(processed_applicants.keys())
+    applicants = [processed_applicants[candidate_id] for candidate_id in ids]
+    
+    # Palavras-chave: lista de posições dos candidatos que têm cada palavra
+    keyword_postings = {}
+    keyword_counts = np.zeros(len(ids), dtype=np.int64)
+    for position, candidate in enumerate(applicants):
+        keywords = set(candidate.get('keywords', []) or [])
+        keyword_counts[position] = len(keywords)
+        for keyword in keywords:
+            keyword_postings.setdefault(keyword, []).append(position)
+    keyword_postings = {keyword: np.array(positions, dtype=np.int64) for keyword, positions in keyword_postings.items()}
+    
+    # Localização: código do texto em minúsculas e presença do valor original
+    location = {}
+    for field in ('cidade', 'estado'):
+        values = [candidate.get(field) or '' for candidate in applicants]
+        vocabulary = {}
+        location[field] = (
+            np.array([vocabulary.setdefault(value.lower(), len(vocabulary)) for value in values], dtype=np.int64),
+            np.array([bool(value) for value in values], dtype=bool),
+            vocabulary
+        )
     
-    spanish_score = compare_levels(
-        job.get('nivel_espanhol', ''),
-        candidate.get('nivel_espanhol', '')
-    )
+    # Níveis: ordinais (n × hierarquias) e código de cada texto distinto (comparação simples)
+    levels = {}
+    for field in LEVEL_FIELDS:
+        vocabulary = {}
+        codes = np.array([vocabulary.setdefault(candidate.get(field) or '', len(vocabulary)) for candidate in applicants],
+                         dtype=np.int64)
+        ordinals = [stored_level_ordinals(candidate, field) for candidate in applicants]
+        ordinals = np.array([
+            level_ordinals(candidate.get(field, '')) if value is None else value
+            for candidate, value in zip(applicants, ordinals)
+        ], dtype=np.int64).reshape(len(applicants), len(LEVEL_HIERARCHIES))
+        levels[field] = (codes, list(vocabulary), ordinals)
     
-    # Score final ponderado (mesma fórmula do app.py)
-    final_score = (
-        semantic_score * 0.40 +
-        keywords_score * 0.30 +
-        location_score * 0.05 +
-        professional_level_score * 0.10 +
-        academic_level_score * 0.10 +
-        english_score * 0.025 +
-        spanish_score * 0.025
-    )
+    return {
+        'ids': ids,
+        'position': {candidate_id: i for i, candidate_id in enumerate(ids)},
+        'keyword_postings': keyword_postings,
+        'keyword_counts': keyword_counts,
+        'location': location,
+        'levels': levels,
+        'level_tables': {}
+    }
+
+@st.cache_resource(show_spinner=False)
+def get_applicant_arrays(data_version, _processed_applicants):
+    """Arrays dos candidatos, calculados uma vez por versão dos dados e compartilhados entre sessões"""
+    return build_applicant_arrays(_processed_applicants)
+
+def level_fallback_table(arrays, field, required_level):
+    """Comparação simples (sem hierarquia) para cada texto distinto do campo nos candidatos"""
+    key = (field, required_level)
+    table = arrays['level_tables'].get(key)
+    if table is None:
+        required = required_level.lower()
+        table = np.array([
+            1.0 if value and (required in value.lower() or value.lower() in required) else 0.5
+            for value in arrays['levels'][field][1]
+        ], dtype=np.float64)
+        arrays['level_tables'][key] = table
+    return table
+
+def level_scores_vectorized(arrays, field, required_level, required_ordinals, rows):
+    """
+    Score de nível dos candidatos em rows, por comparação de ordinais: 0.5 se algum nível
+    está vazio; min(1, candidato / vaga) na primeira hierarquia em que os dois foram
+    encontrados; senão 1.0 se um texto contém o outro e 0.5 caso contrário.
+    """
+    if not required_level:
+        return np.full(len(rows), 0.5, dtype=np.float64)
+    
+    codes, _, ordinals = arrays['levels'][field]
+    candidate_ordinals = ordinals[rows]
+    required_ordinals = np.asarray(required_ordinals, dtype=np.int64)
+    
+    # Primeira hierarquia em que os dois níveis foram encontrados
+    found = (candidate_ordinals > 0) & (required_ordinals > 0)
+    hierarchy = found.argmax(axis=1)
+    denominators = np.where(required_ordinals > 0, required_ordinals, 1)[hierarchy]
+    ratio = np.minimum(1.0, candidate_ordinals[np.arange(len(rows)), hierarchy] / denominators)
+    return np.where(found.any(axis=1), ratio, level_fallback_table(arrays, field, required_level)[codes[rows]])
+
+def count_common_keywords(job, arrays):
+    """Tamanho da interseção das palavras-chave da vaga com as de cada candidato (índice invertido)"""
+    common = np.zeros(len(arrays['ids']), dtype=np.int64)
+    for keyword in set(job.get('keywords', []) or []):
+        postings = arrays['keyword_postings'].get(keyword)
+        if postings is not None:
+            common[postings] += 1
+    return common
+
+def score_candidates_vectorized(job, arrays, rows, semantic, common_keywords=None):
+    """
+    Componentes e score final dos candidatos nas posições rows, com semantic = similaridade
+    semântica de cada um. common_keywords vem de count_common_keywords (calculado aqui se
+    não for informado; quem pontua vários blocos da mesma vaga deve calculá-lo uma vez).
+    Retorna (scores finais, {componente: array}).
+    """
+    # Palavras-chave: |vaga ∩ candidato| / |vaga|
+    job_keywords = set(job.get('keywords', []) or [])
+    if job_keywords:
+        if common_keywords is None:
+            common_keywords = count_common_keywords(job, arrays)
+        keywords_score = np.where(arrays['keyword_counts'][rows] > 0, common_keywords[rows] / len(job_keywords), 0.0)
+    else:
+        keywords_score = np.zeros(len(rows), dtype=np.float64)
+    
+    # Localização: cidade informada nos dois lados decide; senão o estado; senão 0.3
+    location_score = np.full(len(rows), 0.3, dtype=np.float64)
+    undecided = np.ones(len(rows), dtype=bool)
+    for field, match_score in (('cidade', 1.0), ('estado', 0.7)):
+        job_value = job.get(field) or ''
+        if not job_value:
+            continue
+        codes, present, vocabulary = arrays['location'][field]
+        decided = undecided & present[rows]
+        same = codes[rows] == vocabulary.get(job_value.lower(), -1)
+        location_score[decided] = np.where(same[decided], match_score, 0.0)
+        undecided &= ~decided
+    
+    # Níveis: comparação dos ordinais da vaga com os de todos os candidatos
+    level_scores = {}
+    for field in LEVEL_FIELDS:
+        required_level = job.get(field, '')
+        required_ordinals = stored_level_ordinals(job, field)
+        if required_ordinals is None:
+            required_ordinals = level_ordinals(required_level)
+        level_scores[field] = level_scores_vectorized(arrays, field, required_level, required_ordinals, rows)
     
-    # Retornar detalhes completos
     details = {
-        'semantic': semantic_score,
+        'semantic': semantic,
         'keywords': keywords_score,
         'location': location_score,
-        'professional_level': professional_level_score,
-        'academic_level': academic_level_score,
-        'english_level': english_score,
-        'spanish_level': spanish_score
+        'professional_level': level_scores['nivel_profissional'],
+        'academic_level': level_scores['nivel_academico'],
+        'english_level': level_scores['nivel_ingles'],
+        'spanish_level': level_scores['nivel_espanhol']
     }
-    
-    return {
-        'score': final_score,
-        'details': details
-    }
-
-def compare_levels(required_level, candidate_level):
-    """Comparação rápida de níveis"""
-    if not required_level or not candidate_level:
-        return 0.5
-    
-    # Normalizar
-    required = required_level.lower()
-    candidate = candidate_level.lower()
-    
-    # Hierarquias simplificadas
-    prof_levels = {'junior': 1, 'pleno': 2, 'senior': 3, 'sênior': 3}
-    acad_levels = {'médio': 1, 'técnico': 2, 'superior': 3, 'mestrado': 4, 'doutorado': 5}
-    lang_levels = {'básico': 1, 'intermediário': 2, 'avançado': 3, 'fluente': 4}
-    
-    # Determinar qual hierarquia usar
-    for levels_dict in [prof_levels, acad_levels, lang_levels]:
-        req_score = 0
-        cand_score = 0
-        
-        for level, score in levels_dict.items():
-            if level in required:
-                req_score = max(req_score, score)
-            if level in candidate:
-                cand_score = max(cand_score, score)
-        
-        if req_score > 0 and cand_score > 0:
-            return min(1.0, cand_score / req_score)
-    
-    # Se não encontrou em nenhuma hierarquia, comparação simples
-    return 1.0 if required in candidate or candidate in required else 0.5
+    final_score = (
+        semantic * 0.40 +
+        keywords_score * 0.30 +
+        location_score * 0.05 +
+        details['professional_level'] * 0.10 +
+        details['academic_level'] * 0.10 +
+        details['english_level'] * 0.025 +
+        details['spanish_level'] * 0.025
+    )
+    return final_score, details
 
-def get_top_candidates_fast(job_id, processed_jobs, processed_applicants, top_k=7):
+def get_top_candidates_fast(job_id, processed_jobs, processed_applicants, top_k=7, applicant_arrays=None,
+                            semantic_scores=None):
     """
     OTIMIZADO: Busca rápida dos melhores candidatos
-    Combina Pinecone (se disponível) + filtros rápidos
+    Combina Pinecone (se disponível) + score vetorizado
+    
+    applicant_arrays vem de build_applicant_arrays e semantic_scores de
+    get_job_semantic_scores (ambos calculados aqui se não forem informados).
     """
-    candidates_to_evaluate = []
+    if applicant_arrays is None:
+        applicant_arrays = build_applicant_arrays(processed_applicants)
     
-    # 1. Se Pinecone disponível, buscar candidatos pré-filtrados
-    if st.session_state.get('pinecone_available'):
-        pinecone_candidates = search_candidates_pinecone(job_id, top_k=50)
-        candidates_to_evaluate = [c['id'] for c in pinecone_candidates]
+    # 1. Se Pinecone disponível, buscar uma única vez os scores semânticos da vaga
+    #    e usar os melhores como candidatos pré-filtrados
+    if semantic_scores is None:
+        semantic_scores = get_job_semantic_scores(job_id, top_k=100)
+    candidates_to_evaluate = list(semantic_scores.keys())[:50]
     
     # 2. Se Pinecone não disponível ou retornou poucos resultados, usar todos
     if len(candidates_to_evaluate) < 20:
-        candidates_to_evaluate = list(processed_applicants.keys())
-    
-    # 3. Calcular similaridade apenas para candidatos selecionados
-    results = []
+        rows = np.arange(len(applicant_arrays['ids']))
+    else:
+        rows = np.array([applicant_arrays['position'][candidate_id] for candidate_id in candidates_to_evaluate], dtype=np.int64)
     
+    # 3. Score vetorizado em alguns blocos (poucas atualizações de progresso)
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    for i, candidate_id in enumerate(candidates_to_evaluate):
-        # Atualizar progresso
-        progress = int((i + 1) / len(candidates_to_evaluate) * 100)
-        progress_bar.progress(progress)
-        status_text.text(f"🔄 Analisando candidato {i+1}/{len(candidates_to_evaluate)}")
-        
-        similarity_data = calculate_similarity_optimized(
-            job_id, candidate_id, processed_jobs, processed_applicants
-        )
-        
+    ids = applicant_arrays['ids']
+    job = processed_jobs[job_id]
+    final_scores = []
+    block_details = []
+    blocks = np.array_split(rows, min(PROGRESS_UPDATES, max(1, len(rows))))
+    common_keywords = count_common_keywords(job, applicant_arrays)
+    evaluated = 0
+    for block in blocks:
+        semantic = np.array([semantic_scores.get(ids[row], 0.5) for row in block.tolist()], dtype=np.float64)
+        block_scores, details = score_candidates_vectorized(job, applicant_arrays, block, semantic, common_keywords)
+        final_scores.append(block_scores)
+        block_details.append(details)
+        
+        evaluated += len(block)
+        progress_bar.progress(int(evaluated / max(1, len(rows)) * 100))
+        status_text.text(f"🔄 Analisando candidato {evaluated}/{len(rows)}")
+    
+    # Limpar barras de progresso
+    progress_bar.empty()
+    status_text.empty()
+    
+    # 4. Ordenar por score (estável, como a ordenação da lista) e montar apenas os top candidatos
+    final_scores = np.concatenate(final_scores) if final_scores else np.zeros(0)
+    details = {component: np.concatenate([d[component] for d in block_details]) for component in block_details[0]} if block_details else {}
+    results = []
+    for index in np.argsort(-final_scores, kind='stable')[:top_k * 2].tolist():  # Retornar mais que o necessário para ter opções
+        candidate_id = ids[rows[index]]
         candidate = processed_applicants[candidate_id]
-        
         results.append({
             'id': candidate_id,
             'nome': candidate['nome'],
-            'score': similarity_data['score'],
+            'score': float(final_scores[index]),
             'is_hired': False,  # Será atualizado depois
             'applicant_data': candidate,
-            'match_details': similarity_data['details']
+            'match_details': {component: float(values[index]) for component, values in details.items()}
         })
-    
-    # Limpar barras de progresso
-    progress_bar.empty()
-    status_text.empty()
-    
-    # Ordenar por score e retornar top candidatos
-    results.sort(key=lambda x: x['score'], reverse=True)
-    return results[:top_k * 2]  # Retornar mais que o necessário para ter opções
+    return results
+
+@st.cache_resource
+def get_ranking_cache():
+    """Cache LRU de rankings compartilhado por todas as sessões do processo"""
+    return RankingCache()
 
 # Funções de renderização (EXATAMENTE IGUAIS ao app.py)
 def get_theme_colors():
@@ -1286,6 +1523,10 @@ def main():
         st.error("❌ Não foi possível carregar os dados. Verifique sua conexão.")
         return
     
+    # Conectar ao backend de busca vetorial (Pinecone ou índice local)
+    backend_name, _ = init_vector_backend()
+    st.session_state['vector_backend'] = backend_name
+    
     processed_jobs = data['processed_jobs']
     processed_applicants = data['processed_applicants']
     hired_candidates = data['hired_candidates']
@@ -1293,8 +1534,10 @@ def main():
     st.success("✅ Dados carregados com sucesso!")
     
     # Informar sobre conexões
-    if st.session_state.get('pinecone_available'):
+    if st.session_state.get('vector_backend') == 'pinecone':
         st.info("🎯 **Modo Otimizado:** Busca vetorial via Pinecone + dados completos do GitHub")
+    elif st.session_state.get('vector_backend') == 'local':
+        st.info("🎯 **Modo Otimizado:** Busca vetorial via índice local + dados completos do GitHub")
     else:
         st.info("📊 **Modo Padrão:** Dados completos do GitHub (Pinecone indisponível)")
     
@@ -1327,25 +1570,39 @@ def main():
         
         render_job_details(selected_job)
         
-        # Cache otimizado
-        cache_key = f"similarities_optimized_{selected_job_id}"
-        
-        if cache_key not in st.session_state:
-            # Busca otimizada
-            similarities = get_top_candidates_fast(
+        def compute_ranking():
+            # Busca otimizada (mesma fórmula para todas as vagas)
+            semantic_scores = get_job_semantic_scores(selected_job_id, top_k=100)
+            candidates = get_top_candidates_fast(
                 selected_job_id, 
                 processed_jobs, 
                 processed_applicants,
-                top_k=7
+                top_k=7,
+                applicant_arrays=get_applicant_arrays(data.get('data_version'), processed_applicants),
+                semantic_scores=semantic_scores
             )
-            
-            # Atualizar status de contratação
-            for candidate in similarities:
-                candidate['is_hired'] = candidate['applicant_data']['codigo'] in hired_candidates.get(selected_job_id, [])
-            
-            st.session_state[cache_key] = similarities
-        else:
-            similarities = st.session_state[cache_key]
+            ranking = [{'id': c['id'], 'score': c['score'], 'details': c['match_details']} for c in candidates]
+            # Busca vetorial configurada mas sem resultados (erro ou índice vazio): ranking
+            # degradado (semântica 0.5 para todos), servido nesta sessão mas fora do cache
+            if st.session_state.get('vector_backend') and not semantic_scores:
+                return UncachedRanking(ranking)
+            return ranking
+        
+        def make_record(candidate_id, score, details):
+            candidate = processed_applicants[candidate_id]
+            return {
+                'id': candidate_id,
+                'nome': candidate['nome'],
+                'score': score,
+                'is_hired': candidate['codigo'] in hired_candidates.get(selected_job_id, []),
+                'applicant_data': candidate,
+                'match_details': details
+            }
+        
+        # Ranking (IDs e scores) compartilhado entre sessões; registros montados sob demanda
+        ranking_key = (selected_job_id, weights_key(APP_WEIGHTS), data.get('data_version'),
+                       st.session_state.get('vector_backend'))
+        similarities = RankedCandidates(get_ranking_cache().get_or_compute(ranking_key, compute_ranking), make_record)
         
         # Verificar candidatos contratados
         top_7_ids = [item['id'] for item in similarities[:7]]
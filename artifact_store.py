@@ -0,0 +1,592 @@
+"""
+Armazenamento de Artefatos - Decision Recruiter
+
+Formato em disco dos dados processados, alternativo ao pickle monolítico
+(decision_embeddings_enhanced_precisao.pkl):
+
+    decision_artifacts/
+    ├── CURRENT                         # nome da versão publicada (ex.: v-3f2a...)
+    └── v-3f2a.../                      # uma versão completa dos artefatos
+        ├── manifest.json               # versão do formato e contagens
+        ├── job_ids.json                # IDs das vagas (ordem das linhas)
+        ├── job_embeddings.npy          # matriz contígua (memory-map): float32, float16 ou int8
+        ├── job_embedding_scales.npy    # escala por vetor (apenas no formato int8)
+        ├── applicant_ids.json          # IDs dos candidatos (ordem das linhas)
+        ├── applicant_embeddings.npy    # idem, para os candidatos
+        ├── applicant_embedding_scales.npy
+        ├── processed_jobs.arrow        # tabela colunar (Arrow IPC, memory-map)
+        ├── processed_applicants.arrow  # tabela colunar (Arrow IPC, memory-map)
+        ├── hired_candidates.json
+        ├── match_job_ids.json          # vagas com detalhes de match
+        ├── match_offsets.npy           # início/fim de cada vaga nos arrays abaixo
+        ├── match_applicant_index.npy   # índice do candidato (linha em applicant_ids)
+        └── match_scores.npy            # float32 (n_matches, len(SCORE_COMPONENTS))
+
+Os arquivos são abertos via memory-map, então o carregamento é quase
+instantâneo e a memória residente é compartilhada entre processos pelo
+cache de páginas do sistema operacional.
+
+Cada save_artifacts grava uma versão nova em um subdiretório próprio e só
+então troca o arquivo CURRENT (os.replace de um arquivo pequeno, atômico):
+um leitor vê a versão anterior ou a nova, nunca uma mistura. Versões
+antigas são removidas na publicação seguinte, quando possível.
+"""
+
+import json
+import os
+import pickle
+import shutil
+import uuid
+from collections.abc import Mapping
+
+import numpy as np
+import pyarrow as pa
+
+from vector_search import compress_matrix, compressed_dot, compressed_norms, decompress_row
+
+# Diretório padrão dos artefatos
+ARTIFACT_DIR = "decision_artifacts"
+FORMAT_VERSION = 1
+
+# Formato de armazenamento dos embeddings: "float32", "float16" ou "int8"
+EMBEDDING_DTYPE = os.environ.get("DECISION_EMBEDDING_STORAGE", "float32")
+
+# Componentes armazenados para cada par vaga/candidato em match_details
+SCORE_COMPONENTS = [
+    "semantic",
+    "keywords",
+    "location",
+    "professional_level",
+    "academic_level",
+    "english_level",
+    "spanish_level",
+    "final_score"
+]
+
+
+# ==== Estruturas de Acesso ====
+class EmbeddingStore(Mapping):
+    """
+    Embeddings em uma matriz contígua com índice de IDs.
+
+    Funciona como o dicionário {id: vetor} original (store[id], keys(), items())
+    e expõe a matriz inteira em .matrix para operações vetorizadas. A matriz
+    pode estar comprimida (float16, ou int8 com .scales por vetor): store[id]
+    devolve sempre um vetor float32 e dot() calcula direto na forma comprimida.
+    """
+
+    def __init__(self, ids, matrix, scales=None):
+        self.ids = list(ids)
+        self.matrix = matrix
+        self.scales = scales
+        self.index = {item_id: i for i, item_id in enumerate(self.ids)}
+        self._norms = None
+
+    @property
+    def norms(self):
+        """Normas L2 de cada linha (calculadas uma única vez)"""
+        if self._norms is None:
+            self._norms = compressed_norms(self.matrix, self.scales)
+        return self._norms
+
+    def dot(self, vector):
+        """Produto escalar de um vetor com todas as linhas"""
+        return compressed_dot(self.matrix, vector, self.scales)
+
+    def __getitem__(self, item_id):
+        position = self.index[item_id]
+        if self.matrix.dtype == np.float32:
+            return self.matrix[position]
+        return decompress_row(self.matrix[position], self.scales[position] if self.scales is not None else None)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, item_id):
+        return item_id in self.index
+
+
+class FeatureTable(Mapping):
+    """
+    Tabela colunar de características (vagas ou candidatos) indexada por ID.
+
+    As linhas são convertidas em dicionários apenas quando acessadas,
+    no mesmo formato de processed_jobs / processed_applicants; apenas as
+    últimas cache_size linhas acessadas ficam em cache.
+    """
+
+    cache_size = 1024
+
+    def __init__(self, table, id_column="id"):
+        self.table = table
+        self.id_column = id_column
+        self.ids = [str(item_id) for item_id in table.column(id_column).to_pylist()]
+        self.index = {item_id: i for i, item_id in enumerate(self.ids)}
+        self._rows = {}
+        self._encoded = {}
+
+    def __getitem__(self, item_id):
+        row = self._rows.get(item_id)
+        if row is None:
+            row = self.table.slice(self.index[item_id], 1).to_pylist()[0]
+            row.pop(self.id_column, None)
+            if len(self._rows) >= self.cache_size:
+                self._rows.pop(next(iter(self._rows)))
+            self._rows[item_id] = row
+        return row
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, item_id):
+        return item_id in self.index
+
+    def column(self, name, default=None):
+        """Retorna uma coluna inteira como lista, na ordem de self.ids (default se a coluna não existe)"""
+        if name not in self.table.column_names:
+            return [default] * len(self.ids)
+        return self.table.column(name).to_pylist()
+
+    def encoded_column(self, name, encoder, ids=None):
+        """
+        Coluna convertida por encoder (chamado uma vez por valor distinto) em array int32,
+        na ordem de ids (padrão: self.ids); IDs ausentes recebem encoder(None).
+
+        O array fica em cache enquanto for pedido com a mesma lista de IDs.
+        """
+        ids = self.ids if ids is None else ids
+        cached = self._encoded.get((name, encoder))
+        if cached is not None and cached[0] is ids:
+            return cached[1]
+
+        values = self.column(name)
+        encoded = {}
+        codes = np.array([encoded[value] if value in encoded else encoded.setdefault(value, encoder(value))
+                          for value in values] + [encoder(None)], dtype=np.int32)
+        if ids is not self.ids:
+            # Última posição = código dos IDs ausentes da tabela
+            codes = codes[np.array([self.index.get(item_id, -1) for item_id in ids], dtype=np.int64)]
+        else:
+            codes = codes[:-1]
+
+        self._encoded[(name, encoder)] = (ids, codes)
+        return codes
+
+
+class MatchDetailsStore(Mapping):
+    """
+    Detalhes de match armazenados como arrays tipados.
+
+    Os pares de cada vaga ocupam um trecho contíguo (offsets) de dois arrays:
+    o índice do candidato em applicant_ids e uma linha float32 com os scores
+    de cada componente. job_arrays() e pair_details() leem direto desses arrays.
+
+    store.get(job_id, {}) retorna {applicant_id: {componente: score}} como
+    o dicionário original; os dicionários de uma vaga são montados apenas
+    quando a vaga é acessada, e as últimas vagas acessadas ficam em cache.
+    """
+
+    cache_size = 8
+
+    def __init__(self, job_ids, offsets, applicant_index, scores, applicant_ids, components=SCORE_COMPONENTS):
+        self.job_ids = list(job_ids)
+        self.job_index = {job_id: i for i, job_id in enumerate(self.job_ids)}
+        self.offsets = offsets
+        self.applicant_index = applicant_index
+        self.scores = scores
+        self.applicant_ids = applicant_ids
+        self.components = list(components)
+        self._cache = {}
+        self._applicant_rows = None
+        self._positions = None
+
+    @classmethod
+    def from_job_arrays(cls, job_arrays, applicant_ids, components=SCORE_COMPONENTS):
+        """
+        Monta o store a partir de {job_id: (índices em applicant_ids, scores (n, componentes))},
+        o formato produzido pelo pipeline vaga a vaga.
+        """
+        job_ids = [str(job_id) for job_id in job_arrays]
+        counts = [len(indices) for indices, _ in job_arrays.values()]
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        if job_arrays:
+            applicant_index = np.concatenate([np.asarray(indices, dtype=np.int32) for indices, _ in job_arrays.values()])
+            scores = np.concatenate([np.asarray(rows, dtype=np.float32).reshape(-1, len(components))
+                                     for _, rows in job_arrays.values()])
+        else:
+            applicant_index = np.zeros(0, dtype=np.int32)
+            scores = np.zeros((0, len(components)), dtype=np.float32)
+        if not isinstance(applicant_ids, list):
+            applicant_ids = list(applicant_ids)
+        return cls(job_ids, offsets, applicant_index, scores, applicant_ids, components)
+
+    @classmethod
+    def from_nested(cls, match_details, applicant_ids, components=SCORE_COMPONENTS):
+        """Converte o formato antigo {job_id: {applicant_id: {componente: score}}}"""
+        applicant_position = {str(applicant_id): i for i, applicant_id in enumerate(applicant_ids)}
+        job_arrays = {
+            job_id: details_to_arrays(job_details, applicant_position, components)
+            for job_id, job_details in match_details.items()
+        }
+        return cls.from_job_arrays(job_arrays, applicant_ids, components)
+
+    def job_arrays(self, job_id):
+        """
+        (índices dos candidatos em applicant_ids, scores float32 (n, componentes)) de uma vaga.
+
+        São fatias dos arrays do store (sem cópia); vaga sem detalhes retorna arrays vazios.
+        """
+        position = self.job_index.get(job_id)
+        if position is None:
+            return np.zeros(0, dtype=np.int32), np.zeros((0, len(self.components)), dtype=np.float32)
+        start, end = int(self.offsets[position]), int(self.offsets[position + 1])
+        return self.applicant_index[start:end], self.scores[start:end]
+
+    def pair_details(self, job_id, applicant_id):
+        """{componente: score} de um par vaga/candidato (dicionário novo), ou {} se o par não tem detalhes"""
+        if self._applicant_rows is None:
+            self._applicant_rows = {item_id: i for i, item_id in enumerate(self.applicant_ids)}
+        applicant_row = self._applicant_rows.get(applicant_id)
+        if applicant_row is None:
+            return {}
+        indices, scores = self.job_arrays(job_id)
+        hits = np.flatnonzero(indices == applicant_row)
+        if not len(hits):
+            return {}
+        return dict(zip(self.components, scores[hits[0]].tolist()))
+
+    def positions_in(self, applicant_ids):
+        """
+        Posição de cada candidato do store em outra lista de IDs (-1 se ausente),
+        ou None quando a lista é a mesma do store (índices já válidos).
+        """
+        if applicant_ids is self.applicant_ids:
+            return None
+        if self._positions is not None and self._positions[0] is applicant_ids:
+            return self._positions[1]
+        applicant_position = {item_id: i for i, item_id in enumerate(applicant_ids)}
+        remap = np.array([applicant_position.get(item_id, -1) for item_id in self.applicant_ids], dtype=np.int64)
+        self._positions = (applicant_ids, remap)
+        return remap
+
+    def __getstate__(self):
+        # Caches não vão para o pickle
+        state = dict(self.__dict__)
+        state.update(_cache={}, _applicant_rows=None, _positions=None)
+        return state
+
+    def __getitem__(self, job_id):
+        job_details = self._cache.get(job_id)
+        if job_details is not None:
+            return job_details
+
+        position = self.job_index[job_id]
+        start, end = int(self.offsets[position]), int(self.offsets[position + 1])
+        indices = self.applicant_index[start:end].tolist()
+        rows = self.scores[start:end].tolist()
+        job_details = {
+            self.applicant_ids[applicant_idx]: dict(zip(self.components, row))
+            for applicant_idx, row in zip(indices, rows)
+        }
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[job_id] = job_details
+        return job_details
+
+    def __iter__(self):
+        return iter(self.job_ids)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def __contains__(self, job_id):
+        return job_id in self.job_index
+
+
+def details_to_arrays(job_details, applicant_position, components=SCORE_COMPONENTS):
+    """Converte {applicant_id: {componente: score}} em (índices, scores float32) de uma vaga"""
+    indices = []
+    scores = []
+    for applicant_id, details in job_details.items():
+        applicant_idx = applicant_position.get(str(applicant_id))
+        if applicant_idx is None:
+            continue
+        indices.append(applicant_idx)
+        scores.append([float(details.get(component, 0.0)) for component in components])
+    return (np.asarray(indices, dtype=np.int32),
+            np.asarray(scores, dtype=np.float32).reshape(len(indices), len(components)))
+
+
+def job_match_arrays(match_details, job_id, applicant_ids, components=SCORE_COMPONENTS):
+    """
+    Detalhes de match de uma vaga como (posições em applicant_ids, scores float32 (n, len(components))).
+
+    Aceita o MatchDetailsStore ou o dicionário aninhado do pickle antigo;
+    candidatos ausentes de applicant_ids são descartados.
+    """
+    if isinstance(match_details, MatchDetailsStore):
+        indices, scores = match_details.job_arrays(job_id)
+        remap = match_details.positions_in(applicant_ids)
+        positions = np.asarray(indices, dtype=np.int64) if remap is None else remap[indices]
+        columns = [match_details.components.index(component) for component in components]
+        keep = positions >= 0
+        return positions[keep], np.asarray(scores[:, columns][keep], dtype=np.float32)
+
+    applicant_position = {applicant_id: i for i, applicant_id in enumerate(applicant_ids)}
+    indices, scores = details_to_arrays(match_details.get(job_id, {}), applicant_position, components)
+    return indices.astype(np.int64), scores
+
+
+def match_pair_details(match_details, job_id, applicant_id):
+    """{componente: score} de um par vaga/candidato (cópia), em qualquer formato de match_details"""
+    if isinstance(match_details, MatchDetailsStore):
+        return match_details.pair_details(job_id, applicant_id)
+    return dict(match_details.get(job_id, {}).get(applicant_id, {}))
+
+
+# ==== Versões Publicadas ====
+CURRENT_FILE = "CURRENT"
+
+
+def current_version_directory(directory):
+    """
+    Diretório da versão publicada em directory (apontada por CURRENT).
+
+    Sem CURRENT, devolve o próprio diretório (layout antigo, com os arquivos
+    direto na raiz).
+    """
+    try:
+        with open(os.path.join(directory, CURRENT_FILE), 'r', encoding='utf-8') as f:
+            return os.path.join(directory, f.read().strip())
+    except FileNotFoundError:
+        return directory
+
+
+def new_version_directory(directory):
+    """Cria um subdiretório vazio para uma nova versão; retorna (nome, caminho)"""
+    name = f"v-{uuid.uuid4().hex}"
+    path = os.path.join(directory, name)
+    os.makedirs(path)
+    return name, path
+
+
+def publish_version(directory, name):
+    """
+    Publica a versão name (troca atômica de CURRENT) e remove as versões antigas.
+
+    A versão publicada até agora é mantida, para leitores que já resolveram
+    CURRENT mas ainda estão abrindo os arquivos. Uma versão que não pode ser
+    removida (ex.: arquivos ainda mapeados em memória no Windows) fica para a
+    próxima publicação.
+    """
+    current_path = os.path.join(directory, CURRENT_FILE)
+    previous = os.path.basename(current_version_directory(directory))
+    legacy_layout = not os.path.exists(current_path)
+
+    temp_path = os.path.join(directory, f"{CURRENT_FILE}.{uuid.uuid4().hex}.tmp")
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(name)
+    os.replace(temp_path, current_path)
+
+    for entry in os.listdir(directory):
+        path = os.path.join(directory, entry)
+        if entry in (CURRENT_FILE, name, previous) or entry.startswith(CURRENT_FILE + "."):
+            continue
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif not legacy_layout:
+                # Arquivos do layout antigo saem junto com a versão seguinte
+                os.remove(path)
+        except OSError:
+            pass
+
+
+# ==== Escrita ====
+def _write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_embeddings(directory, name, embeddings, embedding_dtype=EMBEDDING_DTYPE):
+    """Salva {id: vetor} como matriz .npy contígua (no formato pedido) + lista de IDs"""
+    ids = [str(item_id) for item_id in embeddings.keys()]
+    if ids:
+        matrix = np.vstack([np.asarray(embeddings[item_id], dtype=np.float32) for item_id in embeddings.keys()])
+    else:
+        matrix = np.zeros((0, 0), dtype=np.float32)
+    matrix, scales = compress_matrix(matrix, embedding_dtype)
+    np.save(os.path.join(directory, f"{name}_embeddings.npy"), np.ascontiguousarray(matrix))
+    if scales is not None:
+        np.save(os.path.join(directory, f"{name}_embedding_scales.npy"), scales)
+    _write_json(os.path.join(directory, f"{name}_ids.json"), ids)
+    return ids
+
+
+def _write_feature_table(path, features):
+    """Salva {id: {campo: valor}} como tabela colunar Arrow IPC"""
+    ids = [str(item_id) for item_id in features.keys()]
+    rows = list(features.values())
+
+    # União dos campos de todas as linhas (mantendo a ordem de aparição)
+    columns = {"id": ids}
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns[key] = None
+    for key in list(columns):
+        if key != "id":
+            columns[key] = [row.get(key) for row in rows]
+
+    table = pa.table(columns)
+    with pa.OSFile(path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _write_match_details(directory, match_details, applicant_ids):
+    """
+    Salva os detalhes de match como arrays tipados, a partir de um MatchDetailsStore
+    (arrays reindexados para applicant_ids, sem passar por dicionários) ou do
+    formato antigo {job_id: {applicant_id: {componente: score}}}.
+    """
+    if not isinstance(match_details, MatchDetailsStore):
+        match_details = MatchDetailsStore.from_nested(match_details, applicant_ids)
+
+    remap = match_details.positions_in(applicant_ids)
+    indices = np.asarray(match_details.applicant_index, dtype=np.int64)
+    if remap is not None:
+        indices = remap[indices]
+    keep = indices >= 0
+    kept_before = np.concatenate([[0], np.cumsum(keep)])
+    columns = [match_details.components.index(component) for component in SCORE_COMPONENTS]
+
+    _write_json(os.path.join(directory, "match_job_ids.json"), [str(job_id) for job_id in match_details.job_ids])
+    np.save(os.path.join(directory, "match_offsets.npy"),
+            kept_before[np.asarray(match_details.offsets, dtype=np.int64)].astype(np.int64))
+    np.save(os.path.join(directory, "match_applicant_index.npy"), indices[keep].astype(np.int32))
+    np.save(os.path.join(directory, "match_scores.npy"),
+            np.ascontiguousarray(np.asarray(match_details.scores, dtype=np.float32)[:, columns][keep]))
+
+
+def save_artifacts(data, directory=ARTIFACT_DIR, embedding_dtype=EMBEDDING_DTYPE):
+    """
+    Salva os dados processados (mesmo dicionário do pickle) no formato de artefatos.
+
+    embedding_dtype escolhe o armazenamento dos embeddings: "float32", "float16"
+    ou "int8" (com escala por vetor; ver vector_search.compress_matrix).
+    Os arquivos são escritos em uma versão nova e publicados com publish_version.
+    Se a escrita falha no meio, a versão anterior continua publicada.
+    """
+    os.makedirs(directory, exist_ok=True)
+    version_name, version_directory = new_version_directory(directory)
+    try:
+        job_ids = _write_embeddings(version_directory, "job", data.get('job_embeddings', {}), embedding_dtype)
+        applicant_ids = _write_embeddings(version_directory, "applicant", data.get('applicant_embeddings', {}), embedding_dtype)
+        _write_feature_table(os.path.join(version_directory, "processed_jobs.arrow"), data.get('processed_jobs', {}))
+        _write_feature_table(os.path.join(version_directory, "processed_applicants.arrow"), data.get('processed_applicants', {}))
+        _write_json(os.path.join(version_directory, "hired_candidates.json"), data.get('hired_candidates', {}))
+        _write_match_details(version_directory, data.get('match_details', {}), applicant_ids)
+
+        _write_json(os.path.join(version_directory, "manifest.json"), {
+            "format_version": FORMAT_VERSION,
+            "data_version": uuid.uuid4().hex,
+            "score_components": SCORE_COMPONENTS,
+            "embedding_dtype": embedding_dtype,
+            "counts": {
+                "jobs": len(data.get('processed_jobs', {})),
+                "applicants": len(data.get('processed_applicants', {})),
+                "job_embeddings": len(job_ids),
+                "applicant_embeddings": len(applicant_ids),
+                "match_jobs": len(data.get('match_details', {}))
+            }
+        })
+    except Exception:
+        shutil.rmtree(version_directory, ignore_errors=True)
+        raise
+
+    publish_version(directory, version_name)
+
+
+def convert_pickle_to_artifacts(pickle_path, directory=ARTIFACT_DIR, embedding_dtype=EMBEDDING_DTYPE):
+    """Converte o pickle monolítico antigo para o formato de artefatos"""
+    with open(pickle_path, 'rb') as f:
+        data = pickle.load(f)
+    save_artifacts(data, directory, embedding_dtype)
+
+
+# ==== Leitura ====
+def artifacts_exist(directory=ARTIFACT_DIR):
+    """Verifica se há um conjunto completo de artefatos no diretório"""
+    return os.path.exists(os.path.join(current_version_directory(directory), "manifest.json"))
+
+
+def artifacts_version(directory=ARTIFACT_DIR):
+    """
+    Identificador do conjunto de artefatos (muda a cada save_artifacts), ou None.
+
+    Usado para saber se dados derivados dos artefatos (ex.: recomendações
+    materializadas) ainda correspondem a eles.
+    """
+    try:
+        return _read_json(os.path.join(current_version_directory(directory), "manifest.json")).get("data_version")
+    except (OSError, ValueError):
+        return None
+
+
+def _load_feature_table(path):
+    source = pa.memory_map(path, 'r')
+    return FeatureTable(pa.ipc.open_file(source).read_all())
+
+
+def load_artifacts(directory=ARTIFACT_DIR, mmap=True):
+    """
+    Carrega os artefatos no mesmo formato de dicionário do pickle.
+
+    Com mmap=True, matrizes e tabelas são mapeadas em memória (somente leitura)
+    em vez de copiadas para a RAM do processo.
+    """
+    directory = current_version_directory(directory)
+    manifest = _read_json(os.path.join(directory, "manifest.json"))
+    mmap_mode = 'r' if mmap else None
+
+    def load_embeddings(name):
+        ids = _read_json(os.path.join(directory, f"{name}_ids.json"))
+        matrix = np.load(os.path.join(directory, f"{name}_embeddings.npy"), mmap_mode=mmap_mode)
+        scales_path = os.path.join(directory, f"{name}_embedding_scales.npy")
+        scales = np.load(scales_path) if os.path.exists(scales_path) else None
+        return EmbeddingStore(ids, matrix, scales)
+
+    job_embeddings = load_embeddings("job")
+    applicant_embeddings = load_embeddings("applicant")
+
+    match_details = MatchDetailsStore(
+        _read_json(os.path.join(directory, "match_job_ids.json")),
+        np.load(os.path.join(directory, "match_offsets.npy"), mmap_mode=mmap_mode),
+        np.load(os.path.join(directory, "match_applicant_index.npy"), mmap_mode=mmap_mode),
+        np.load(os.path.join(directory, "match_scores.npy"), mmap_mode=mmap_mode),
+        applicant_embeddings.ids,
+        manifest.get("score_components", SCORE_COMPONENTS)
+    )
+
+    return {
+        'processed_jobs': _load_feature_table(os.path.join(directory, "processed_jobs.arrow")),
+        'processed_applicants': _load_feature_table(os.path.join(directory, "processed_applicants.arrow")),
+        'hired_candidates': _read_json(os.path.join(directory, "hired_candidates.json")),
+        'job_embeddings': job_embeddings,
+        'applicant_embeddings': applicant_embeddings,
+        'match_details': match_details
+    }
@@ -0,0 +1,357 @@
+"""
+Cache de Dados - Decision Recruiter
+
+Cache em disco, endereçado por conteúdo, dos dados processados a partir dos
+arquivos do GitHub Releases. A chave combina o hash SHA-256 dos arquivos
+baixados com uma impressão digital do código dos extratores, então qualquer
+mudança nos dados ou na lógica de extração gera uma nova entrada
+automaticamente.
+
+Os arquivos brutos ficam em um espelho local revalidado com requisições
+condicionais (ETag / Last-Modified): uma resposta 304 não transfere nada,
+e sem rede o espelho é usado diretamente.
+"""
+
+import codecs
+import contextlib
+import functools
+import glob
+import hashlib
+import http.server
+import inspect
+import json
+import os
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Diretório padrão do cache em disco
+CACHE_DIR = "decision_cache"
+
+# Espelho local dos arquivos do release (corpo + ETag/Last-Modified)
+MIRROR_DIR = os.path.join(CACHE_DIR, "mirror")
+
+# Parâmetros de download dos arquivos do release
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # bytes por leitura do stream
+DOWNLOAD_TIMEOUT = 30  # segundos
+
+
+def content_hash(*parts):
+    """Hash SHA-256 (hex) de uma sequência de partes textuais"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def code_fingerprint(*functions):
+    """Impressão digital do código-fonte das funções (muda quando a lógica muda)"""
+    return content_hash(*(inspect.getsource(function) for function in functions))[:16]
+
+
+def _cache_path(namespace, code_version, data_key, directory):
+    return os.path.join(directory, f"{namespace}_{code_version}_{data_key[:32]}.pkl")
+
+
+def load_cached(namespace, code_version, data_key, directory=CACHE_DIR):
+    """Carrega uma entrada do cache, ou None se não existir"""
+    path = _cache_path(namespace, code_version, data_key, directory)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def load_latest_cached(namespace, code_version, directory=CACHE_DIR):
+    """
+    Carrega a entrada mais recente para esta versão do código, independentemente
+    dos dados (usado quando a identidade dos arquivos remotos não pode ser verificada).
+    """
+    paths = glob.glob(os.path.join(directory, f"{namespace}_{code_version}_*.pkl"))
+    for path in sorted(paths, key=os.path.getmtime, reverse=True):
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            continue
+    return None
+
+
+def save_cached(namespace, code_version, data_key, data, directory=CACHE_DIR):
+    """Salva uma entrada no cache (escrita atômica, pickle binário de protocolo mais alto)"""
+    os.makedirs(directory, exist_ok=True)
+    path = _cache_path(namespace, code_version, data_key, directory)
+    temp_path = path + ".tmp"
+    with open(temp_path, 'wb') as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temp_path, path)
+
+    # Entradas antigas da mesma versão do código não serão mais usadas
+    for old_path in glob.glob(os.path.join(directory, f"{namespace}_{code_version}_*.pkl")):
+        if old_path != path:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+
+# ==== Download em Streaming ====
+_json_decoder = json.JSONDecoder()
+_whitespace = ' \t\n\r'
+
+
+def iter_json_object_items(chunks):
+    """
+    Itera sobre os pares (chave, valor) de um objeto JSON de nível superior
+    à medida que os blocos de bytes chegam, sem montar o documento inteiro.
+
+    Cada valor é decodificado assim que está completo no buffer, então a
+    memória fica limitada ao maior registro individual.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer = ''
+    position = 0
+    finished = False
+    started = False
+
+    def read_more():
+        nonlocal buffer, position, finished
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            buffer = buffer[position:] + decoder.decode(b'', final=True)
+            finished = True
+        else:
+            buffer = buffer[position:] + decoder.decode(chunk)
+        position = 0
+
+    def skip(characters):
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in characters:
+                position += 1
+            if position < len(buffer) or finished:
+                return
+            read_more()
+
+    def decode_value():
+        nonlocal position
+        while True:
+            try:
+                value, end = _json_decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if finished:
+                    raise
+                read_more()
+                continue
+            # Números (e true/false/null) podem estar truncados no fim do buffer, inclusive
+            # em um resultado válido ("1." -> 1): exigir o ',' ou '}' seguinte já no buffer
+            if buffer[position:position + 1] not in ('{', '[', '"') and not finished:
+                following = end
+                while following < len(buffer) and buffer[following] in _whitespace:
+                    following += 1
+                if buffer[following:following + 1] not in (',', '}'):
+                    read_more()
+                    continue
+            position = end
+            return value
+
+    while True:
+        skip(_whitespace + (',' if started else ''))
+        if not started:
+            if buffer[position:position + 1] != '{':
+                raise ValueError("O documento JSON não é um objeto")
+            position += 1
+            started = True
+            continue
+        if position >= len(buffer):
+            raise ValueError("Objeto JSON incompleto")
+        if buffer[position] == '}':
+            return
+
+        key = decode_value()
+        skip(_whitespace)
+        if buffer[position:position + 1] != ':':
+            raise ValueError(f"Esperado ':' após a chave {key!r}")
+        position += 1
+        skip(_whitespace)
+        yield key, decode_value()
+
+
+def create_session(pool_size=4):
+    """Sessão HTTP com pool de conexões reutilizáveis"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _mirror_paths(mirror_dir, name):
+    return os.path.join(mirror_dir, f"{name}.json"), os.path.join(mirror_dir, f"{name}.meta.json")
+
+
+def read_mirror_meta(mirror_dir, name):
+    """Metadados do arquivo espelhado (url, etag, last_modified, sha256), ou None"""
+    body_path, meta_path = _mirror_paths(mirror_dir, name)
+    if not (os.path.exists(body_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_mirrored_json_asset(mirror_dir, name, process_record, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """Processa em streaming um arquivo JSON do espelho local"""
+    body_path, _ = _mirror_paths(mirror_dir, name)
+    with open(body_path, 'rb') as f:
+        chunks = iter(lambda: f.read(chunk_size), b'')
+        return {key: process_record(record) for key, record in iter_json_object_items(chunks)}
+
+
+def fetch_json_asset(session, url, process_record, name=None, mirror_dir=None, parse_unchanged=True,
+                     chunk_size=DOWNLOAD_CHUNK_SIZE, timeout=DOWNLOAD_TIMEOUT):
+    """
+    Baixa um objeto JSON {id: registro} em streaming e processa cada registro
+    assim que ele é decodificado.
+
+    Com mirror_dir, o corpo é gravado no espelho durante o download e as
+    próximas chamadas enviam If-None-Match / If-Modified-Since: em um 304 (ou
+    sem rede) o espelho é usado. Com parse_unchanged=False, um arquivo não
+    modificado não é processado e os registros retornam como None. Uma falha
+    de rede durante o download também cai no espelho, quando ele existe.
+
+    Retorna (sha256 do conteúdo, {id: process_record(registro)} ou None).
+    """
+    meta = read_mirror_meta(mirror_dir, name) if mirror_dir else None
+    if meta is not None and meta.get('url') != url:
+        meta = None
+
+    headers = {}
+    if meta is not None:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    try:
+        response = session.get(url, stream=True, timeout=timeout, headers=headers)
+        response.raise_for_status()
+    except requests.RequestException:
+        if meta is None:
+            raise
+        response = None  # Sem rede ou erro no servidor: usar o espelho
+
+    if response is None or response.status_code == 304:
+        if response is not None:
+            response.close()
+        records = load_mirrored_json_asset(mirror_dir, name, process_record) if parse_unchanged else None
+        return meta['sha256'], records
+
+    digest = hashlib.sha256()
+    body_path = meta_path = temp_path = None
+    sink = None
+    if mirror_dir:
+        os.makedirs(mirror_dir, exist_ok=True)
+        body_path, meta_path = _mirror_paths(mirror_dir, name)
+        temp_path = body_path + ".tmp"
+        sink = open(temp_path, 'wb')
+
+    def tee(chunks):
+        for chunk in chunks:
+            digest.update(chunk)
+            if sink is not None:
+                sink.write(chunk)
+            yield chunk
+
+    with response:
+        try:
+            stream = tee(response.iter_content(chunk_size=chunk_size))
+            records = {key: process_record(record) for key, record in iter_json_object_items(stream)}
+            # Consumir o restante do corpo (espaços finais) para o hash e o espelho
+            for _ in stream:
+                pass
+        except Exception as error:
+            # Descartar o corpo parcial; conexão interrompida no meio do corpo cai no espelho, se houver
+            if sink is not None:
+                sink.close()
+                sink = None
+                os.remove(temp_path)
+            if meta is None or not isinstance(error, requests.RequestException):
+                raise
+            records = load_mirrored_json_asset(mirror_dir, name, process_record) if parse_unchanged else None
+            return meta['sha256'], records
+        finally:
+            if sink is not None:
+                sink.close()
+
+    if mirror_dir:
+        os.replace(temp_path, body_path)
+        with open(meta_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'sha256': digest.hexdigest()
+            }, f)
+        os.replace(meta_path + ".tmp", meta_path)
+
+    return digest.hexdigest(), records
+
+
+def download_json_assets(urls, processors, session=None, mirror_dir=None, parse_unchanged=True):
+    """
+    Baixa vários arquivos JSON em paralelo (uma thread por arquivo, sessão compartilhada).
+
+    urls: {nome: url}; processors: {nome: função aplicada a cada registro}.
+    O tempo total fica próximo ao do maior download, e não à soma deles.
+    Retorna {nome: (sha256, registros processados ou None)} (ver fetch_json_asset).
+    """
+    own_session = session is None
+    if own_session:
+        session = create_session(pool_size=len(urls))
+    try:
+        with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+            futures = {
+                name: executor.submit(fetch_json_asset, session, url, processors[name], name=name,
+                                      mirror_dir=mirror_dir, parse_unchanged=parse_unchanged)
+                for name, url in urls.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
+    finally:
+        if own_session:
+            session.close()
+
+
+@contextlib.contextmanager
+def local_asset_server(directory):
+    """
+    Servidor HTTP local que serve os arquivos de um diretório, para substituir
+    o GitHub Releases em testes. Produz a URL base (ex.: http://127.0.0.1:PORTA).
+    """
+    handler = functools.partial(_QuietFileHandler, directory=directory)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class _QuietFileHandler(http.server.SimpleHTTPRequestHandler):
+    """Handler de arquivos estáticos sem log no terminal"""
+
+    def log_message(self, format, *args):
+        pass
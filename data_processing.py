@@ -23,23 +23,62 @@ import json
 import re
 import pickle
 import string
+import multiprocessing
+import shutil
 from tqdm import tqdm
 from sklearn.feature_extraction.text import TfidfVectorizer
-from collections import Counter
+from collections import Counter, deque
 import nltk
 from nltk.tokenize import word_tokenize
+from vector_search import LOCAL_INDEX_DIR, build_embedding_matrix, build_local_index, iter_top_k_cosine
+from artifact_store import (ARTIFACT_DIR, SCORE_COMPONENTS, MatchDetailsStore, artifacts_version, details_to_arrays,
+                            load_artifacts, save_artifacts)
+from ranking import RECOMMENDATION_TOP_N, RECOMMENDATIONS_DIR, build_recommendations, save_recommendations
+from data_cache import content_hash, iter_json_object_items
+from embeddings import EMBEDDING_MODEL_NAME, ENCODE_BATCH_SIZE, CachedEncoder
 
 # Criação de diretório para resultados intermediários
 output_dir = "resultados_intermediarios"
 os.makedirs(output_dir, exist_ok=True)
 
+# Número de currículos enviados juntos ao spaCy (nlp.pipe)
+SPACY_BATCH_SIZE = 50
+
+# Processos usados na extração de características dos candidatos (1 = modo serial)
+# e número de candidatos enviados a cada processo por vez
+APPLICANT_WORKERS = int(os.environ.get("DECISION_APPLICANT_WORKERS", "1"))
+APPLICANT_CHUNK_SIZE = 25
+
+# Ingestão em streaming: os registros são lidos dos arquivos JSON um a um e
+# enviados direto às etapas de extração, sem manter os dados brutos em memória
+STREAMING_INGESTION = os.environ.get("DECISION_STREAMING_INGESTION", "0") == "1"
+JSON_READ_CHUNK_SIZE = 1 << 20  # bytes
+
+# Codificação dos embeddings: textos por lote, threads do PyTorch na CPU (0 = padrão)
+# e máximo de tokens por texto (0 = padrão do modelo)
+EMBEDDING_BATCH_SIZE = int(os.environ.get("DECISION_EMBEDDING_BATCH_SIZE", str(ENCODE_BATCH_SIZE)))
+EMBEDDING_THREADS = int(os.environ.get("DECISION_EMBEDDING_THREADS", "0"))
+EMBEDDING_MAX_SEQ_LENGTH = int(os.environ.get("DECISION_EMBEDDING_MAX_SEQ_LENGTH", "0"))
+
+# Backend de inferência dos embeddings: "torch", "onnx" ou "onnx-int8" (ONNX Runtime na CPU;
+# o modelo é exportado e comparado com o PyTorch na primeira execução)
+EMBEDDING_BACKEND = os.environ.get("DECISION_EMBEDDING_BACKEND", "torch")
+
+# Candidatos mantidos por vaga no cálculo de matches e vagas pontuadas por multiplicação de matrizes
+MATCH_TOP_K = 1000
+MATCH_JOB_BLOCK_SIZE = 256
+
+# Processos filhos do pool reaproveitam os recursos já baixados pelo processo principal
+is_worker_process = multiprocessing.parent_process() is not None
+
 # ==== Configuração do NLTK e spaCy ====
 print("Configurando NLTK e spaCy...")
 
 # Baixar TODOS recursos NLTK para garantir precisão máxima
-print("Baixando TODOS os recursos NLTK (isso pode demorar alguns minutos)...")
-nltk.download('all')
-print("Todos os recursos NLTK foram baixados com sucesso!")
+if not is_worker_process:
+    print("Baixando TODOS os recursos NLTK (isso pode demorar alguns minutos)...")
+    nltk.download('all')
+    print("Todos os recursos NLTK foram baixados com sucesso!")
 
 # Carregar spaCy
 try:
@@ -85,12 +124,158 @@ def load_intermediate(filename):
     with open(full_path, 'rb') as f:
         return pickle.load(f)
 
+# ==== Checkpoints em Shards ====
+# Cada lote grava apenas o seu próprio delta (um shard) e um pequeno manifesto
+# JSON lista os shards concluídos. Na retomada, o dicionário completo é
+# remontado a partir dos shards, sem regravar tudo a cada lote.
+def get_shard_dir(name):
+    """Diretório dos shards de um checkpoint"""
+    return os.path.join(output_dir, f"{name}_shards")
+
+def load_shard_manifest(name):
+    """Carrega o manifesto dos shards (vazio se o checkpoint ainda não existe)"""
+    manifest_path = os.path.join(get_shard_dir(name), "manifest.json")
+    if not os.path.exists(manifest_path):
+        return {"shards": []}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_shard(name, shard_key, data):
+    """Salva o delta de um lote como um novo shard e o registra no manifesto"""
+    directory = get_shard_dir(name)
+    os.makedirs(directory, exist_ok=True)
+    
+    # Escrita atômica: um shard interrompido no meio nunca entra no manifesto
+    filename = f"shard_{shard_key:05d}.pkl"
+    temp_path = os.path.join(directory, filename + ".tmp")
+    with open(temp_path, 'wb') as f:
+        pickle.dump(data, f)
+    os.replace(temp_path, os.path.join(directory, filename))
+    
+    manifest = load_shard_manifest(name)
+    manifest["shards"] = [entry for entry in manifest["shards"] if entry["key"] != shard_key]
+    manifest["shards"].append({"key": shard_key, "file": filename, "records": len(data)})
+    
+    temp_manifest = os.path.join(directory, "manifest.json.tmp")
+    with open(temp_manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_manifest, os.path.join(directory, "manifest.json"))
+
+def load_shards(name):
+    """Remonta o dicionário completo a partir dos shards; retorna (dados, chaves dos shards)"""
+    manifest = load_shard_manifest(name)
+    if manifest["shards"]:
+        print(f"Remontando {len(manifest['shards'])} shards de {get_shard_dir(name)}...")
+    
+    data = {}
+    for entry in sorted(manifest["shards"], key=lambda entry: entry["key"]):
+        with open(os.path.join(get_shard_dir(name), entry["file"]), 'rb') as f:
+            data.update(pickle.load(f))
+    return data, [entry["key"] for entry in manifest["shards"]]
+
+def clear_shards(name):
+    """Remove os shards de um checkpoint (após salvar o resultado final)"""
+    shutil.rmtree(get_shard_dir(name), ignore_errors=True)
+
+# Checkpoints antigos (dicionário acumulado até o lote N, em {prefixo}{N}.pkl)
+def legacy_batch_checkpoints(prefix):
+    """Lista [(N, nome do arquivo)] dos checkpoints antigos com o prefixo, em ordem de N"""
+    pattern = re.compile(re.escape(prefix) + r'(\d+)\.pkl$')
+    checkpoints = []
+    for filename in os.listdir(output_dir):
+        match = pattern.match(filename)
+        if match:
+            checkpoints.append((int(match.group(1)), filename))
+    return sorted(checkpoints)
+
+def remove_legacy_batch_checkpoints(prefix):
+    """Remove os checkpoints antigos (já convertidos em shards)"""
+    for _, filename in legacy_batch_checkpoints(prefix):
+        os.remove(os.path.join(output_dir, filename))
+
+# ==== Ledger de Conteúdo ====
+# Hash do conteúdo de cada vaga e candidato na última execução completa. Em uma
+# nova execução, apenas os registros novos ou alterados são reprocessados e os
+# resultados das etapas seguintes são atualizados no lugar.
+LEDGER_FILE = "content_ledger.json"
+
+def record_hash(record):
+    """Hash do conteúdo de um registro bruto (independente da ordem das chaves)"""
+    return content_hash(json.dumps(record, sort_keys=True, ensure_ascii=False))[:32]
+
+def load_content_ledger():
+    """Carrega o ledger da última execução, ou None se ainda não existir"""
+    ledger_path = os.path.join(output_dir, LEDGER_FILE)
+    if not os.path.exists(ledger_path):
+        return None
+    with open(ledger_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_content_ledger(ledger):
+    """Salva o ledger de forma atômica"""
+    ledger_path = os.path.join(output_dir, LEDGER_FILE)
+    with open(ledger_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(ledger, f)
+    os.replace(ledger_path + ".tmp", ledger_path)
+
+def diff_records(records, previous_hashes, processed):
+    """
+    Compara os registros atuais com o ledger anterior.
+    
+    Retorna (hashes atuais, {id: registro} dos novos ou alterados, ids na ordem do arquivo).
+    Sem ledger anterior (previous_hashes=None), os registros já processados são
+    considerados inalterados e apenas os ids novos entram na lista.
+    """
+    hashes = {}
+    changed_records = {}
+    record_ids = []
+    for record_id, record in records:
+        hashes[record_id] = record_hash(record)
+        record_ids.append(record_id)
+        unchanged = record_id in processed and (previous_hashes is None or previous_hashes.get(record_id) == hashes[record_id])
+        if not unchanged:
+            changed_records[record_id] = record
+    return hashes, changed_records, record_ids
+
+def stale_embedding_ids(embeddings, processed, changed_ids):
+    """Ids que precisam de um novo embedding (novos, alterados ou ainda sem embedding)"""
+    return [record_id for record_id in processed if record_id in changed_ids or record_id not in embeddings]
+
+def update_embeddings(embeddings, processed, stale_ids, model):
+    """Gera embeddings apenas para stale_ids e descarta os de registros removidos (ordem de processed)"""
+    if stale_ids:
+        vectors = model.encode([processed[record_id]['full_text'] for record_id in stale_ids], show_progress=True)
+        embeddings.update(zip(stale_ids, vectors))
+    return {record_id: embeddings[record_id] for record_id in processed if record_id in embeddings}
+
+def raw_data_is_stale(paths):
+    """Verifica se algum arquivo JSON é mais novo que o raw_data.pkl salvo"""
+    raw_mtime = os.path.getmtime(os.path.join(output_dir, "raw_data.pkl"))
+    return any(os.path.exists(path) and os.path.getmtime(path) > raw_mtime for path in paths)
+
 def load_local_json(file_path):
     """Carrega um arquivo JSON local"""
     print(f"Carregando dados de {file_path}...")
     with open(file_path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def iter_local_json(file_path, chunk_size=JSON_READ_CHUNK_SIZE):
+    """Itera sobre os pares (id, registro) de um arquivo JSON local sem carregá-lo inteiro"""
+    print(f"Lendo registros de {file_path} em streaming...")
+    with open(file_path, 'rb') as f:
+        yield from iter_json_object_items(iter(lambda: f.read(chunk_size), b''))
+
+def iter_record_batches(records, batch_size):
+    """Agrupa um iterável de (id, registro) em listas de até batch_size itens"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
 def clean_text(text):
     """Limpa o texto removendo caracteres especiais e padronizando"""
     if not isinstance(text, str):
@@ -105,42 +290,96 @@ def clean_text(text):
     return text
 
 # ==== Funções para Extração de Informações de Currículos ====
+# Lista de palavras-chave técnicas comuns
+TECH_KEYWORDS = [
+    "python", "java", "javascript", "js", "c#", "c++", "php", "ruby", "go", "golang", "swift",
+    "html", "css", "react", "angular", "vue", "node", "django", "flask", "laravel", "spring",
+    "aws", "azure", "gcp", "cloud", "docker", "kubernetes", "k8s", "terraform", "ansible",
+    "sql", "mysql", "postgresql", "mongodb", "oracle", "sql server", "nosql", "redis",
+    "git", "jenkins", "cicd", "ci/cd", "devops", "agile", "scrum", "kanban",
+    "machine learning", "ml", "ai", "data science", "big data", "hadoop", "spark",
+    "excel", "power bi", "tableau", "data visualization", "análise de dados",
+    "totvs", "sap", "erp", "crm", "navision", "dynamics", "salesforce",
+    "linux", "windows", "unix", "bash", "shell", "powershell",
+    "api", "rest", "soap", "microservices", "microsserviços", "web services",
+    "ux", "ui", "user experience", "user interface", "figma", "sketch", "adobe xd",
+    "jira", "confluence", "scrum", "gestão de projetos", "project management"
+]
+
+def build_skill_automaton(keywords):
+    """
+    Constrói um autômato Aho-Corasick sobre sequências de tokens.
+    
+    Cada palavra-chave (simples ou composta) vira um padrão de tokens, permitindo
+    encontrar todas as ocorrências com uma única passada pelo texto tokenizado.
+    Retorna as tabelas (transições, falhas, saídas) do autômato.
+    """
+    transitions = [{}]
+    failures = [0]
+    outputs = [[]]
+    
+    # Trie com os tokens de cada palavra-chave
+    for keyword_index, skill in enumerate(keywords):
+        skill_tokens = skill.split()
+        state = 0
+        for token in skill_tokens:
+            next_state = transitions[state].get(token)
+            if next_state is None:
+                transitions.append({})
+                failures.append(0)
+                outputs.append([])
+                next_state = len(transitions) - 1
+                transitions[state][token] = next_state
+            state = next_state
+        outputs[state].append((keyword_index, len(skill_tokens), skill))
+    
+    # Links de falha calculados em largura (BFS)
+    queue = deque(transitions[0].values())
+    while queue:
+        state = queue.popleft()
+        for token, next_state in transitions[state].items():
+            queue.append(next_state)
+            fallback = failures[state]
+            while fallback and token not in transitions[fallback]:
+                fallback = failures[fallback]
+            failures[next_state] = transitions[fallback].get(token, 0)
+            outputs[next_state] = outputs[next_state] + outputs[failures[next_state]]
+    
+    return transitions, failures, outputs
+
+# Autômato construído uma única vez na importação do módulo
+SKILL_AUTOMATON = build_skill_automaton(TECH_KEYWORDS)
+
+def find_skill_matches(tokens, automaton=SKILL_AUTOMATON):
+    """
+    Encontra todas as palavras-chave em uma lista de tokens com uma única passada.
+    
+    As ocorrências são retornadas na ordem de posição inicial e, na mesma posição,
+    na ordem da lista de palavras-chave (mesma ordem da busca token a token).
+    """
+    transitions, failures, outputs = automaton
+    matches = []
+    state = 0
+    for position, token in enumerate(tokens):
+        while state and token not in transitions[state]:
+            state = failures[state]
+        state = transitions[state].get(token, 0)
+        for keyword_index, length, skill in outputs[state]:
+            matches.append((position - length + 1, keyword_index, skill))
+    
+    matches.sort()
+    return [skill for _, _, skill in matches]
+
 def extract_technical_skills(cv_text):
     """Extrai habilidades técnicas do CV usando palavras-chave comuns em TI."""
     if not isinstance(cv_text, str) or not cv_text:
         return []
     
-    # Lista de palavras-chave técnicas comuns
-    tech_keywords = [
-        "python", "java", "javascript", "js", "c#", "c++", "php", "ruby", "go", "golang", "swift",
-        "html", "css", "react", "angular", "vue", "node", "django", "flask", "laravel", "spring",
-        "aws", "azure", "gcp", "cloud", "docker", "kubernetes", "k8s", "terraform", "ansible",
-        "sql", "mysql", "postgresql", "mongodb", "oracle", "sql server", "nosql", "redis",
-        "git", "jenkins", "cicd", "ci/cd", "devops", "agile", "scrum", "kanban",
-        "machine learning", "ml", "ai", "data science", "big data", "hadoop", "spark",
-        "excel", "power bi", "tableau", "data visualization", "análise de dados",
-        "totvs", "sap", "erp", "crm", "navision", "dynamics", "salesforce",
-        "linux", "windows", "unix", "bash", "shell", "powershell",
-        "api", "rest", "soap", "microservices", "microsserviços", "web services",
-        "ux", "ui", "user experience", "user interface", "figma", "sketch", "adobe xd",
-        "jira", "confluence", "scrum", "gestão de projetos", "project management"
-    ]
-    
     # Tokenizar o texto usando o tokenizador do NLTK
     tokens = word_tokenize(cv_text.lower())
     
-    # Encontrar correspondências
-    found_skills = []
-    for i in range(len(tokens)):
-        for skill in tech_keywords:
-            skill_tokens = skill.split()
-            if len(skill_tokens) == 1:
-                if tokens[i] == skill:
-                    found_skills.append(skill)
-            elif i + len(skill_tokens) <= len(tokens):
-                potential_match = " ".join(tokens[i:i+len(skill_tokens)])
-                if potential_match == skill:
-                    found_skills.append(skill)
+    # Encontrar correspondências (simples e compostas) em uma única passada
+    found_skills = find_skill_matches(tokens)
     
     # Contar ocorrências e retornar as mais frequentes
     skill_counter = Counter(found_skills)
@@ -186,8 +425,12 @@ def extract_education_level(cv_text):
     # Padrão se nada for encontrado
     return ""
 
-def extract_professional_level(cv_text, years_experience=None):
-    """Tenta extrair o nível profissional com base no tempo de experiência."""
+def extract_professional_level(cv_text, years_experience=None, doc=None):
+    """
+    Tenta extrair o nível profissional com base no tempo de experiência.
+    
+    Aceita opcionalmente o Doc do spaCy já processado para evitar uma nova análise do texto.
+    """
     if not cv_text:
         return ""
     
@@ -215,7 +458,8 @@ def extract_professional_level(cv_text, years_experience=None):
     # Tentativa de extrair experiência com base nos anos
     try:
         if spacy_available:
-            doc = nlp(cv_text)
+            if doc is None:
+                doc = nlp(cv_text)
             # Olhar por padrões como "X anos de experiência"
             for sent in doc.sents:
                 sent_text = sent.text.lower()
@@ -274,8 +518,12 @@ def extract_language_level(cv_text, language="inglês"):
     # Se menciona o idioma mas não especifica nível
     return "Mencionado (Nível não especificado)"
 
-def extract_location(cv_text):
-    """Tenta extrair a localização do candidato."""
+def extract_location(cv_text, doc=None):
+    """
+    Tenta extrair a localização do candidato.
+    
+    Aceita opcionalmente o Doc do spaCy já processado para evitar uma nova análise do texto.
+    """
     if not cv_text:
         return {}
     
@@ -314,7 +562,8 @@ def extract_location(cv_text):
     
     try:
         if spacy_available:
-            doc = nlp(cv_text)
+            if doc is None:
+                doc = nlp(cv_text)
             for ent in doc.ents:
                 if ent.label_ == "LOC":
                     # Verificar se é um estado
@@ -341,15 +590,56 @@ def extract_location(cv_text):
     
     return result
 
-def extract_all_from_cv(cv_text):
-    """Extrai todas as informações relevantes do currículo."""
+def spacy_unused_pipes():
+    """Componentes do pipeline spaCy que não são usados na extração (podem ser desativados)."""
+    if not spacy_available:
+        return []
+    # Usamos apenas as sentenças (parser/senter) e as entidades (ner)
+    required = {"tok2vec", "parser", "senter", "ner"}
+    return [name for name in nlp.pipe_names if name not in required]
+
+def parse_cv_texts(cv_texts, batch_size=SPACY_BATCH_SIZE):
+    """
+    Processa uma sequência de currículos com nlp.pipe, em lotes e com os
+    componentes não utilizados desativados.
+    
+    Gera um Doc por texto, na mesma ordem. Se o spaCy não estiver disponível
+    (ou falhar no meio do lote), gera None para os textos restantes, e cada
+    extrator faz sua própria análise como antes.
+    """
+    cv_texts = [text if isinstance(text, str) else "" for text in cv_texts]
+    if not spacy_available:
+        for _ in cv_texts:
+            yield None
+        return
+    
+    produced = 0
+    try:
+        for doc in nlp.pipe(cv_texts, batch_size=batch_size, disable=spacy_unused_pipes()):
+            produced += 1
+            yield doc
+    except Exception as e:
+        print(f"Erro no processamento em lote do spaCy: {str(e)}")
+        for _ in cv_texts[produced:]:
+            yield None
+
+def extract_all_from_cv(cv_text, doc=None):
+    """
+    Extrai todas as informações relevantes do currículo.
+    
+    O texto é analisado pelo spaCy uma única vez e o mesmo Doc é compartilhado
+    entre todos os extratores que precisam dele.
+    """
+    if doc is None and cv_text:
+        doc = next(parse_cv_texts([cv_text]))
+    
     result = {
         "conhecimentos_tecnicos": extract_technical_skills(cv_text),
         "nivel_academico": extract_education_level(cv_text),
-        "nivel_profissional": extract_professional_level(cv_text),
+        "nivel_profissional": extract_professional_level(cv_text, doc=doc),
         "nivel_ingles": extract_language_level(cv_text, "inglês"),
         "nivel_espanhol": extract_language_level(cv_text, "espanhol"),
-        "localizacao": extract_location(cv_text)
+        "localizacao": extract_location(cv_text, doc=doc)
     }
     return result
 
@@ -375,6 +665,7 @@ def extract_job_features(job):
     features['nivel_academico'] = clean_text(job_profile.get('nivel_academico', ''))
     features['nivel_ingles'] = clean_text(job_profile.get('nivel_ingles', ''))
     features['nivel_espanhol'] = clean_text(job_profile.get('nivel_espanhol', ''))
+    features['nivel_profissional_ordinal'] = professional_level_ordinal(features['nivel_profissional'].lower().strip())
     features['areas_atuacao'] = clean_text(job_profile.get('areas_atuacao', ''))
     features['principais_atividades'] = clean_text(job_profile.get('principais_atividades', ''))
     features['competencias'] = clean_text(job_profile.get('competencia_tecnicas_e_comportamentais', ''))
@@ -396,8 +687,18 @@ def extract_job_features(job):
     
     return features
 
-def extract_applicant_features(applicant):
-    """Extrai características importantes do candidato"""
+def get_cv_text(applicant):
+    """Retorna o currículo do candidato (português, ou inglês se não houver)"""
+    cv_pt = applicant.get('cv_pt', '')
+    cv_en = applicant.get('cv_en', '')
+    return cv_pt if cv_pt else cv_en
+
+def extract_applicant_features(applicant, doc=None):
+    """
+    Extrai características importantes do candidato
+    
+    doc é o Doc do spaCy do currículo, quando já processado em lote (ver parse_cv_texts).
+    """
     features = {}
     
     # Informações básicas
@@ -408,9 +709,7 @@ def extract_applicant_features(applicant):
     features['telefone'] = basic_info.get('telefone', '')
     
     # Currículo completo
-    cv_pt = applicant.get('cv_pt', '')
-    cv_en = applicant.get('cv_en', '')
-    features['cv'] = cv_pt if cv_pt else cv_en
+    features['cv'] = get_cv_text(applicant)
     
     # Informações profissionais
     prof_info = applicant.get('informacoes_profissionais', {})
@@ -426,7 +725,7 @@ def extract_applicant_features(applicant):
     features['nivel_espanhol'] = clean_text(education.get('nivel_espanhol', ''))
     
     # Extração de informações do currículo quando os campos estão vazios
-    cv_info = extract_all_from_cv(features['cv'])
+    cv_info = extract_all_from_cv(features['cv'], doc)
     
     # Atualizar informações com dados extraídos do currículo (apenas se os campos atuais estiverem vazios)
     if not features['conhecimentos_tecnicos'] and cv_info['conhecimentos_tecnicos']:
@@ -459,6 +758,9 @@ def extract_applicant_features(applicant):
     else:
         features['nivel_espanhol_extraido'] = ""
     
+    # Ordinal do nível profissional final (usado nos scores sem nova busca de texto)
+    features['nivel_profissional_ordinal'] = professional_level_ordinal(features['nivel_profissional'].lower().strip())
+    
     # Localização
     info_pessoais = applicant.get('informacoes_pessoais', {})
     endereco = clean_text(info_pessoais.get('endereco', ''))
@@ -484,72 +786,56 @@ def extract_applicant_features(applicant):
     
     return features
 
-# ==== Funções para Cálculo de Similaridade ====
-def calculate_keyword_similarity(job_keywords, applicant_keywords):
-    """Calcula a similaridade com base em palavras-chave compartilhadas."""
-    if not job_keywords or not applicant_keywords:
-        return 0.0
-    
-    job_keywords_set = set(job_keywords)
-    applicant_keywords_set = set(applicant_keywords)
-    
-    # Calcular interseção
-    common_keywords = job_keywords_set.intersection(applicant_keywords_set)
-    
-    # Calcular coeficiente de Jaccard
-    if len(job_keywords_set) + len(applicant_keywords_set) == 0:
-        return 0.0
-    
-    return len(common_keywords) / len(job_keywords_set) if len(job_keywords_set) > 0 else 0.0
+def extract_applicant_chunk(chunk):
+    """
+    Extrai as características de um bloco de candidatos.
+    
+    Recebe uma lista de (applicant_id, applicant) e retorna uma lista de
+    (applicant_id, features, erro) na mesma ordem. É a unidade de trabalho
+    enviada aos processos do pool, mas também é usada no modo serial.
+    """
+    results = []
+    docs = parse_cv_texts([get_cv_text(applicant) for _, applicant in chunk])
+    for (applicant_id, applicant), doc in zip(chunk, docs):
+        try:
+            results.append((applicant_id, extract_applicant_features(applicant, doc), None))
+        except Exception as e:
+            results.append((applicant_id, None, str(e)))
+    return results
 
-def calculate_location_similarity(job_location, applicant_location):
-    """Calcula a similaridade de localização."""
-    # Extrair cidade, estado, país
-    job_city = job_location.get('cidade', '').lower()
-    job_state = job_location.get('estado', '').lower()
-    job_country = job_location.get('pais', '').lower()
-    
-    app_city = applicant_location.get('cidade', '').lower()
-    app_state = applicant_location.get('estado', '').lower()
-    app_country = applicant_location.get('pais', '').lower()
-    
-    # Calcular pontuação (mesma cidade: 1.0, mesmo estado: 0.7, mesmo país: 0.3)
-    if job_city and app_city and job_city == app_city:
-        return 1.0
-    elif job_state and app_state and job_state == app_state:
-        return 0.7
-    elif job_country and app_country and job_country == app_country:
-        return 0.3
+def iter_applicant_features(applicants, applicant_ids, pool=None, chunk_size=APPLICANT_CHUNK_SIZE):
+    """
+    Gera (applicant_id, features, erro) na ordem de applicant_ids.
+    
+    Com um pool de processos, os blocos são distribuídos entre os workers via
+    imap, que devolve os resultados na ordem de envio (saída determinística).
+    """
+    chunks = [
+        [(applicant_id, applicants[applicant_id]) for applicant_id in applicant_ids[i:i + chunk_size]]
+        for i in range(0, len(applicant_ids), chunk_size)
+    ]
+    if pool is not None:
+        results = pool.imap(extract_applicant_chunk, chunks)
     else:
-        return 0.0
-
-def calculate_level_similarity(job_level, applicant_level):
-    """Calcula a similaridade entre níveis profissionais."""
-    # Definir níveis em ordem crescente
-    levels = ["estagio", "estágio", "junior", "júnior", "pleno", "senior", "sênior"]
-    
-    # Normalizar níveis
-    job_level = job_level.lower().strip()
-    applicant_level = applicant_level.lower().strip()
-    
-    # Se ambos são iguais
-    if job_level == applicant_level:
-        return 1.0
-    
-    # Se algum está vazio
-    if not job_level or not applicant_level:
-        return 0.5
-    
-    # Encontrar índices nos níveis
-    job_index = -1
-    app_index = -1
-    
-    for i, level in enumerate(levels):
-        if level in job_level:
-            job_index = i
-        if level in applicant_level:
-            app_index = i
+        results = map(extract_applicant_chunk, chunks)
     
+    for chunk_results in results:
+        for result in chunk_results:
+            yield result
+
+# ==== Funções para Cálculo de Similaridade ====
+# Níveis profissionais em ordem crescente
+PROFESSIONAL_LEVELS = ["estagio", "estágio", "junior", "júnior", "pleno", "senior", "sênior"]
+
+def professional_level_ordinal(level):
+    """Posição do nível (texto normalizado) em PROFESSIONAL_LEVELS (a última encontrada), ou -1"""
+    ordinal = -1
+    for i, name in enumerate(PROFESSIONAL_LEVELS):
+        if name in level:
+            ordinal = i
+    return ordinal
+
+def _ordinal_level_similarity(job_index, app_index):
     # Se não encontrou algum dos níveis
     if job_index == -1 or app_index == -1:
         return 0.5
@@ -560,78 +846,254 @@ def calculate_level_similarity(job_level, applicant_level):
     else:
         # Calcular distância entre níveis
         diff = job_index - app_index
-        max_diff = len(levels) - 1
+        max_diff = len(PROFESSIONAL_LEVELS) - 1
         return 1.0 - (diff / max_diff)
 
-def calculate_detailed_match_score(job, applicant):
-    """Calcula uma pontuação detalhada de compatibilidade entre vaga e candidato."""
-    
-    # Componentes do score
-    scores = {
-        "semantic": 0.0,         # Similaridade semântica via embeddings
-        "keywords": 0.0,         # Match de palavras-chave técnicas
-        "location": 0.0,         # Compatibilidade geográfica
-        "professional_level": 0.0, # Compatibilidade de nível profissional
-        "academic_level": 0.0,   # Compatibilidade de formação acadêmica
-        "english_level": 0.0,    # Compatibilidade de inglês
-        "spanish_level": 0.0     # Compatibilidade de espanhol
-    }
-    
-    # Calcular score de keywords (habilidades técnicas)
-    if 'keywords' in job and 'keywords' in applicant:
-        scores["keywords"] = calculate_keyword_similarity(job.get('keywords', []), 
-                                                         applicant.get('keywords', []))
-    
-    # Calcular score de localização
-    job_location = {
-        "cidade": job.get('cidade', ''),
-        "estado": job.get('estado', ''),
-        "pais": job.get('pais', '')
+# Score por par de ordinais (vaga, candidato), indexado por ordinal + 1 (a linha/coluna 0 é "não encontrado")
+PROFESSIONAL_LEVEL_SCORES = np.array([
+    [_ordinal_level_similarity(job_index, app_index) for app_index in range(-1, len(PROFESSIONAL_LEVELS))]
+    for job_index in range(-1, len(PROFESSIONAL_LEVELS))
+], dtype=np.float64)
+
+def normalized_professional_level(features):
+    """Nível profissional normalizado e seu ordinal (guardado nas características na extração)"""
+    level = (features.get('nivel_profissional', '') or '').lower().strip()
+    ordinal = features.get('nivel_profissional_ordinal')
+    if ordinal is None:
+        ordinal = professional_level_ordinal(level)
+    return level, ordinal
+
+# ==== Score Detalhado Vetorizado ====
+# As características estruturadas dos candidatos são codificadas uma única vez
+# (códigos de localização, ordinais de nível, bitsets de palavras-chave e códigos
+# dos campos de idioma/formação) e os sete componentes de um bloco vaga × candidatos
+# são calculados como arrays.
+
+# Pesos do score final do pipeline
+MATCH_WEIGHTS = {
+    "semantic": 0.4,
+    "keywords": 0.2,
+    "location": 0.1,
+    "professional_level": 0.1,
+    "academic_level": 0.1,
+    "english_level": 0.05,
+    "spanish_level": 0.05
+}
+MATCH_COMPONENTS = list(MATCH_WEIGHTS.keys())
+MATCH_TEXT_FIELDS = {"academic_level": "nivel_academico", "english_level": "nivel_ingles", "spanish_level": "nivel_espanhol"}
+
+# Número de bits 1 em cada byte (popcount dos bitsets de palavras-chave)
+POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], dtype=np.int64)
+
+def encode_codes(values, vocabulary):
+    """Códigos inteiros de uma lista de valores, ampliando o vocabulário"""
+    return np.array([vocabulary.setdefault(value, len(vocabulary)) for value in values], dtype=np.int32)
+
+def encode_match_features(applicant_ids, processed_applicants):
+    """
+    Codifica as características estruturadas dos candidatos em arrays alinhados com applicant_ids.
+    
+    Retorna um dicionário usado por encode_job_match_features e score_match_block.
+    """
+    applicants = [processed_applicants.get(applicant_id, {}) for applicant_id in applicant_ids]
+    
+    # Localização: um vocabulário de textos normalizados por campo (vazio = -1, nunca coincide)
+    location_vocabularies = {field: {} for field in ("cidade", "estado", "pais")}
+    location_codes = {}
+    for field, vocabulary in location_vocabularies.items():
+        values = [(applicant.get(field, '') or '').lower() for applicant in applicants]
+        codes = encode_codes(values, vocabulary)
+        codes[np.array([not value for value in values], dtype=bool)] = -1
+        location_codes[field] = codes
+    
+    # Nível profissional: código do texto normalizado (igualdade) e ordinal na hierarquia
+    level_vocabulary = {}
+    levels = [normalized_professional_level(applicant) for applicant in applicants]
+    level_values = [level for level, _ in levels]
+    level_codes = encode_codes(level_values, level_vocabulary)
+    level_ordinals = np.array([ordinal for _, ordinal in levels], dtype=np.int64)
+    level_empty = np.array([not value for value in level_values], dtype=bool)
+    
+    # Palavras-chave: bitset por candidato sobre o vocabulário de palavras-chave
+    keyword_vocabulary = {}
+    keyword_sets = [set(applicant.get('keywords', []) or []) for applicant in applicants]
+    for keywords in keyword_sets:
+        for keyword in keywords:
+            keyword_vocabulary.setdefault(keyword, len(keyword_vocabulary))
+    keyword_bits = np.zeros((len(applicants), max(1, len(keyword_vocabulary))), dtype=bool)
+    for row, keywords in enumerate(keyword_sets):
+        keyword_bits[row, [keyword_vocabulary[keyword] for keyword in keywords]] = True
+    has_keywords = np.array(['keywords' in applicant for applicant in applicants], dtype=bool)
+    
+    # Formação e idiomas: código do texto em minúsculas (a regra é "texto da vaga contido no do candidato")
+    text_vocabularies = {}
+    text_codes = {}
+    text_present = {}
+    for component, field in MATCH_TEXT_FIELDS.items():
+        raw_values = [applicant.get(field, '') or '' for applicant in applicants]
+        text_vocabularies[component] = {}
+        text_codes[component] = encode_codes([value.lower() for value in raw_values], text_vocabularies[component])
+        text_present[component] = np.array([bool(value) for value in raw_values], dtype=bool)
+    
+    return {
+        'location_vocabularies': location_vocabularies,
+        'location_codes': location_codes,
+        'level_vocabulary': level_vocabulary,
+        'level_codes': level_codes,
+        'level_ordinals': level_ordinals,
+        'level_empty': level_empty,
+        'keyword_vocabulary': keyword_vocabulary,
+        'keyword_bits': np.packbits(keyword_bits, axis=1),
+        'has_keywords': has_keywords,
+        'text_vocabularies': text_vocabularies,
+        'text_codes': text_codes,
+        'text_present': text_present,
+        'text_tables': {component: {} for component in MATCH_TEXT_FIELDS}
     }
-    
-    applicant_location = {
-        "cidade": applicant.get('cidade', ''),
-        "estado": applicant.get('estado', ''),
-        "pais": applicant.get('pais', '')
+
+def encode_job_match_features(job, encoded):
+    """Codifica as características estruturadas de uma vaga no espaço de códigos dos candidatos"""
+    # Valores da vaga que nenhum candidato possui recebem -2 (nunca coincidem)
+    location = {}
+    for field, vocabulary in encoded['location_vocabularies'].items():
+        value = (job.get(field, '') or '').lower()
+        location[field] = vocabulary.get(value, -2) if value else -1
+    
+    level, level_ordinal = normalized_professional_level(job)
+    
+    keywords = set(job.get('keywords', []) or [])
+    keyword_bits = np.zeros(encoded['keyword_bits'].shape[1] * 8, dtype=bool)
+    keyword_bits[[encoded['keyword_vocabulary'][keyword] for keyword in keywords if keyword in encoded['keyword_vocabulary']]] = True
+    
+    # Tabelas de score por código de texto dos candidatos (calculadas uma vez por valor distinto)
+    text_scores = {}
+    for component, field in MATCH_TEXT_FIELDS.items():
+        value = job.get(field, '') or ''
+        if not value:
+            text_scores[component] = None
+            continue
+        tables = encoded['text_tables'][component]
+        table = tables.get(value.lower())
+        if table is None:
+            table = np.array([1.0 if value.lower() in applicant_value else 0.5
+                              for applicant_value in encoded['text_vocabularies'][component]], dtype=np.float64)
+            tables[value.lower()] = table
+        text_scores[component] = table
+    
+    return {
+        'location': location,
+        'level_code': encoded['level_vocabulary'].get(level, -2),
+        'level_ordinal': level_ordinal,
+        'level_empty': not level,
+        'has_keywords': 'keywords' in job,
+        'keyword_count': len(keywords),
+        'keyword_bits': np.packbits(keyword_bits)[:encoded['keyword_bits'].shape[1]],
+        'text_scores': text_scores
     }
-    
-    scores["location"] = calculate_location_similarity(job_location, applicant_location)
-    
-    # Calcular score de nível profissional
-    scores["professional_level"] = calculate_level_similarity(
-        job.get('nivel_profissional', ''), 
-        applicant.get('nivel_profissional', '')
-    )
-    
-    # Calcular score acadêmico (se informações disponíveis)
-    if job.get('nivel_academico', '') and applicant.get('nivel_academico', ''):
-        if job['nivel_academico'].lower() in applicant['nivel_academico'].lower():
-            scores["academic_level"] = 1.0
-        else:
-            scores["academic_level"] = 0.5
-    else:
-        scores["academic_level"] = 0.5
-    
-    # Calcular score de inglês
-    if job.get('nivel_ingles', '') and applicant.get('nivel_ingles', ''):
-        if job['nivel_ingles'].lower() in applicant['nivel_ingles'].lower():
-            scores["english_level"] = 1.0
-        else:
-            scores["english_level"] = 0.5
+
+def score_match_block(job_encoded, encoded, rows, similarities):
+    """
+    Calcula os componentes de um bloco vaga × candidatos (rows = linhas em encode_match_features).
+    
+    Retorna uma matriz float64 (len(rows), len(SCORE_COMPONENTS)): os componentes de
+    MATCH_COMPONENTS seguidos do score final (a ordem das colunas de MatchDetailsStore).
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    scores = np.empty((len(rows), len(MATCH_COMPONENTS) + 1), dtype=np.float64)
+    scores[:, 0] = np.asarray(similarities, dtype=np.float64)
+    
+    # Palavras-chave: |vaga ∩ candidato| / |vaga| via popcount dos bitsets
+    if job_encoded['has_keywords'] and job_encoded['keyword_count']:
+        common = POPCOUNT_TABLE[encoded['keyword_bits'][rows] & job_encoded['keyword_bits']].sum(axis=1)
+        scores[:, 1] = np.where(encoded['has_keywords'][rows], common / job_encoded['keyword_count'], 0.0)
     else:
-        scores["english_level"] = 0.5
-    
-    # Calcular score de espanhol
-    if job.get('nivel_espanhol', '') and applicant.get('nivel_espanhol', ''):
-        if job['nivel_espanhol'].lower() in applicant['nivel_espanhol'].lower():
-            scores["spanish_level"] = 1.0
+        scores[:, 1] = 0.0
+    
+    # Localização: mesma cidade 1.0, mesmo estado 0.7, mesmo país 0.3
+    location = job_encoded['location']
+    same_city = (encoded['location_codes']['cidade'][rows] == location['cidade']) & (location['cidade'] >= 0)
+    same_state = (encoded['location_codes']['estado'][rows] == location['estado']) & (location['estado'] >= 0)
+    same_country = (encoded['location_codes']['pais'][rows] == location['pais']) & (location['pais'] >= 0)
+    scores[:, 2] = np.where(same_city, 1.0, np.where(same_state, 0.7, np.where(same_country, 0.3, 0.0)))
+    
+    # Nível profissional: 1.0 se o texto é igual, 0.5 se algum está vazio, senão tabela de ordinais
+    ranked = PROFESSIONAL_LEVEL_SCORES[job_encoded['level_ordinal'] + 1, encoded['level_ordinals'][rows] + 1]
+    empty = encoded['level_empty'][rows] | job_encoded['level_empty']
+    scores[:, 3] = np.where(encoded['level_codes'][rows] == job_encoded['level_code'], 1.0, np.where(empty, 0.5, ranked))
+    
+    # Formação e idiomas: 1.0 se o texto da vaga está contido no do candidato, senão 0.5
+    for column, component in enumerate(MATCH_TEXT_FIELDS, start=4):
+        table = job_encoded['text_scores'][component]
+        if table is None:
+            scores[:, column] = 0.5
         else:
-            scores["spanish_level"] = 0.5
-    else:
-        scores["spanish_level"] = 0.5
-    
+            scores[:, column] = np.where(encoded['text_present'][component][rows],
+                                         table[encoded['text_codes'][component][rows]], 0.5)
+    
+    # Score final: média ponderada
+    final_score = np.zeros(len(rows), dtype=np.float64)
+    for column, component in enumerate(MATCH_COMPONENTS):
+        final_score = final_score + scores[:, column] * MATCH_WEIGHTS[component]
+    scores[:, -1] = final_score
     return scores
 
+def refresh_match_details(match_details, processed_jobs, processed_applicants, job_embeddings,
+                          applicant_embeddings, changed_job_ids, changed_applicant_ids):
+    """
+    Atualiza os detalhes de match após uma execução incremental.
+    
+    Os top candidatos de todas as vagas são recalculados por produto de matrizes
+    (barato), mas o score detalhado só é recalculado para pares que envolvem uma
+    vaga ou um candidato novo/alterado, ou que entraram agora no top de uma vaga.
+    O resultado (um MatchDetailsStore) é o mesmo de um recálculo completo.
+    """
+    applicant_ids, applicant_matrix = build_embedding_matrix(applicant_embeddings)
+    job_ids = [job_id for job_id in processed_jobs if job_id in job_embeddings]
+    job_ids, job_matrix = build_embedding_matrix(job_embeddings, job_ids)
+    
+    encoded_applicants = encode_match_features(applicant_ids, processed_applicants)
+    
+    # Posições do store anterior na ordem atual dos candidatos, e candidatos alterados
+    remap = match_details.positions_in(applicant_ids)
+    changed_rows = np.array([applicant_id in changed_applicant_ids for applicant_id in applicant_ids], dtype=bool)
+    previous_row = np.full(len(applicant_ids), -1, dtype=np.int64)
+    
+    refreshed = {}
+    reused = computed = 0
+    for block_start, block_indices, block_scores in iter_top_k_cosine(job_matrix, applicant_matrix, MATCH_TOP_K, MATCH_JOB_BLOCK_SIZE):
+        for offset in range(len(block_indices)):
+            job_id = job_ids[block_start + offset]
+            try:
+                rows = block_indices[offset]
+                scores = np.empty((len(rows), len(SCORE_COMPONENTS)), dtype=np.float32)
+                
+                # Linha de cada candidato do top atual nos scores anteriores desta vaga (-1 se não havia)
+                previous_indices, previous_scores = match_details.job_arrays(job_id)
+                if job_id in changed_job_ids:
+                    previous_indices = previous_indices[:0]
+                previous_positions = np.asarray(previous_indices, dtype=np.int64) if remap is None else remap[previous_indices]
+                valid = previous_positions >= 0
+                previous_row[previous_positions[valid]] = np.flatnonzero(valid)
+                hits = previous_row[rows]
+                previous_row[previous_positions[valid]] = -1
+                
+                reuse = (hits >= 0) & ~changed_rows[rows]
+                scores[reuse] = previous_scores[hits[reuse]]
+                
+                # Pares sem score reaproveitável são calculados juntos em um único bloco
+                missing = ~reuse
+                if missing.any():
+                    job_encoded = encode_job_match_features(processed_jobs[job_id], encoded_applicants)
+                    scores[missing] = score_match_block(job_encoded, encoded_applicants, rows[missing], block_scores[offset][missing])
+                computed += int(missing.sum())
+                reused += int(reuse.sum())
+                refreshed[job_id] = (rows, scores)
+            except Exception as e:
+                print(f"Erro ao calcular matches para vaga {job_id}: {str(e)}")
+    
+    print(f"Detalhes de match atualizados: {computed} pares recalculados, {reused} reaproveitados")
+    return MatchDetailsStore.from_job_arrays(refreshed, applicant_ids)
+
 # ==== Processamento Principal ====
 def main():
     print("Decision Matcher - Sistema de Recomendação de Candidatos")
@@ -643,8 +1105,12 @@ def main():
     prospects_path = r"C:\Users\glynd\decision-recruiter\bases\prospects.json"
     
     # ==== ETAPA 1: Carregamento dos dados ====
-    # Verificar se os dados já foram carregados anteriormente
-    if check_intermediate_file("raw_data.pkl"):
+    if STREAMING_INGESTION:
+        # Nada é carregado aqui: cada etapa lê seus registros do arquivo JSON sob demanda
+        print("Ingestão em streaming ativada: os dados brutos não serão mantidos em memória")
+        vagas = applicants = prospects = None
+    # Verificar se os dados já foram carregados anteriormente (e se os JSONs não mudaram desde então)
+    elif check_intermediate_file("raw_data.pkl") and not raw_data_is_stale([vagas_path, applicants_path, prospects_path]):
         print("Carregando dados brutos de arquivo intermediário...")
         raw_data = load_intermediate("raw_data.pkl")
         vagas = raw_data['vagas']
@@ -664,19 +1130,58 @@ def main():
         }
         save_intermediate(raw_data, "raw_data.pkl")
 
-    print(f"Número de vagas: {len(vagas)}")
-    print(f"Número de candidatos: {len(applicants)}")
-    print(f"Número de prospectos: {len(prospects)}")
+    if not STREAMING_INGESTION:
+        print(f"Número de vagas: {len(vagas)}")
+        print(f"Número de candidatos: {len(applicants)}")
+        print(f"Número de prospectos: {len(prospects)}")
+    
+    # Fontes dos registros de cada etapa (dicionários em memória ou leitura em streaming)
+    def job_records():
+        return vagas.items() if vagas is not None else iter_local_json(vagas_path)
+    
+    def applicant_records():
+        return applicants.items() if applicants is not None else iter_local_json(applicants_path)
+    
+    def prospect_records():
+        return prospects.items() if prospects is not None else iter_local_json(prospects_path)
+    
+    # Ledger da última execução e hashes dos registros desta execução
+    previous_ledger = load_content_ledger()
+    current_ledger = {"jobs": {}, "applicants": {}}
+    changed_job_ids, removed_job_ids = set(), set()
+    changed_applicant_ids, removed_applicant_ids = set(), set()
     
     # ==== ETAPA 2: Processamento de vagas ====
     # Processar vagas
     if check_intermediate_file("processed_jobs.pkl"):
         print("Carregando vagas processadas do arquivo intermediário...")
         processed_jobs = load_intermediate("processed_jobs.pkl")
+        
+        # Reprocessar apenas as vagas novas ou alteradas desde a última execução
+        job_hashes, changed_jobs, job_ids = diff_records(
+            job_records(), previous_ledger and previous_ledger.get("jobs"), processed_jobs)
+        current_ledger["jobs"] = job_hashes
+        removed_job_ids = set(processed_jobs) - set(job_hashes)
+        if changed_jobs or removed_job_ids:
+            print(f"Atualização incremental: {len(changed_jobs)} vagas novas/alteradas, {len(removed_job_ids)} removidas")
+            updated_jobs = {}
+            for job_id, job in tqdm(changed_jobs.items(), desc="Processando vagas alteradas"):
+                try:
+                    updated_jobs[job_id] = extract_job_features(job)
+                except Exception as e:
+                    print(f"Erro ao processar vaga {job_id}: {str(e)}")
+            changed_job_ids = set(changed_jobs)
+            processed_jobs = {
+                job_id: updated_jobs.get(job_id, processed_jobs.get(job_id))
+                for job_id in job_ids
+                if job_id in updated_jobs or (job_id not in changed_jobs and job_id in processed_jobs)
+            }
+            save_intermediate(processed_jobs, "processed_jobs.pkl")
     else:
         print("Processamento de vagas iniciando...")
         processed_jobs = {}
-        for i, (job_id, job) in enumerate(tqdm(vagas.items(), desc="Processando vagas")):
+        for i, (job_id, job) in enumerate(tqdm(job_records(), desc="Processando vagas")):
+            current_ledger["jobs"][job_id] = record_hash(job)
             try:
                 processed_jobs[job_id] = extract_job_features(job)
                 
@@ -700,45 +1205,119 @@ def main():
     if check_intermediate_file("processed_applicants.pkl"):
         print("Carregando candidatos processados do arquivo intermediário...")
         processed_applicants = load_intermediate("processed_applicants.pkl")
+        
+        # Reprocessar apenas os candidatos novos ou alterados desde a última execução
+        applicant_hashes, changed_applicants, applicant_ids = diff_records(
+            applicant_records(), previous_ledger and previous_ledger.get("applicants"), processed_applicants)
+        current_ledger["applicants"] = applicant_hashes
+        removed_applicant_ids = set(processed_applicants) - set(applicant_hashes)
+        if changed_applicants or removed_applicant_ids:
+            print(f"Atualização incremental: {len(changed_applicants)} candidatos novos/alterados, {len(removed_applicant_ids)} removidos")
+            updated_applicants = {}
+            pool = multiprocessing.Pool(APPLICANT_WORKERS) if APPLICANT_WORKERS > 1 else None
+            try:
+                results = iter_applicant_features(changed_applicants, list(changed_applicants), pool)
+                for applicant_id, features, error in tqdm(results, total=len(changed_applicants), desc="Processando candidatos alterados"):
+                    if error is not None:
+                        print(f"Erro ao processar candidato {applicant_id}: {error}")
+                        continue
+                    updated_applicants[applicant_id] = features
+            finally:
+                if pool is not None:
+                    pool.terminate()
+            changed_applicant_ids = set(changed_applicants)
+            processed_applicants = {
+                applicant_id: updated_applicants.get(applicant_id, processed_applicants.get(applicant_id))
+                for applicant_id in applicant_ids
+                if applicant_id in updated_applicants
+                or (applicant_id not in changed_applicants and applicant_id in processed_applicants)
+            }
+            save_intermediate(processed_applicants, "processed_applicants.pkl")
     else:
         print("Processamento de candidatos iniciando...")
-        processed_applicants = {}
         # Processar em lotes para facilitar o monitoramento e reduzir o uso de memória
         batch_size = 1000
-        applicant_ids = list(applicants.keys())
-        batches = [applicant_ids[i:i + batch_size] for i in range(0, len(applicant_ids), batch_size)]
+        total_batches = -(-len(applicants) // batch_size) if applicants is not None else None
+        applicant_ids = []
         
-        for batch_idx, batch in enumerate(batches):
-            print(f"Processando lote {batch_idx+1}/{len(batches)} de candidatos...")
-            for i, applicant_id in enumerate(tqdm(batch, desc=f"Lote {batch_idx+1}")):
-                try:
-                    processed_applicants[applicant_id] = extract_applicant_features(applicants[applicant_id])
-                except Exception as e:
-                    print(f"Erro ao processar candidato {applicant_id}: {str(e)}")
-                    # Continue com o próximo candidato
+        # Retomar a partir dos lotes já salvos em shards, se houver
+        processed_applicants, done_batches = load_shards("processed_applicants")
+        done_batches = set(done_batches)
+        if done_batches:
+            print(f"Continuando de onde parou: {len(done_batches)} lotes já processados")
+        
+        # Sem shards, aproveitar o checkpoint antigo mais recente (lotes 0..N acumulados):
+        # cada lote coberto por ele é convertido em um shard em vez de ser reprocessado
+        legacy_last_batch, legacy_applicants = -1, {}
+        legacy_checkpoints = legacy_batch_checkpoints("processed_applicants_temp_")
+        if not done_batches and legacy_checkpoints:
+            legacy_last_batch, legacy_file = legacy_checkpoints[-1]
+            legacy_applicants = load_intermediate(legacy_file)
+            print(f"Convertendo o checkpoint antigo {legacy_file} ({legacy_last_batch + 1} lotes) em shards")
+        
+        # Modo multiprocesso: cada worker carrega spaCy/NLTK uma única vez
+        pool = None
+        if APPLICANT_WORKERS > 1:
+            print(f"Usando {APPLICANT_WORKERS} processos para extração de características...")
+            pool = multiprocessing.Pool(APPLICANT_WORKERS)
+        
+        try:
+            # Os lotes são montados à medida que os registros são lidos
+            for batch_idx, batch_records in enumerate(iter_record_batches(applicant_records(), batch_size)):
+                batch = [applicant_id for applicant_id, _ in batch_records]
+                applicant_ids.extend(batch)
+                current_ledger["applicants"].update(
+                    (applicant_id, record_hash(applicant)) for applicant_id, applicant in batch_records)
+                if batch_idx in done_batches:
+                    continue
+                if batch_idx <= legacy_last_batch:
+                    batch_results = {applicant_id: legacy_applicants[applicant_id]
+                                     for applicant_id in batch if applicant_id in legacy_applicants}
+                    save_shard("processed_applicants", batch_idx, batch_results)
+                    processed_applicants.update(batch_results)
                     continue
                 
-                # Mostrar progresso a cada 100 candidatos
-                if (i + 1) % 100 == 0:
-                    print(f"  Processados {i+1}/{len(batch)} candidatos deste lote")
-            
-            # Salvar resultados intermediários a cada lote
-            save_intermediate(processed_applicants, f"processed_applicants_temp_{batch_idx}.pkl")
+                print(f"Processando lote {batch_idx+1}{f'/{total_batches}' if total_batches else ''} de candidatos...")
+                batch_results = {}
+                results = iter_applicant_features(dict(batch_records), batch, pool)
+                for i, (applicant_id, features, error) in enumerate(tqdm(results, total=len(batch), desc=f"Lote {batch_idx+1}")):
+                    if error is not None:
+                        print(f"Erro ao processar candidato {applicant_id}: {error}")
+                        # Continue com o próximo candidato
+                        continue
+                    batch_results[applicant_id] = features
+                    
+                    # Mostrar progresso a cada 100 candidatos
+                    if (i + 1) % 100 == 0:
+                        print(f"  Processados {i+1}/{len(batch)} candidatos deste lote")
+                
+                # Salvar apenas o delta deste lote como um shard
+                save_shard("processed_applicants", batch_idx, batch_results)
+                processed_applicants.update(batch_results)
+        finally:
+            if pool is not None:
+                pool.terminate()
+        
+        # Remontar na ordem original dos candidatos (lotes retomados podem ter sido carregados fora de ordem)
+        processed_applicants = {applicant_id: processed_applicants[applicant_id]
+                                for applicant_id in applicant_ids if applicant_id in processed_applicants}
         
         # Salvar resultados intermediários finais
         save_intermediate(processed_applicants, "processed_applicants.pkl")
+        clear_shards("processed_applicants")
+        remove_legacy_batch_checkpoints("processed_applicants_temp_")
 
     print(f"Total de candidatos processados: {len(processed_applicants)}")
     
     # ==== ETAPA 4: Identificação de candidatos já contratados ====
-    # Identificar candidatos já contratados
-    if check_intermediate_file("hired_candidates.pkl"):
+    # Identificar candidatos já contratados (recalculado em execuções incrementais, é uma única passada barata)
+    if check_intermediate_file("hired_candidates.pkl") and previous_ledger is None:
         print("Carregando candidatos contratados do arquivo intermediário...")
         hired_candidates = load_intermediate("hired_candidates.pkl")
     else:
         print("Identificando candidatos já contratados...")
         hired_candidates = {}
-        for prospect_id, prospect_data in tqdm(prospects.items(), desc="Processando prospectos"):
+        for prospect_id, prospect_data in tqdm(prospect_records(), desc="Processando prospectos"):
             job_id = prospect_id
             hired_candidates[job_id] = []
             
@@ -754,49 +1333,38 @@ def main():
     print(f"Vagas com candidatos contratados: {vagas_com_contratados} de {len(hired_candidates)}")
     
     # ==== ETAPA 5: Geração de embeddings ====
-    # Importar SentenceTransformer se ainda não foi importado
-    try:
-        from sentence_transformers import SentenceTransformer
-        print("Biblioteca SentenceTransformer importada com sucesso!")
-    except ImportError:
-        print("ERRO: Biblioteca SentenceTransformer não encontrada.")
-        print("Por favor, instale com: pip install sentence-transformers")
-        return
+    # Encoder com cache persistente por (modelo, hash do texto): textos já vistos em
+    # execuções anteriores não são recodificados, e o modelo só é carregado se necessário.
+    # Os textos são codificados em lotes ordenados por comprimento (menos padding)
+    model = CachedEncoder(EMBEDDING_MODEL_NAME, batch_size=EMBEDDING_BATCH_SIZE,
+                          num_threads=EMBEDDING_THREADS or None,
+                          max_seq_length=EMBEDDING_MAX_SEQ_LENGTH or None,
+                          backend=EMBEDDING_BACKEND)
+    print(f"Backend de embeddings: {EMBEDDING_BACKEND}")
     
     # Gerar embeddings para vagas
     if check_intermediate_file("job_embeddings.pkl"):
         print("Carregando embeddings de vagas do arquivo intermediário...")
         job_embeddings = load_intermediate("job_embeddings.pkl")
     else:
-        # Carregar o modelo de embeddings
-        print("Carregando modelo de embeddings...")
-        model = SentenceTransformer('distiluse-base-multilingual-cased-v1')
-        
         # Criar embeddings para vagas
         print("Gerando embeddings para vagas...")
-        job_embeddings = {}
         
-        # Processar em lotes para economia de memória
-        batch_size = 100
+        # Uma única chamada: o encoder agrupa os textos por comprimento e devolve
+        # na ordem original; o cache em disco serve de checkpoint durante a codificação
         job_ids = list(processed_jobs.keys())
-        job_batches = [job_ids[i:i + batch_size] for i in range(0, len(job_ids), batch_size)]
-        
-        for batch_idx, batch in enumerate(tqdm(job_batches, desc="Processando lotes de vagas")):
-            # Preparar textos para o lote
-            texts = [processed_jobs[job_id]['full_text'] for job_id in batch]
-            # Codificar em lote
-            embeddings = model.encode(texts)
-            
-            # Armazenar embeddings
-            for i, job_id in enumerate(batch):
-                job_embeddings[job_id] = embeddings[i]
-                
-            # Salvar resultados intermediários a cada 5 lotes
-            if (batch_idx + 1) % 5 == 0:
-                save_intermediate(job_embeddings, f"job_embeddings_temp_{batch_idx}.pkl")
+        embeddings = model.encode([processed_jobs[job_id]['full_text'] for job_id in job_ids], show_progress=True)
+        job_embeddings = dict(zip(job_ids, embeddings))
         
         # Salvar resultados intermediários
         save_intermediate(job_embeddings, "job_embeddings.pkl")
+    
+    # Execução incremental: embeddings apenas das vagas novas ou alteradas
+    stale_job_ids = stale_embedding_ids(job_embeddings, processed_jobs, changed_job_ids)
+    if stale_job_ids or len(job_embeddings) != len(processed_jobs):
+        print(f"Atualizando embeddings de {len(stale_job_ids)} vagas...")
+        job_embeddings = update_embeddings(job_embeddings, processed_jobs, stale_job_ids, model)
+        save_intermediate(job_embeddings, "job_embeddings.pkl")
 
     print(f"Total de embeddings de vagas: {len(job_embeddings)}")
     
@@ -805,117 +1373,129 @@ def main():
         print("Carregando embeddings de candidatos do arquivo intermediário...")
         applicant_embeddings = load_intermediate("applicant_embeddings.pkl")
     else:
-        # Verificar se o modelo já foi carregado
-        if 'model' not in locals():
-            print("Carregando modelo de embeddings...")
-            model = SentenceTransformer('distiluse-base-multilingual-cased-v1')
-        
         print("Gerando embeddings para candidatos...")
-        applicant_embeddings = {}
-        batch_size = 100
         applicant_ids = list(processed_applicants.keys())
-        batches = [applicant_ids[i:i + batch_size] for i in range(0, len(applicant_ids), batch_size)]
-        
-        for batch_idx, batch in enumerate(batches):
-            print(f"Processando lote {batch_idx+1}/{len(batches)} de candidatos para embeddings...")
-            texts = [processed_applicants[applicant_id]['full_text'] for applicant_id in batch]
-            embeddings = model.encode(texts)
-            
-            for i, applicant_id in enumerate(batch):
-                applicant_embeddings[applicant_id] = embeddings[i]
-            
-            # Salvar resultados intermediários a cada 10 lotes
-            if (batch_idx + 1) % 10 == 0:
-                save_intermediate(applicant_embeddings, f"applicant_embeddings_temp_{batch_idx}.pkl")
+        embeddings = model.encode(
+            [processed_applicants[applicant_id]['full_text'] for applicant_id in applicant_ids], show_progress=True)
+        applicant_embeddings = dict(zip(applicant_ids, embeddings))
         
         # Salvar resultados finais
         save_intermediate(applicant_embeddings, "applicant_embeddings.pkl")
+    
+    # Execução incremental: embeddings apenas dos candidatos novos ou alterados
+    stale_applicant_ids = stale_embedding_ids(applicant_embeddings, processed_applicants, changed_applicant_ids)
+    if stale_applicant_ids or len(applicant_embeddings) != len(processed_applicants):
+        print(f"Atualizando embeddings de {len(stale_applicant_ids)} candidatos...")
+        applicant_embeddings = update_embeddings(applicant_embeddings, processed_applicants, stale_applicant_ids, model)
+        save_intermediate(applicant_embeddings, "applicant_embeddings.pkl")
 
     print(f"Total de embeddings de candidatos: {len(applicant_embeddings)}")
+    print(f"Cache de embeddings: {model.cache_hits} textos reaproveitados, {model.cache_misses} codificados")
     print("Embeddings gerados com sucesso!")
     
     # ==== ETAPA 6: Cálculo de similaridade entre vagas e candidatos ====
-    # Esta é a etapa que estava consumindo muita memória no Colab
-    # Vamos torná-la mais eficiente processando uma vaga por vez e salvando regularmente
+    # Os cossenos são calculados em blocos de vagas com uma multiplicação de matrizes
+    # e apenas os top candidatos de cada vaga recebem o score detalhado. Os detalhes
+    # de cada vaga ficam em arrays (índices dos candidatos + scores float32 por
+    # componente) e o resultado final é um MatchDetailsStore colunar.
     
     if check_intermediate_file("match_details_full.pkl"):
         print("Carregando detalhes de match do arquivo intermediário...")
         match_details = load_intermediate("match_details_full.pkl")
+        
+        # Arquivos gerados por versões anteriores guardam o dicionário aninhado
+        if not isinstance(match_details, MatchDetailsStore):
+            print("Convertendo detalhes de match para o formato colunar...")
+            match_details = MatchDetailsStore.from_nested(match_details, list(applicant_embeddings.keys()))
+            save_intermediate(match_details, "match_details_full.pkl")
+        
+        # Execução incremental: atualizar as tabelas de match no lugar
+        if changed_job_ids or changed_applicant_ids or removed_job_ids or removed_applicant_ids:
+            print("Atualizando detalhes de match de forma incremental...")
+            match_details = refresh_match_details(match_details, processed_jobs, processed_applicants, job_embeddings,
+                                                  applicant_embeddings, changed_job_ids, changed_applicant_ids)
+            save_intermediate(match_details, "match_details_full.pkl")
     else:
-        # Verificar se já existe um arquivo parcial
+        # Empilhar os embeddings uma única vez em matrizes float32 normalizadas,
+        # assim a similaridade de cosseno vira um simples produto de matrizes
+        print("Montando matrizes de embeddings normalizadas...")
+        applicant_ids, applicant_matrix = build_embedding_matrix(applicant_embeddings)
+        
+        # Verificar se já existem shards parciais (ou o arquivo parcial do formato antigo)
+        job_arrays, shard_keys = load_shards("match_details")
+        next_shard = max(shard_keys) + 1 if shard_keys else 0
         if check_intermediate_file("match_details_partial.pkl"):
             print("Carregando detalhes de match parciais...")
-            match_details = load_intermediate("match_details_partial.pkl")
+            job_arrays.update(load_intermediate("match_details_partial.pkl"))
+        
+        # Checkpoints de versões anteriores guardam {applicant_id: {componente: score}} por vaga
+        applicant_position = {applicant_id: i for i, applicant_id in enumerate(applicant_ids)}
+        for job_id, job_details in list(job_arrays.items()):
+            if isinstance(job_details, dict):
+                job_arrays[job_id] = details_to_arrays(job_details, applicant_position)
+        
+        if job_arrays:
             # Identificar vagas que já foram processadas
-            processed_job_ids = set(match_details.keys())
+            processed_job_ids = set(job_arrays.keys())
             remaining_job_ids = [job_id for job_id in processed_jobs.keys() if job_id not in processed_job_ids]
             print(f"Continuando de onde parou: {len(processed_job_ids)} vagas processadas, {len(remaining_job_ids)} restantes")
         else:
             print("Iniciando cálculo de detalhes de match do zero...")
-            match_details = {}
             remaining_job_ids = list(processed_jobs.keys())
         
-        # Processar cada vaga individualmente para economizar memória
-        for job_idx, job_id in enumerate(tqdm(remaining_job_ids, desc="Calculando matches por vaga")):
-            try:
-                job_features = processed_jobs[job_id]
-                job_vector = job_embeddings[job_id]
-                match_details[job_id] = {}
-                
-                # Para fins de demonstração, vamos calcular similaridade para apenas um subconjunto de candidatos
-                # para vagas com muitos candidatos potenciais
-                # Em uma implementação completa, você pode adaptar isso conforme necessário
-                
-                # Calcular similaridade de cosseno do vetor da vaga com todos os candidatos
-                all_similarities = {}
-                for applicant_id, applicant_vector in applicant_embeddings.items():
-                    # Similaridade de cosseno entre vetores de embedding
-                    similarity = np.dot(job_vector, applicant_vector) / (
-                        np.linalg.norm(job_vector) * np.linalg.norm(applicant_vector)
-                    )
-                    all_similarities[applicant_id] = similarity
-                
-                # Pegar os top 1000 candidatos com maior similaridade de vetores
-                top_candidates = sorted(all_similarities.items(), key=lambda x: x[1], reverse=True)[:1000]
-                
-                # Calcular detalhes de match apenas para os top candidatos para economizar memória
-                for applicant_id, similarity in tqdm(top_candidates, desc=f"Vaga {job_id}", leave=False):
-                    applicant_features = processed_applicants[applicant_id]
-                    
-                    # Calcular scores detalhados
-                    detail_scores = calculate_detailed_match_score(job_features, applicant_features)
-                    
-                    # Adicionar similaridade semântica ao score
-                    detail_scores["semantic"] = similarity
-                    
-                    # Calcular média ponderada para score final
-                    weights = {
-                        "semantic": 0.4,
-                        "keywords": 0.2,
-                        "location": 0.1,
-                        "professional_level": 0.1,
-                        "academic_level": 0.1,
-                        "english_level": 0.05,
-                        "spanish_level": 0.05
-                    }
+        # Vagas calculadas desde o último shard salvo
+        pending_details = {}
+        
+        # Vagas sem embedding não podem ser comparadas
+        missing_job_ids = [job_id for job_id in remaining_job_ids if job_id not in job_embeddings]
+        for job_id in missing_job_ids:
+            print(f"Erro ao calcular matches para vaga {job_id}: embedding não encontrado")
+        remaining_job_ids = [job_id for job_id in remaining_job_ids if job_id in job_embeddings]
+        remaining_job_ids, job_matrix = build_embedding_matrix(job_embeddings, remaining_job_ids)
+        
+        # Características estruturadas dos candidatos codificadas uma única vez, na ordem da matriz
+        print("Codificando características dos candidatos para o score detalhado...")
+        encoded_applicants = encode_match_features(applicant_ids, processed_applicants)
+        
+        job_idx = 0
+        progress_bar = tqdm(total=len(remaining_job_ids), desc="Calculando matches por vaga")
+        for block_start, block_indices, block_scores in iter_top_k_cosine(job_matrix, applicant_matrix, MATCH_TOP_K, MATCH_JOB_BLOCK_SIZE):
+            for offset in range(len(block_indices)):
+                job_id = remaining_job_ids[block_start + offset]
+                try:
+                    job_encoded = encode_job_match_features(processed_jobs[job_id], encoded_applicants)
                     
-                    final_score = sum(score * weights[key] for key, score in detail_scores.items())
-                    detail_scores["final_score"] = final_score
+                    # Score detalhado apenas dos top candidatos (já em ordem decrescente de similaridade),
+                    # calculado de uma vez para o bloco vaga × candidatos
+                    scores = score_match_block(job_encoded, encoded_applicants, block_indices[offset], block_scores[offset])
+                    job_arrays[job_id] = (block_indices[offset].astype(np.int32), scores.astype(np.float32))
                     
-                    match_details[job_id][applicant_id] = detail_scores
+                    pending_details[job_id] = job_arrays[job_id]
+                
+                except Exception as e:
+                    print(f"Erro ao calcular matches para vaga {job_id}: {str(e)}")
+                    # Continue com a próxima vaga
                 
-                # Salvar resultados parciais a cada 10 vagas ou na última vaga
-                if (job_idx + 1) % 10 == 0 or job_idx == len(remaining_job_ids) - 1:
-                    save_intermediate(match_details, "match_details_partial.pkl")
+                # Salvar um shard com as vagas novas a cada 10 vagas ou na última vaga
+                if pending_details and ((job_idx + 1) % 10 == 0 or job_idx == len(remaining_job_ids) - 1):
+                    save_shard("match_details", next_shard, pending_details)
+                    next_shard += 1
+                    pending_details = {}
                     print(f"Salvos detalhes parciais após processar {job_idx + 1} vagas")
-            
-            except Exception as e:
-                print(f"Erro ao calcular matches para vaga {job_id}: {str(e)}")
-                # Continue com a próxima vaga
-                continue
+                
+                job_idx += 1
+                progress_bar.update(1)
+        progress_bar.close()
         
         # Salvar resultados finais
+        match_details = MatchDetailsStore.from_job_arrays(job_arrays, applicant_ids)
         save_intermediate(match_details, "match_details_full.pkl")
+        clear_shards("match_details")
+        if check_intermediate_file("match_details_partial.pkl"):
+            os.remove(os.path.join(output_dir, "match_details_partial.pkl"))
+    
+    # Todas as etapas refletem o conteúdo atual: a próxima execução parte deste ledger
+    save_content_ledger(current_ledger)
     
     # ==== ETAPA 7: Combinar Todos os Dados para Uso Posterior ====
     print("Salvando os dados processados, embeddings e detalhes de match...")
@@ -932,6 +1512,32 @@ def main():
         pickle.dump(data_to_save, f)
 
     print("Dados salvos com sucesso em 'decision_embeddings_enhanced_precisao.pkl'")
+    
+    # Mesmos dados no formato colunar com embeddings mapeáveis em memória (carregamento rápido nos apps)
+    print(f"Salvando artefatos colunares em '{ARTIFACT_DIR}'...")
+    save_artifacts(data_to_save, ARTIFACT_DIR)
+    print("Artefatos salvos com sucesso!")
+    
+    # Top-N final de cada vaga, calculado sobre os artefatos (o mesmo ranking dos apps) e servido sem recálculo
+    print(f"Materializando as top-{RECOMMENDATION_TOP_N} recomendações por vaga em '{RECOMMENDATIONS_DIR}'...")
+    artifacts = load_artifacts(ARTIFACT_DIR)
+    recommendations = build_recommendations(
+        tqdm(list(artifacts['processed_jobs']), desc="Materializando recomendações"),
+        artifacts['job_embeddings'],
+        artifacts['applicant_embeddings'],
+        artifacts['match_details'],
+        artifacts['processed_jobs'],
+        artifacts['processed_applicants'],
+        top_n=RECOMMENDATION_TOP_N,
+        source_version=artifacts_version(ARTIFACT_DIR)
+    )
+    save_recommendations(recommendations, RECOMMENDATIONS_DIR)
+    print(f"Recomendações salvas para {len(recommendations)} vagas!")
+    
+    # Índice vetorial local (alternativa offline ao Pinecone)
+    print(f"Construindo índice vetorial local em '{LOCAL_INDEX_DIR}'...")
+    build_local_index(job_embeddings, applicant_embeddings).save(LOCAL_INDEX_DIR)
+    print("Índice vetorial local salvo com sucesso!")
     print("Processamento concluído com sucesso!")
     
     # ==== ETAPA 8: Demonstração - Mostrar Candidatos Recomendados para uma Vaga ====
@@ -948,12 +1554,15 @@ def main():
         print(f"DEMONSTRAÇÃO - Recomendação para Vaga: {example_job_id}")
         print("="*70)
         
-        # Mostrar detalhes da vaga
-        job = vagas[example_job_id]
+        # Mostrar detalhes da vaga (no modo streaming, a partir das características processadas)
         job_features = processed_jobs[example_job_id]
+        if vagas is not None:
+            job_info = vagas[example_job_id]['informacoes_basicas']
+        else:
+            job_info = {'titulo_vaga': job_features['titulo'], 'cliente': job_features['cliente']}
         
-        print(f"Título: {job['informacoes_basicas'].get('titulo_vaga', 'N/A')}")
-        print(f"Cliente: {job['informacoes_basicas'].get('cliente', 'N/A')}")
+        print(f"Título: {job_info.get('titulo_vaga', 'N/A')}")
+        print(f"Cliente: {job_info.get('cliente', 'N/A')}")
         print(f"Localização: {job_features['cidade']}, {job_features['estado']}")
         print(f"Nível: {job_features['nivel_profissional']}")
         
@@ -961,8 +1570,8 @@ def main():
         hired_ids = hired_candidates.get(example_job_id, [])
         print(f"\nCandidatos já contratados para esta vaga: {len(hired_ids)}")
         for hired_id in hired_ids:
-            if hired_id in applicants:
-                print(f"  - {applicants[hired_id]['infos_basicas'].get('nome', 'N/A')}")
+            if hired_id in processed_applicants:
+                print(f"  - {processed_applicants[hired_id].get('nome') or 'N/A'}")
         
         # Obter os matches para esta vaga
         job_matches = match_details.get(example_job_id, {})
@@ -972,8 +1581,8 @@ def main():
             
             print(f"\nTop 7 Candidatos Recomendados:")
             for i, (candidate_id, scores) in enumerate(ranked_candidates[:7]):
-                candidate = applicants[candidate_id]
-                print(f"\n{i+1}. {candidate['infos_basicas'].get('nome', 'N/A')}")
+                candidate = processed_applicants[candidate_id]
+                print(f"\n{i+1}. {candidate.get('nome') or 'N/A'}")
                 print(f"   Score Final: {scores['final_score']:.2f}")
                 print(f"   Similaridade Semântica: {scores['semantic']:.2f}")
                 print(f"   Match Keywords: {scores['keywords']:.2f}")
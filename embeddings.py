@@ -0,0 +1,423 @@
+"""
+Embeddings - Decision Recruiter
+
+Codificação de textos com cache persistente. Cada embedding é guardado em um
+banco SQLite indexado por (modelo, hash do texto), então textos repetidos
+(vagas e currículos duplicados ou inalterados entre execuções) nunca são
+codificados duas vezes. O cache é compartilhado entre o data_processing.py
+e os apps Streamlit.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+# Modelo usado em todo o projeto
+EMBEDDING_MODEL_NAME = 'distiluse-base-multilingual-cased-v1'
+
+# Banco do cache de embeddings
+EMBEDDING_CACHE_PATH = os.path.join("embedding_cache", "embeddings.sqlite")
+
+# Textos por lote do modelo e lotes codificados entre gravações no cache
+ENCODE_BATCH_SIZE = 32
+BATCHES_PER_FLUSH = 20
+
+# Backends de inferência: PyTorch (padrão) ou ONNX Runtime na CPU, em float32
+# ou com pesos quantizados em int8 (requer: pip install onnx onnxruntime)
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+ONNX_MODEL_DIR = os.path.join("embedding_cache", "onnx")
+
+# Similaridade de cosseno mínima com os embeddings do PyTorch para aceitar um modelo exportado
+PARITY_MIN_COSINE = {"onnx": 0.9999, "onnx-int8": 0.98}
+PARITY_SAMPLE_TEXTS = [
+    "Desenvolvedor Python sênior com experiência em Django, AWS e PostgreSQL",
+    "Analista SAP MM pleno, inglês avançado, disponibilidade para São Paulo",
+    "Gerente de projetos com certificação PMP e vivência em metodologias ágeis (Scrum)",
+    "Cientista de dados: machine learning, pandas, scikit-learn e Power BI",
+    "Senior Java developer, Spring Boot, microservices, Kubernetes and Azure",
+    "Técnico de suporte N1, atendimento ao usuário, Windows e redes",
+    "Engenheiro DevOps com Terraform, Jenkins, Docker e monitoramento em GCP",
+    "Consultor Totvs Protheus, módulos financeiro e fiscal, ensino superior completo"
+]
+
+
+def text_hash(text):
+    """Hash SHA-256 (hex) do texto"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Cache persistente de embeddings em SQLite: (modelo, hash do texto) -> vetor float32.
+
+    O SQLite permite leitores e escritores em processos diferentes, então o
+    pipeline e os apps podem usar o mesmo arquivo.
+    """
+
+    # Limite de parâmetros por consulta IN (...)
+    query_chunk_size = 500
+
+    def __init__(self, path=EMBEDDING_CACHE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL,"
+            " text_hash TEXT NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " PRIMARY KEY (model, text_hash))"
+        )
+        self._connection.commit()
+
+    def get_many(self, model_name, hashes):
+        """Retorna {hash: vetor} dos hashes encontrados no cache"""
+        hashes = list(hashes)
+        found = {}
+        with self._lock:
+            for i in range(0, len(hashes), self.query_chunk_size):
+                chunk = hashes[i:i + self.query_chunk_size]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model_name] + chunk
+                )
+                for hash_value, blob in rows:
+                    found[hash_value] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, model_name, vectors):
+        """Grava {hash: vetor} no cache"""
+        rows = [
+            (model_name, hash_value, np.asarray(vector, dtype=np.float32).tobytes())
+            for hash_value, vector in vectors.items()
+        ]
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)", rows
+            )
+            self._connection.commit()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+# ==== Backend ONNX ====
+def onnx_model_path(model_name=EMBEDDING_MODEL_NAME, quantize=False, directory=ONNX_MODEL_DIR):
+    """Caminho do modelo ONNX exportado (float32 ou int8)"""
+    model_dir = os.path.join(directory, model_name.replace('/', '_'))
+    return os.path.join(model_dir, "model_int8.onnx" if quantize else "model.onnx")
+
+
+def export_onnx(model_name=EMBEDDING_MODEL_NAME, quantize=False, directory=ONNX_MODEL_DIR, torch_model=None):
+    """
+    Exporta o SentenceTransformer completo (transformer + pooling + camada densa)
+    para ONNX, opcionalmente com quantização dinâmica int8, e verifica a paridade
+    com o PyTorch. Retorna (caminho do modelo, relatório de paridade).
+
+    Cada modelo é gerado em um arquivo temporário e só é movido para o caminho
+    final depois de passar na verificação de paridade. Levanta RuntimeError se a
+    similaridade mínima ficar abaixo de PARITY_MIN_COSINE (o arquivo é descartado).
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if torch_model is None:
+        torch_model = SentenceTransformer(model_name, device='cpu')
+    torch_model.eval()
+
+    fp32_path = onnx_model_path(model_name, False, directory)
+    model_dir = os.path.dirname(fp32_path)
+    os.makedirs(model_dir, exist_ok=True)
+
+    report = None
+    if not os.path.exists(fp32_path):
+        class SentenceEmbeddingModule(torch.nn.Module):
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask):
+                features = {'input_ids': input_ids, 'attention_mask': attention_mask}
+                return self.model(features)['sentence_embedding']
+
+        sample = torch_model.tokenizer(PARITY_SAMPLE_TEXTS[:2], padding=True, truncation=True,
+                                       max_length=torch_model.max_seq_length, return_tensors='pt')
+        with torch.no_grad():
+            torch.onnx.export(
+                SentenceEmbeddingModule(torch_model),
+                (sample['input_ids'], sample['attention_mask']),
+                fp32_path + ".tmp",
+                input_names=['input_ids', 'attention_mask'],
+                output_names=['sentence_embedding'],
+                dynamic_axes={
+                    'input_ids': {0: 'batch', 1: 'sequence'},
+                    'attention_mask': {0: 'batch', 1: 'sequence'},
+                    'sentence_embedding': {0: 'batch'}
+                },
+                opset_version=14
+            )
+        torch_model.tokenizer.save_pretrained(model_dir)
+        with open(os.path.join(model_dir, "config.json"), 'w', encoding='utf-8') as f:
+            json.dump({"model_name": model_name, "max_seq_length": torch_model.max_seq_length}, f)
+        report = _promote_onnx_model(torch_model, fp32_path + ".tmp", fp32_path, "onnx")
+
+    path = fp32_path
+    if quantize:
+        path = onnx_model_path(model_name, True, directory)
+        if not os.path.exists(path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            quantize_dynamic(fp32_path, path + ".tmp", weight_type=QuantType.QInt8)
+            report = _promote_onnx_model(torch_model, path + ".tmp", path, "onnx-int8")
+
+    if report is None:
+        report = read_parity_report(path)
+    return path, report
+
+
+def parity_report_path(model_path):
+    """Relatório de paridade gravado ao lado do modelo ONNX"""
+    return os.path.splitext(model_path)[0] + ".parity.json"
+
+
+def read_parity_report(model_path):
+    """Relatório de paridade do modelo, ou None se não existe"""
+    try:
+        with open(parity_report_path(model_path), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _promote_onnx_model(torch_model, candidate_path, path, backend):
+    """Verifica a paridade do modelo em candidate_path e o move para path; descarta-o se reprovado"""
+    try:
+        report = check_parity(torch_model, OnnxEncoder(candidate_path), PARITY_SAMPLE_TEXTS)
+    except Exception:
+        os.remove(candidate_path)
+        raise
+    with open(parity_report_path(path), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    if report['min_cosine'] < PARITY_MIN_COSINE[backend]:
+        os.remove(candidate_path)
+        raise RuntimeError(
+            f"Modelo {backend} diverge do PyTorch: cosseno mínimo {report['min_cosine']:.5f} "
+            f"(< {PARITY_MIN_COSINE[backend]})"
+        )
+    os.replace(candidate_path, path)
+    return report
+
+
+def check_parity(reference, candidate, texts=PARITY_SAMPLE_TEXTS):
+    """Compara os embeddings de dois codificadores para os mesmos textos"""
+    expected = np.asarray(reference.encode(list(texts)), dtype=np.float32)
+    actual = np.asarray(candidate.encode(list(texts)), dtype=np.float32)
+    cosines = np.sum(expected * actual, axis=1) / (
+        np.linalg.norm(expected, axis=1) * np.linalg.norm(actual, axis=1)
+    )
+    return {
+        "texts": len(texts),
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+        "max_abs_diff": float(np.abs(expected - actual).max())
+    }
+
+
+class OnnxEncoder:
+    """Modelo exportado rodando no ONNX Runtime (CPU), com a interface encode(textos, batch_size)"""
+
+    def __init__(self, model_path, num_threads=None, max_seq_length=None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_dir = os.path.dirname(model_path)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, options, providers=['CPUExecutionProvider'])
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        with open(os.path.join(model_dir, "config.json"), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        self.max_seq_length = max_seq_length or config["max_seq_length"]
+
+    def encode(self, texts, batch_size=ENCODE_BATCH_SIZE):
+        outputs = []
+        for i in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(texts[i:i + batch_size], padding=True, truncation=True,
+                                    max_length=self.max_seq_length, return_tensors='np')
+            outputs.append(self.session.run(['sentence_embedding'], {
+                'input_ids': tokens['input_ids'].astype(np.int64),
+                'attention_mask': tokens['attention_mask'].astype(np.int64)
+            })[0])
+        if not outputs:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(outputs)
+
+
+def load_onnx_encoder(model_name=EMBEDDING_MODEL_NAME, quantize=False, num_threads=None, max_seq_length=None):
+    """
+    Carrega o modelo ONNX, exportando (com verificação de paridade) na primeira vez.
+
+    Um modelo sem relatório de paridade, ou reprovado nele, é descartado e exportado de novo.
+    """
+    path = onnx_model_path(model_name, quantize)
+    report = read_parity_report(path)
+    backend = "onnx-int8" if quantize else "onnx"
+    if os.path.exists(path) and (report is None or report['min_cosine'] < PARITY_MIN_COSINE[backend]):
+        os.remove(path)
+    if not os.path.exists(path):
+        path, report = export_onnx(model_name, quantize)
+        print(f"Modelo ONNX exportado em {path} (cosseno mínimo vs PyTorch: {report['min_cosine']:.5f})")
+    return OnnxEncoder(path, num_threads=num_threads, max_seq_length=max_seq_length)
+
+
+# ==== Codificação com Cache ====
+def length_sorted_batches(texts, batch_size):
+    """
+    Índices dos textos agrupados em lotes de comprimento parecido (do maior
+    para o menor), para que cada lote seja preenchido (padding) só até o
+    tamanho dos seus próprios textos.
+    """
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+    return [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+
+class CachedEncoder:
+    """
+    Codificador com a mesma interface de SentenceTransformer.encode(textos).
+
+    Antes de codificar, consulta o cache persistente e remove textos repetidos
+    do lote; o modelo só é carregado quando algum texto ainda não está no cache.
+    Os textos que faltam são ordenados por comprimento e codificados em lotes
+    de tamanho parecido, gravando no cache a cada BATCHES_PER_FLUSH lotes (uma
+    interrupção perde no máximo esse trecho). O resultado volta na ordem original.
+
+    batch_size, num_threads (threads de CPU do PyTorch / ONNX Runtime) e
+    max_seq_length (tokens por texto, truncando currículos longos) são
+    configuráveis; None mantém o padrão do modelo / da biblioteca. backend
+    escolhe entre os valores de EMBEDDING_BACKENDS.
+    """
+
+    def __init__(self, model_name=EMBEDDING_MODEL_NAME, cache_path=EMBEDDING_CACHE_PATH, model=None,
+                 batch_size=ENCODE_BATCH_SIZE, num_threads=None, max_seq_length=None, backend="torch"):
+        if backend not in EMBEDDING_BACKENDS:
+            raise ValueError(f"Backend de embeddings desconhecido: {backend} (opções: {', '.join(EMBEDDING_BACKENDS)})")
+        self.model_name = model_name
+        self.backend = backend
+        self.cache = EmbeddingCache(cache_path) if cache_path else None
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.max_seq_length = max_seq_length
+        self._model = model
+        # Outro backend ou outro comprimento de truncamento geram vetores um pouco
+        # diferentes: a variante entra na chave do cache
+        self.cache_key = model_name
+        if backend != "torch":
+            self.cache_key += f"[{backend}]"
+        if max_seq_length:
+            self.cache_key += f"@{max_seq_length}"
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def model(self):
+        """Modelo SentenceTransformer ou ONNX (carregado na primeira necessidade)"""
+        if self._model is None and self.backend != "torch":
+            self._model = load_onnx_encoder(self.model_name, quantize=self.backend == "onnx-int8",
+                                            num_threads=self.num_threads, max_seq_length=self.max_seq_length)
+        elif self._model is None:
+            from sentence_transformers import SentenceTransformer
+            if self.num_threads:
+                import torch
+                torch.set_num_threads(self.num_threads)
+            self._model = SentenceTransformer(self.model_name)
+            if self.max_seq_length:
+                self._model.max_seq_length = self.max_seq_length
+        return self._model
+
+    def _encode_missing(self, missing, show_progress=False):
+        """Codifica {hash: texto} em lotes ordenados por comprimento; retorna {hash: vetor}"""
+        hashes = list(missing.keys())
+        texts = list(missing.values())
+        batches = length_sorted_batches(texts, self.batch_size)
+        if show_progress:
+            from tqdm import tqdm
+            batches = tqdm(batches, desc="Codificando textos")
+
+        encoded = {}
+        pending = {}
+        for batch_number, batch in enumerate(batches, start=1):
+            vectors = self.model.encode([texts[i] for i in batch], batch_size=len(batch))
+            for i, vector in zip(batch, vectors):
+                pending[hashes[i]] = np.asarray(vector, dtype=np.float32)
+            if batch_number % BATCHES_PER_FLUSH == 0:
+                if self.cache is not None:
+                    self.cache.put_many(self.cache_key, pending)
+                encoded.update(pending)
+                pending = {}
+        if pending and self.cache is not None:
+            self.cache.put_many(self.cache_key, pending)
+        encoded.update(pending)
+        return encoded
+
+    def encode(self, texts, show_progress=False):
+        """Retorna uma matriz (len(texts), dim) na ordem dos textos"""
+        hashes = [text_hash(text) for text in texts]
+        vectors = self.cache.get_many(self.cache_key, set(hashes)) if self.cache is not None else {}
+
+        # Textos ainda sem embedding, sem repetição (mantendo a ordem de aparição)
+        missing = {}
+        for hash_value, text in zip(hashes, texts):
+            if hash_value not in vectors and hash_value not in missing:
+                missing[hash_value] = text
+
+        if missing:
+            vectors.update(self._encode_missing(missing, show_progress))
+
+        self.cache_misses += len(missing)
+        self.cache_hits += len(hashes) - len(missing)
+
+        if not hashes:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([vectors[hash_value] for hash_value in hashes])
+
+
+_default_encoder = None
+_default_encoder_lock = threading.Lock()
+
+
+def embed_texts(texts):
+    """
+    Codifica textos avulsos com o encoder padrão do processo (cache compartilhado).
+
+    Para uso nos apps, ex.: embeddings de uma descrição de vaga digitada pelo usuário.
+    """
+    global _default_encoder
+    with _default_encoder_lock:
+        if _default_encoder is None:
+            _default_encoder = CachedEncoder()
+    return _default_encoder.encode(list(texts))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta o modelo de embeddings para ONNX e verifica a paridade")
+    parser.add_argument("command", choices=["export"])
+    parser.add_argument("--model", default=EMBEDDING_MODEL_NAME)
+    parser.add_argument("--quantize", action="store_true", help="Gera também a versão int8")
+    args = parser.parse_args()
+
+    model_path, parity = export_onnx(args.model, quantize=args.quantize)
+    print(f"Modelo exportado: {model_path}")
+    print(json.dumps(parity, indent=2))
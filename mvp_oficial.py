@@ -1,8 +1,6 @@
 import streamlit as st
-import pickle
 import pandas as pd
 import numpy as np
-from sentence_transformers import util
 import plotly.express as px
 import plotly.graph_objects as go
 import math
@@ -13,6 +11,15 @@ from PIL import Image
 import base64
 import io
 import streamlit_nested_layout
+from artifact_store import ARTIFACT_DIR, artifacts_exist, artifacts_version, convert_pickle_to_artifacts, load_artifacts
+from ranking import (APP_WEIGHTS, RECOMMENDATIONS_DIR, RankedCandidates, RankingCache, load_recommendations,
+                     rank_job_candidates, weights_key)
+
+# Quantidade de candidatos mantidos no ranking de cada vaga (cards + comparativo)
+RANKING_TOP_N = 50
+
+# Recomendações materializadas pelo data_processing.py: "auto" (usar quando disponíveis) ou "live" (sempre recalcular)
+RECOMMENDATION_MODE = os.environ.get("DECISION_RECOMMENDATION_MODE", "auto")
 
 
 # Configuração da página
@@ -423,9 +430,18 @@ def merge_technical_knowledge(conhecimentos_tecnicos, conhecimentos_extraidos):
     else:
         return "N/A"
 
-@st.cache_data
+@st.cache_resource
 def download_and_load_data():
-    """Baixa e carrega os dados do arquivo pickle do Google Drive."""
+    """
+    Carrega os dados processados a partir dos artefatos colunares (memory-map).
+    
+    Na primeira execução, baixa o arquivo pickle do Google Drive e o converte
+    para o formato de artefatos; as execuções seguintes abrem os artefatos
+    diretamente, sem desserializar o pickle inteiro.
+    """
+    if artifacts_exist(ARTIFACT_DIR):
+        return load_artifacts(ARTIFACT_DIR)
+    
     # Caminho para salvar o arquivo baixado
     output_path = 'decision_embeddings_enhanced.pkl'
     
@@ -442,90 +458,27 @@ def download_and_load_data():
             gdown.download(url, output_path, quiet=False)
             st.success("Arquivo baixado com sucesso!")
     
-    # Carregar o arquivo
-    with open(output_path, 'rb') as f:
-        data = pickle.load(f)
+    # Converter o pickle para artefatos (feito apenas uma vez)
+    with st.status("Convertendo dados para o formato otimizado..."):
+        convert_pickle_to_artifacts(output_path, ARTIFACT_DIR)
     
-    return data
+    return load_artifacts(ARTIFACT_DIR)
 
-def compare_academic_levels(job_level, applicant_level):
-    """
-    Compara níveis acadêmicos, retornando 1.0 se o candidato atende ou supera o requisito.
-    """
-    # Ordem de níveis acadêmicos (do menor para o maior)
-    academic_hierarchy = {
-        "ensino fundamental": 1,
-        "ensino médio": 2,
-        "ensino técnico": 3,
-        "ensino superior incompleto": 4,
-        "ensino superior completo": 5,
-        "mba": 6,
-        "especialização": 6,
-        "mba/especialização": 6,
-        "mestrado": 7,
-        "doutorado": 8,
-        "pós-doutorado": 9
-    }
-    
-    # Normalizar textos para comparação
-    job_level = job_level.lower()
-    applicant_level = applicant_level.lower()
-    
-    # Buscar o nível na hierarquia
-    job_rank = 0
-    applicant_rank = 0
-    
-    for level, rank in academic_hierarchy.items():
-        if level in job_level:
-            job_rank = max(job_rank, rank)
-        if level in applicant_level:
-            applicant_rank = max(applicant_rank, rank)
-    
-    # Se não foi encontrado na hierarquia
-    if job_rank == 0 or applicant_rank == 0:
-        return 0.5  # Valor neutro para quando não conseguimos determinar
-    
-    # Se o candidato possui nível maior ou igual ao requisitado
-    if applicant_rank >= job_rank:
-        return 1.0
-    else:
-        # Calcular uma pontuação proporcional
-        return max(0.2, applicant_rank / job_rank)
+@st.cache_resource
+def load_recommendation_index():
+    """Índice top-N por vaga (memory-map), se existir e corresponder aos artefatos carregados"""
+    if RECOMMENDATION_MODE == "live":
+        return None
+    try:
+        return load_recommendations(RECOMMENDATIONS_DIR, source_version=artifacts_version(ARTIFACT_DIR))
+    except Exception as e:
+        st.warning(f"⚠️ Recomendações materializadas indisponíveis: {e}")
+        return None
 
-def calculate_similarity(job_id, applicant_id, job_embeddings, applicant_embeddings, match_details, processed_jobs, processed_applicants):
-    job_emb = job_embeddings[job_id]
-    applicant_emb = applicant_embeddings[applicant_id]
-    
-    # Calcular similaridade de cosseno
-    cos_sim = util.cos_sim(job_emb, applicant_emb).item()
-    
-    # Obter detalhes de match se disponíveis
-    details = match_details.get(job_id, {}).get(applicant_id, {})
-    details['semantic'] = cos_sim
-    
-    # Verificar se precisamos recalcular o score acadêmico
-    if 'academic_level' in details and processed_jobs[job_id].get('nivel_academico') and processed_applicants[applicant_id].get('nivel_academico'):
-        details['academic_level'] = compare_academic_levels(
-            processed_jobs[job_id].get('nivel_academico', ''),
-            processed_applicants[applicant_id].get('nivel_academico', '')
-        )
-    
-    # Calcular score ponderado
-    weighted_score = (
-        cos_sim * 0.40 +  # Semântica
-        details.get('keywords', 0) * 0.30 +  # Palavras-chave técnicas
-        details.get('location', 0) * 0.05 +  # Localização
-        details.get('professional_level', 0) * 0.10 +  # Nível profissional
-        details.get('academic_level', 0) * 0.10 +  # Nível acadêmico
-        details.get('english_level', 0) * 0.025 +  # Nível de inglês
-        details.get('spanish_level', 0) * 0.025  # Nível de espanhol
-    )
-    
-    # Retornar similaridade e detalhes
-    return {
-        'score': weighted_score,
-        'details': details
-    }
+@st.cache_resource
+def get_ranking_cache():
+    """Cache LRU de rankings compartilhado por todas as sessões do processo"""
+    return RankingCache()
 
 def get_theme_colors():
     """Retorna cores adaptadas ao tema atual"""
@@ -1202,6 +1155,27 @@ def render_comparison_view(similarities, selected_job, top_n=5):
         - Ideal para compartilhar com equipes de RH e gestores
         """)
 
+def build_job_options(processed_jobs):
+    """
+    Rótulos do seletor de vagas ({job_id: "Título - Cliente (ID: ...)"}).
+    
+    Na FeatureTable dos artefatos, título e cliente são lidos como colunas inteiras,
+    sem converter cada vaga em dicionário.
+    """
+    if hasattr(processed_jobs, 'column'):
+        job_ids = processed_jobs.ids
+        titles = processed_jobs.column('titulo', default='Sem título')
+        companies = processed_jobs.column('cliente', default='Empresa não especificada')
+    else:
+        job_ids = list(processed_jobs.keys())
+        titles = [processed_jobs[job_id].get('titulo', 'Sem título') for job_id in job_ids]
+        companies = [processed_jobs[job_id].get('cliente', 'Empresa não especificada') for job_id in job_ids]
+    
+    return {
+        job_id: f"{capitalize_words(title)} - {capitalize_words(company)} (ID: {job_id})"
+        for job_id, title, company in zip(job_ids, titles, companies)
+    }
+
 def main():
     # Aplicar CSS dinâmico
     st.markdown(get_dynamic_css(), unsafe_allow_html=True)
@@ -1223,11 +1197,7 @@ def main():
             
             st.success("✅ Dados carregados com sucesso!")
         
-        job_options = {}
-        for job_id, job in processed_jobs.items():
-            title = capitalize_words(job.get('titulo', 'Sem título'))
-            company = capitalize_words(job.get('cliente', 'Empresa não especificada'))
-            job_options[job_id] = f"{title} - {company} (ID: {job_id})"
+        job_options = build_job_options(processed_jobs)
         
         st.markdown("## Encontre os candidatos ideais em segundos")
         
@@ -1251,51 +1221,39 @@ def main():
             
             render_job_details(selected_job)
             
-            cache_key = f"similarities_{selected_job_id}"
-            
-            if cache_key not in st.session_state:
-                progress_bar = st.progress(0)
-                status_text = st.empty()
-                
-                similarities = []
-                total_applicants = len(applicant_embeddings.keys())
+            def compute_ranking():
+                # Top-N materializado pelo pipeline, quando a vaga está no índice
+                recommendations = load_recommendation_index()
+                ranking = recommendations.get(selected_job_id, RANKING_TOP_N) if recommendations is not None else None
+                if ranking is not None:
+                    return ranking
                 
-                for i, applicant_id in enumerate(applicant_embeddings.keys()):
-                    progress = int((i + 1) / total_applicants * 100)
-                    progress_bar.progress(progress)
-                    status_text.text(f"🔄 Calculando similaridade para candidatos: {i+1}/{total_applicants}")
-                    
-                    similarity_data = calculate_similarity(
+                # Ranking vetorizado de todo o pool; apenas os top-N viram registros
+                with st.spinner(f"🔄 Calculando similaridade para {len(applicant_embeddings)} candidatos..."):
+                    return rank_job_candidates(
                         selected_job_id, 
-                        applicant_id, 
                         job_embeddings, 
                         applicant_embeddings, 
                         match_details, 
                         processed_jobs, 
-                        processed_applicants
+                        processed_applicants,
+                        top_n=RANKING_TOP_N
                     )
-                    
-                    applicant = processed_applicants[applicant_id]
-                    
-                    is_hired = applicant['codigo'] in hired_candidates.get(selected_job_id, [])
-                    
-                    similarities.append({
-                        'id': applicant_id,
-                        'nome': applicant['nome'],
-                        'score': similarity_data['score'],
-                        'is_hired': is_hired,
-                        'applicant_data': applicant,
-                        'match_details': similarity_data['details']
-                    })
-                
-                similarities = sorted(similarities, key=lambda x: x['score'], reverse=True)
-                
-                st.session_state[cache_key] = similarities
-                
-                progress_bar.empty()
-                status_text.empty()
-            else:
-                similarities = st.session_state[cache_key]
+            
+            def make_record(candidate_id, score, details):
+                applicant = processed_applicants[candidate_id]
+                return {
+                    'id': candidate_id,
+                    'nome': applicant['nome'],
+                    'score': score,
+                    'is_hired': applicant['codigo'] in hired_candidates.get(selected_job_id, []),
+                    'applicant_data': applicant,
+                    'match_details': details
+                }
+            
+            # Ranking (IDs e scores) compartilhado entre sessões; registros montados sob demanda
+            ranking_key = (selected_job_id, weights_key(APP_WEIGHTS), artifacts_version(ARTIFACT_DIR), RANKING_TOP_N)
+            similarities = RankedCandidates(get_ranking_cache().get_or_compute(ranking_key, compute_ranking), make_record)
             
             top_7_ids = [item['id'] for item in similarities[:7]]
             hired_ids = [candidate_id for candidate_id in top_7_ids 
@@ -0,0 +1,434 @@
+"""
+Ranking de Candidatos - Decision Recruiter
+
+Ranking vetorizado de todo o pool de candidatos para uma vaga: os cossenos
+são calculados com um único produto matriz-vetor, os sete componentes do
+score são montados como arrays e apenas os top-N registros são devolvidos.
+
+O pipeline também materializa o top-N de cada vaga em um índice de
+recomendações (decision_recommendations/), servido pelos apps sem recalcular,
+e os rankings calculados ficam em um cache LRU compartilhado pelas sessões.
+"""
+
+import json
+import os
+import shutil
+import threading
+from collections.abc import Sequence
+
+import numpy as np
+from cachetools import LRUCache
+
+from artifact_store import current_version_directory, job_match_arrays, new_version_directory, publish_version
+from vector_search import compressed_dot, top_k_indices
+
+# Pesos do score final usados pelos apps
+APP_WEIGHTS = {
+    "semantic": 0.40,
+    "keywords": 0.30,
+    "location": 0.05,
+    "professional_level": 0.10,
+    "academic_level": 0.10,
+    "english_level": 0.025,
+    "spanish_level": 0.025
+}
+
+RANKING_COMPONENTS = list(APP_WEIGHTS.keys())
+
+# Índice de recomendações materializadas (top-N por vaga)
+RECOMMENDATIONS_DIR = "decision_recommendations"
+RECOMMENDATIONS_FORMAT_VERSION = 1
+RECOMMENDATION_TOP_N = 50
+
+# Rankings mantidos no cache compartilhado entre sessões (por processo)
+RANKING_CACHE_SIZE = int(os.environ.get("DECISION_RANKING_CACHE_SIZE", "256"))
+
+
+# Ordem de níveis acadêmicos (do menor para o maior)
+ACADEMIC_HIERARCHY = {
+    "ensino fundamental": 1,
+    "ensino médio": 2,
+    "ensino técnico": 3,
+    "ensino superior incompleto": 4,
+    "ensino superior completo": 5,
+    "mba": 6,
+    "especialização": 6,
+    "mba/especialização": 6,
+    "mestrado": 7,
+    "doutorado": 8,
+    "pós-doutorado": 9
+}
+
+
+def academic_rank(level):
+    """Ordinal do nível acadêmico na hierarquia (0 = não encontrado)"""
+    level = level.lower()
+    rank = 0
+    for name, name_rank in ACADEMIC_HIERARCHY.items():
+        if name in level:
+            rank = max(rank, name_rank)
+    return rank
+
+
+def applicant_academic_rank(level):
+    """Ordinal acadêmico de um candidato, ou -1 se o nível não foi informado (score do match mantido)"""
+    return academic_rank(level) if level else -1
+
+
+def _ranked_academic_score(job_rank, applicant_rank):
+    # Se não foi encontrado na hierarquia
+    if job_rank == 0 or applicant_rank == 0:
+        return 0.5  # Valor neutro para quando não conseguimos determinar
+
+    # Se o candidato possui nível maior ou igual ao requisitado
+    if applicant_rank >= job_rank:
+        return 1.0
+    else:
+        # Calcular uma pontuação proporcional
+        return max(0.2, applicant_rank / job_rank)
+
+
+# Score por par de ordinais (vaga, candidato)
+_MAX_ACADEMIC_RANK = max(ACADEMIC_HIERARCHY.values())
+ACADEMIC_SCORES = np.array([
+    [_ranked_academic_score(job_rank, applicant_rank) for applicant_rank in range(_MAX_ACADEMIC_RANK + 1)]
+    for job_rank in range(_MAX_ACADEMIC_RANK + 1)
+], dtype=np.float64)
+
+
+def compare_academic_levels(job_level, applicant_level):
+    """
+    Compara níveis acadêmicos, retornando 1.0 se o candidato atende ou supera o requisito.
+    """
+    return float(ACADEMIC_SCORES[academic_rank(job_level), academic_rank(applicant_level)])
+
+
+def applicant_academic_ranks(processed_applicants, applicant_ids):
+    """
+    Ordinais acadêmicos (applicant_academic_rank) dos candidatos, na ordem de applicant_ids.
+
+    Na FeatureTable dos artefatos a coluna é codificada uma vez e fica em cache;
+    no dicionário do pickle, cada nível distinto é avaliado uma única vez.
+    """
+    if hasattr(processed_applicants, 'encoded_column'):
+        return processed_applicants.encoded_column('nivel_academico', applicant_academic_rank, applicant_ids)
+
+    ranks = {}
+    values = [(processed_applicants.get(applicant_id) or {}).get('nivel_academico', '') for applicant_id in applicant_ids]
+    return np.array([ranks[value] if value in ranks else ranks.setdefault(value, applicant_academic_rank(value))
+                     for value in values], dtype=np.int32)
+
+
+def embedding_matrix(embeddings):
+    """
+    Retorna (ids, matriz, normas, escalas) de um conjunto de embeddings.
+
+    Aceita tanto o EmbeddingStore dos artefatos (matriz já contígua, possivelmente
+    comprimida em float16/int8) quanto o dicionário {id: vetor} do pickle antigo.
+    """
+    if hasattr(embeddings, 'matrix'):
+        return embeddings.ids, embeddings.matrix, embeddings.norms, embeddings.scales
+
+    ids = list(embeddings.keys())
+    matrix = np.vstack([np.asarray(embeddings[item_id], dtype=np.float32) for item_id in ids])
+    return ids, matrix, np.linalg.norm(matrix, axis=1), None
+
+
+def cosine_scores(job_vector, matrix, norms, scales=None):
+    """Similaridade de cosseno de um vetor com todas as linhas da matriz (comprimida ou não)"""
+    job_vector = np.asarray(job_vector, dtype=np.float32)
+    denominator = norms * np.linalg.norm(job_vector)
+    denominator[denominator == 0] = 1.0
+    return compressed_dot(matrix, job_vector, scales) / denominator
+
+
+def rank_job_candidates(job_id, job_embeddings, applicant_embeddings, match_details,
+                        processed_jobs, processed_applicants, top_n=50, weights=APP_WEIGHTS):
+    """
+    Ranqueia todos os candidatos para uma vaga e retorna apenas os top-N.
+
+    O score é a soma ponderada (weights) do cosseno dos embeddings com os componentes
+    estruturados dos detalhes de match; candidatos sem detalhes recebem 0 nesses
+    componentes e o nível acadêmico é recalculado com compare_academic_levels.
+    Retorna uma lista de {'id', 'score', 'details'} em ordem decrescente de score.
+    """
+    applicant_ids, matrix, norms, scales = embedding_matrix(applicant_embeddings)
+    if not applicant_ids:
+        return []
+
+    # 1. Similaridade semântica com todo o pool em um único produto matriz-vetor
+    components = np.zeros((len(RANKING_COMPONENTS), len(applicant_ids)), dtype=np.float32)
+    components[0] = cosine_scores(job_embeddings[job_id], matrix, norms, scales)
+
+    # 2. Componentes estruturados vindos dos detalhes de match pré-calculados (fatias dos arrays da vaga)
+    positions, match_scores = job_match_arrays(match_details, job_id, applicant_ids, RANKING_COMPONENTS[1:])
+    components[1:, positions] = match_scores.T
+
+    # Score acadêmico recalculado com a hierarquia completa de níveis
+    job_level = processed_jobs[job_id].get('nivel_academico', '')
+    if job_level:
+        academic_row = RANKING_COMPONENTS.index('academic_level')
+        applicant_ranks = applicant_academic_ranks(processed_applicants, applicant_ids)[positions]
+        informed = applicant_ranks >= 0
+        components[academic_row, positions[informed]] = ACADEMIC_SCORES[academic_rank(job_level), applicant_ranks[informed]]
+
+    # 3. Score ponderado de todo o pool (somado em float64, como a soma escalar por candidato) e seleção parcial dos top-N
+    weight_vector = np.array([weights[component] for component in RANKING_COMPONENTS], dtype=np.float64)
+    weighted_scores = weight_vector @ components.astype(np.float64)
+    top_indices, top_scores = top_k_indices(weighted_scores, top_n)
+
+    results = []
+    for position, score in zip(top_indices[0], top_scores[0]):
+        results.append({
+            'id': applicant_ids[position],
+            'score': float(score),
+            'details': {
+                component: float(components[row, position])
+                for row, component in enumerate(RANKING_COMPONENTS)
+            }
+        })
+    return results
+
+
+# ==== Recomendações Materializadas ====
+class RecommendationIndex:
+    """
+    Top-N de cada vaga já ranqueado, em arrays densos (vagas × N):
+    índice do candidato (-1 = posição vazia), score final (float64) e componentes (float32).
+
+    get(job_id) devolve a mesma lista de rank_job_candidates, ou None se a
+    vaga não está no índice.
+    """
+
+    def __init__(self, job_ids, applicant_ids, applicant_index, scores, details, weights, source_version=None):
+        self.job_ids = list(job_ids)
+        self.job_index = {job_id: i for i, job_id in enumerate(self.job_ids)}
+        self.applicant_ids = list(applicant_ids)
+        self.applicant_index = applicant_index
+        self.scores = scores
+        self.details = details
+        self.weights = dict(weights)
+        self.source_version = source_version
+
+    @property
+    def top_n(self):
+        return self.applicant_index.shape[1]
+
+    def __contains__(self, job_id):
+        return job_id in self.job_index
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def get(self, job_id, top_n=None):
+        position = self.job_index.get(job_id)
+        if position is None:
+            return None
+        end = self.top_n if top_n is None else top_n
+        indices = np.asarray(self.applicant_index[position, :end])
+        valid = indices >= 0
+        return [
+            {
+                'id': self.applicant_ids[applicant_idx],
+                'score': score,
+                'details': dict(zip(RANKING_COMPONENTS, row))
+            }
+            for applicant_idx, score, row in zip(indices[valid].tolist(),
+                                                 self.scores[position, :end][valid].tolist(),
+                                                 self.details[position, :end][valid].tolist())
+        ]
+
+
+def build_recommendations(job_ids, job_embeddings, applicant_embeddings, match_details, processed_jobs,
+                          processed_applicants, top_n=RECOMMENDATION_TOP_N, weights=APP_WEIGHTS, source_version=None):
+    """
+    Materializa rank_job_candidates para cada vaga de job_ids (que pode ser um iterador
+    com barra de progresso). Vagas sem embedding ficam fora do índice.
+    """
+    applicant_ids = list(embedding_matrix(applicant_embeddings)[0])
+    applicant_position = {applicant_id: i for i, applicant_id in enumerate(applicant_ids)}
+
+    ranked_job_ids = []
+    indices = []
+    scores = []
+    details = []
+    for job_id in job_ids:
+        if job_id not in job_embeddings:
+            continue
+        ranking = rank_job_candidates(job_id, job_embeddings, applicant_embeddings, match_details,
+                                      processed_jobs, processed_applicants, top_n=top_n, weights=weights)
+        row_indices = np.full(top_n, -1, dtype=np.int32)
+        row_scores = np.zeros(top_n, dtype=np.float64)
+        row_details = np.zeros((top_n, len(RANKING_COMPONENTS)), dtype=np.float32)
+        for rank, result in enumerate(ranking):
+            row_indices[rank] = applicant_position[result['id']]
+            row_scores[rank] = result['score']
+            row_details[rank] = [result['details'][component] for component in RANKING_COMPONENTS]
+        ranked_job_ids.append(job_id)
+        indices.append(row_indices)
+        scores.append(row_scores)
+        details.append(row_details)
+
+    return RecommendationIndex(
+        ranked_job_ids,
+        applicant_ids,
+        np.array(indices, dtype=np.int32).reshape(len(ranked_job_ids), top_n),
+        np.array(scores, dtype=np.float64).reshape(len(ranked_job_ids), top_n),
+        np.array(details, dtype=np.float32).reshape(len(ranked_job_ids), top_n, len(RANKING_COMPONENTS)),
+        weights,
+        source_version
+    )
+
+
+def save_recommendations(index, directory=RECOMMENDATIONS_DIR):
+    """
+    Salva o índice de recomendações em uma versão nova, publicada com a troca
+    atômica de CURRENT (ver artifact_store.publish_version).
+    """
+    os.makedirs(directory, exist_ok=True)
+    version_name, version_directory = new_version_directory(directory)
+    try:
+        for name, data in (("job_ids", index.job_ids), ("applicant_ids", index.applicant_ids)):
+            with open(os.path.join(version_directory, f"{name}.json"), 'w', encoding='utf-8') as f:
+                json.dump([str(item_id) for item_id in data], f, ensure_ascii=False)
+        np.save(os.path.join(version_directory, "applicant_index.npy"), index.applicant_index)
+        np.save(os.path.join(version_directory, "scores.npy"), index.scores)
+        np.save(os.path.join(version_directory, "details.npy"), index.details)
+        with open(os.path.join(version_directory, "manifest.json"), 'w', encoding='utf-8') as f:
+            json.dump({
+                "format_version": RECOMMENDATIONS_FORMAT_VERSION,
+                "top_n": index.top_n,
+                "weights": index.weights,
+                "components": RANKING_COMPONENTS,
+                "source_version": index.source_version
+            }, f)
+    except Exception:
+        shutil.rmtree(version_directory, ignore_errors=True)
+        raise
+
+    publish_version(directory, version_name)
+
+
+def load_recommendations(directory=RECOMMENDATIONS_DIR, source_version=None, weights=APP_WEIGHTS):
+    """
+    Abre o índice de recomendações (memory-map), ou None se não existe ou não serve:
+    gerado a partir de outra versão dos artefatos (source_version) ou com outros pesos.
+    """
+    directory = current_version_directory(directory)
+    manifest_path = os.path.join(directory, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get("format_version") != RECOMMENDATIONS_FORMAT_VERSION or manifest.get("components") != RANKING_COMPONENTS:
+        return None
+    if source_version is not None and manifest.get("source_version") != source_version:
+        return None
+    if manifest.get("weights") != dict(weights):
+        return None
+
+    def read_ids(name):
+        with open(os.path.join(directory, f"{name}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    return RecommendationIndex(
+        read_ids("job_ids"),
+        read_ids("applicant_ids"),
+        np.load(os.path.join(directory, "applicant_index.npy"), mmap_mode='r'),
+        np.load(os.path.join(directory, "scores.npy"), mmap_mode='r'),
+        np.load(os.path.join(directory, "details.npy"), mmap_mode='r'),
+        manifest["weights"],
+        manifest.get("source_version")
+    )
+
+
+# ==== Cache Compartilhado de Rankings ====
+def weights_key(weights):
+    """Representação imutável dos pesos, para compor chaves de cache"""
+    return tuple(sorted((component, float(weight)) for component, weight in weights.items()))
+
+
+class UncachedRanking(list):
+    """
+    Ranking que não deve entrar no cache (ex.: a busca vetorial falhou e os
+    scores foram calculados em modo degradado). RankingCache.get_or_compute
+    devolve o resultado normalmente, mas a próxima chamada recalcula.
+    """
+
+
+class RankingCache:
+    """
+    Cache LRU de rankings, limitado em número de entradas e seguro entre threads
+    (as sessões do Streamlit rodam em threads do mesmo processo).
+
+    Cada entrada guarda apenas (IDs, scores, componentes) em arrays; os registros
+    de exibição são montados sob demanda por RankedCandidates.
+    """
+
+    def __init__(self, maxsize=RANKING_CACHE_SIZE):
+        self._cache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """
+        Entrada da chave; em caso de falta, chama compute() (fora do lock) e guarda
+        o resultado. compute retorna uma lista de {'id', 'score', 'details'}, ou uma
+        UncachedRanking para que o resultado não seja guardado.
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is not None:
+            return entry
+
+        results = compute()
+        entry = (
+            tuple(result['id'] for result in results),
+            np.array([result['score'] for result in results], dtype=np.float64),
+            np.array([[result['details'].get(component, 0.0) for component in RANKING_COMPONENTS]
+                      for result in results], dtype=np.float64).reshape(len(results), len(RANKING_COMPONENTS))
+        )
+        if not isinstance(results, UncachedRanking):
+            with self._lock:
+                self._cache[key] = entry
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+class RankedCandidates(Sequence):
+    """
+    Entrada do RankingCache vista como a lista de registros de exibição dos apps.
+
+    make_record(candidate_id, score, details) monta o registro de uma posição
+    apenas quando ela é acessada (ex.: os 7 cards ou os 5 do comparativo).
+    """
+
+    def __init__(self, entry, make_record):
+        self.ids, self.scores, self.details = entry
+        self.make_record = make_record
+        self._records = {}
+
+    def _record(self, position):
+        record = self._records.get(position)
+        if record is None:
+            details = dict(zip(RANKING_COMPONENTS, self.details[position].tolist()))
+            record = self.make_record(self.ids[position], float(self.scores[position]), details)
+            self._records[position] = record
+        return record
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._record(i) for i in range(*position.indices(len(self.ids)))]
+        if position < 0:
+            position += len(self.ids)
+        if not 0 <= position < len(self.ids):
+            raise IndexError(position)
+        return self._record(position)
+
+    def __len__(self):
+        return len(self.ids)
@@ -0,0 +1,206 @@
+"""
+Score vetorizado do app.py (score_candidates_vectorized / level_scores_vectorized)
+contra o cálculo escalar por candidato que ele substituiu, copiado abaixo.
+
+app.py importa o Streamlit e o Pinecone no nível do módulo, então só os trechos
+de níveis e de score são carregados.
+"""
+
+import os
+import random
+
+import numpy as np
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+class FakeStreamlit:
+    """O suficiente de st para os decoradores de cache e a barra de progresso"""
+
+    def cache_resource(self, *args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda function: function
+
+    def progress(self, value):
+        return self
+
+    def empty(self):
+        return self
+
+    def text(self, value):
+        pass
+
+
+def load_scoring_functions():
+    with open(APP_PATH, 'r', encoding='utf-8') as f:
+        source = f.read()
+    namespace = {'np': np, 'st': FakeStreamlit()}
+    for start, end in (("# Hierarquias simplificadas de níveis", "def process_job("),
+                       ("def stored_level_ordinals(", "@st.cache_resource\ndef get_ranking_cache")):
+        exec(source[source.index(start):source.index(end)], namespace)
+    return namespace
+
+
+# ==== Cálculo escalar anterior ====
+def compare_levels(required_level, candidate_level):
+    if not required_level or not candidate_level:
+        return 0.5
+    required = required_level.lower()
+    candidate = candidate_level.lower()
+    prof_levels = {'junior': 1, 'pleno': 2, 'senior': 3, 'sênior': 3}
+    acad_levels = {'médio': 1, 'técnico': 2, 'superior': 3, 'mestrado': 4, 'doutorado': 5}
+    lang_levels = {'básico': 1, 'intermediário': 2, 'avançado': 3, 'fluente': 4}
+    for levels_dict in [prof_levels, acad_levels, lang_levels]:
+        req_score = 0
+        cand_score = 0
+        for level, score in levels_dict.items():
+            if level in required:
+                req_score = max(req_score, score)
+            if level in candidate:
+                cand_score = max(cand_score, score)
+        if req_score > 0 and cand_score > 0:
+            return min(1.0, cand_score / req_score)
+    return 1.0 if required in candidate or candidate in required else 0.5
+
+
+def calculate_similarity_optimized(job, candidate, semantic_score):
+    job_keywords = set(job.get('keywords', []))
+    candidate_keywords = set(candidate.get('keywords', []))
+    if job_keywords and candidate_keywords:
+        keywords_score = len(job_keywords.intersection(candidate_keywords)) / len(job_keywords)
+    else:
+        keywords_score = 0.0
+
+    location_score = 0.0
+    if job.get('cidade') and candidate.get('cidade'):
+        if job['cidade'].lower() == candidate['cidade'].lower():
+            location_score = 1.0
+    elif job.get('estado') and candidate.get('estado'):
+        if job['estado'].lower() == candidate['estado'].lower():
+            location_score = 0.7
+    else:
+        location_score = 0.3
+
+    details = {
+        'semantic': semantic_score,
+        'keywords': keywords_score,
+        'location': location_score,
+        'professional_level': compare_levels(job.get('nivel_profissional', ''), candidate.get('nivel_profissional', '')),
+        'academic_level': compare_levels(job.get('nivel_academico', ''), candidate.get('nivel_academico', '')),
+        'english_level': compare_levels(job.get('nivel_ingles', ''), candidate.get('nivel_ingles', '')),
+        'spanish_level': compare_levels(job.get('nivel_espanhol', ''), candidate.get('nivel_espanhol', ''))
+    }
+    final_score = (
+        details['semantic'] * 0.40 +
+        details['keywords'] * 0.30 +
+        details['location'] * 0.05 +
+        details['professional_level'] * 0.10 +
+        details['academic_level'] * 0.10 +
+        details['english_level'] * 0.025 +
+        details['spanish_level'] * 0.025
+    )
+    return {'score': final_score, 'details': details}
+
+
+def get_top_candidates_scalar(job_id, processed_jobs, processed_applicants, semantic_scores, top_k=7):
+    """get_top_candidates_fast anterior: um candidato por vez e ordenação da lista"""
+    candidates_to_evaluate = list(semantic_scores.keys())[:50]
+    if len(candidates_to_evaluate) < 20:
+        candidates_to_evaluate = list(processed_applicants.keys())
+
+    results = []
+    for candidate_id in candidates_to_evaluate:
+        similarity_data = calculate_similarity_optimized(processed_jobs[job_id], processed_applicants[candidate_id],
+                                                         semantic_scores.get(candidate_id, 0.5))
+        results.append({
+            'id': candidate_id,
+            'score': similarity_data['score'],
+            'match_details': similarity_data['details']
+        })
+    results.sort(key=lambda x: x['score'], reverse=True)
+    return results[:top_k * 2]
+
+
+# ==== Amostra fixa ====
+LEVELS = ["", "Júnior", "junior", "Pleno", "Sênior", "Senior", "Analista", "Especialista", "Ensino Médio",
+          "Técnico", "Ensino Superior Completo", "Mestrado", "Doutorado", "Básico", "Intermediário",
+          "Avançado", "Fluente", "Nenhum", "pleno/sênior", "Analista Especialista"]
+KEYWORDS = ["python", "java", "sql", "aws", "docker", "react"]
+CITIES = ["", "São Paulo", "são paulo", "Campinas"]
+STATES = ["", "SP", "sp", "RJ"]
+
+
+def make_record(rng, functions, name):
+    record = {
+        'nome': name,
+        'cidade': rng.choice(CITIES),
+        'estado': rng.choice(STATES),
+        'nivel_profissional': rng.choice(LEVELS),
+        'nivel_academico': rng.choice(LEVELS),
+        'nivel_ingles': rng.choice(LEVELS),
+        'nivel_espanhol': rng.choice(LEVELS),
+        'keywords': rng.sample(KEYWORDS, rng.randint(0, 3))
+    }
+    if rng.random() < 0.1:
+        del record['keywords']
+    if rng.random() < 0.2:
+        del record['nivel_espanhol']
+    if rng.random() < 0.7:
+        # Ordinais guardados por process_job / process_applicant (dados em cache antigos não os têm)
+        record['niveis_ordinais'] = functions['record_level_ordinals'](record)
+    return record
+
+
+def make_fixture(seed, applicants=200, jobs=30):
+    functions = load_scoring_functions()
+    rng = random.Random(seed)
+    processed_applicants = {f"a{i}": make_record(rng, functions, f"candidato {i}") for i in range(applicants)}
+    processed_jobs = {f"v{i}": make_record(rng, functions, f"vaga {i}") for i in range(jobs)}
+    return functions, processed_jobs, processed_applicants
+
+
+def test_vectorized_scores_match_scalar_similarity():
+    functions, processed_jobs, processed_applicants = make_fixture(11)
+    arrays = functions['build_applicant_arrays'](processed_applicants)
+    rows = np.arange(len(arrays['ids']))
+    semantic = np.random.default_rng(11).random(len(rows))
+
+    for job in processed_jobs.values():
+        final_scores, details = functions['score_candidates_vectorized'](job, arrays, rows, semantic)
+        for row, candidate_id in enumerate(arrays['ids']):
+            expected = calculate_similarity_optimized(job, processed_applicants[candidate_id], float(semantic[row]))
+            assert final_scores[row] == expected['score']
+            assert {component: values[row] for component, values in details.items()} == expected['details']
+
+
+def test_level_scores_match_compare_levels():
+    functions = load_scoring_functions()
+    applicants = {f"a{i}": {'nivel_profissional': level} for i, level in enumerate(LEVELS)}
+    arrays = functions['build_applicant_arrays'](applicants)
+    rows = np.arange(len(LEVELS))
+
+    for required_level in LEVELS:
+        scores = functions['level_scores_vectorized'](arrays, 'nivel_profissional', required_level,
+                                                      functions['level_ordinals'](required_level), rows)
+        assert scores.tolist() == [compare_levels(required_level, level) for level in LEVELS]
+
+
+def test_top_candidates_match_scalar_ranking():
+    # Amostra pequena, com muitos empates: a ordem tem de ser a da ordenação estável da lista
+    functions, processed_jobs, processed_applicants = make_fixture(23, applicants=80, jobs=12)
+    arrays = functions['build_applicant_arrays'](processed_applicants)
+    rng = random.Random(23)
+    shuffled_ids = rng.sample(list(processed_applicants), len(processed_applicants))
+
+    for job_id in processed_jobs:
+        # Sem busca semântica (todos os candidatos, semântica neutra) e com o top da busca
+        no_search = {}
+        search = {candidate_id: rng.choice([0.5, 0.75, 0.9]) for candidate_id in shuffled_ids[:60]}
+        for semantic_scores in (no_search, search):
+            results = functions['get_top_candidates_fast'](job_id, processed_jobs, processed_applicants,
+                                                           applicant_arrays=arrays, semantic_scores=semantic_scores)
+            expected = get_top_candidates_scalar(job_id, processed_jobs, processed_applicants, semantic_scores)
+            assert [(r['id'], r['score'], r['match_details']) for r in results] == \
+                [(r['id'], r['score'], r['match_details']) for r in expected]
+            assert all(r['applicant_data'] is processed_applicants[r['id']] for r in results)
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+
+import artifact_store
+from artifact_store import CURRENT_FILE, artifacts_exist, artifacts_version, load_artifacts, save_artifacts
+
+
+def make_data(title):
+    return {
+        'processed_jobs': {'v1': {'titulo': title, 'cliente': 'acme'}, 'v2': {'titulo': 'analista'}},
+        'processed_applicants': {'a1': {'nome': 'ana'}},
+        'hired_candidates': {'v1': ['a1']},
+        'job_embeddings': {'v1': np.ones(4, dtype=np.float32), 'v2': np.zeros(4, dtype=np.float32)},
+        'applicant_embeddings': {'a1': np.ones(4, dtype=np.float32)},
+        'match_details': {'v1': {'a1': {component: 0.5 for component in artifact_store.SCORE_COMPONENTS}}}
+    }
+
+
+def version_directories(directory):
+    return sorted(entry for entry in os.listdir(directory) if entry.startswith("v-"))
+
+
+def test_save_artifacts_publishes_a_new_version(tmp_path):
+    directory = str(tmp_path / "artifacts")
+    save_artifacts(make_data('dev'), directory)
+    first_version = artifacts_version(directory)
+    save_artifacts(make_data('dev senior'), directory)
+
+    assert artifacts_exist(directory)
+    assert artifacts_version(directory) != first_version
+    data = load_artifacts(directory)
+    assert data['processed_jobs']['v1']['titulo'] == 'dev senior'
+    assert data['processed_jobs'].column('cliente', default='-') == ['acme', None]
+    assert data['processed_jobs'].column('salario', default='-') == ['-', '-']
+
+    # A versão anterior fica para leitores em andamento; as mais antigas são removidas
+    save_artifacts(make_data('dev pleno'), directory)
+    assert len(version_directories(directory)) == 2
+    assert load_artifacts(directory)['processed_jobs']['v1']['titulo'] == 'dev pleno'
+
+
+def test_failed_save_keeps_the_published_version(tmp_path, monkeypatch):
+    directory = str(tmp_path / "artifacts")
+    save_artifacts(make_data('dev'), directory)
+    version = artifacts_version(directory)
+
+    def fail(*args):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(artifact_store, "_write_match_details", fail)
+    with pytest.raises(OSError):
+        save_artifacts(make_data('dev senior'), directory)
+
+    assert artifacts_version(directory) == version
+    assert load_artifacts(directory)['processed_jobs']['v1']['titulo'] == 'dev'
+    assert len(version_directories(directory)) == 1
+
+
+def test_legacy_layout_is_read_and_replaced(tmp_path):
+    # Layout antigo: arquivos direto na raiz do diretório, sem CURRENT
+    directory = str(tmp_path / "artifacts")
+    save_artifacts(make_data('dev'), directory)
+    version_directory = artifact_store.current_version_directory(directory)
+    os.remove(os.path.join(directory, CURRENT_FILE))
+    for entry in os.listdir(version_directory):
+        os.replace(os.path.join(version_directory, entry), os.path.join(directory, entry))
+    os.rmdir(version_directory)
+
+    assert load_artifacts(directory)['processed_jobs']['v1']['titulo'] == 'dev'
+    save_artifacts(make_data('dev senior'), directory)
+    assert load_artifacts(directory)['processed_jobs']['v1']['titulo'] == 'dev senior'
+
+    # Os arquivos antigos da raiz saem na publicação seguinte
+    save_artifacts(make_data('dev pleno'), directory)
+    assert sorted(os.listdir(directory)) == sorted([CURRENT_FILE] + version_directories(directory))
@@ -0,0 +1,144 @@
+import json
+import os
+import random
+
+import pytest
+import requests
+
+from data_cache import fetch_json_asset, create_session, iter_json_object_items, local_asset_server
+
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(7 if depth < 3 else 5)
+    if kind == 0:
+        return rng.randint(-10**6, 10**6)
+    if kind == 1:
+        return round(rng.uniform(-1000, 1000), rng.randint(0, 6))
+    if kind == 2:
+        return rng.choice([True, False, None])
+    if kind == 3:
+        return rng.choice(["", "São Paulo", "a\"b", "x\\ny", "ç" * rng.randint(1, 5), "1.25e3"])
+    if kind == 4:
+        return rng.uniform(-1, 1) * 10 ** rng.randint(-8, 8)
+    if kind == 5:
+        return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {f"k{i}": random_value(rng, depth + 1) for i in range(rng.randint(0, 4))}
+
+
+def random_document(rng):
+    return {f"id{i}": random_value(rng) for i in range(rng.randint(0, 8))}
+
+
+def random_chunks(data, rng):
+    chunks = []
+    position = 0
+    while position < len(data):
+        size = rng.randint(1, 8)
+        chunks.append(data[position:position + size])
+        position += size
+    return chunks
+
+
+def encode(document, rng):
+    separators = rng.choice([(',', ':'), (', ', ': '), (' ,\n', ' :\t')])
+    return json.dumps(document, ensure_ascii=rng.random() < 0.5, separators=separators).encode('utf-8')
+
+
+def test_iter_json_object_items_random_chunking():
+    rng = random.Random(0)
+    for _ in range(2000):
+        document = random_document(rng)
+        data = encode(document, rng)
+        assert dict(iter_json_object_items(random_chunks(data, rng))) == document
+
+
+def test_top_level_number_split_after_decimal_point():
+    assert dict(iter_json_object_items([b'{"a": 1.', b'25}'])) == {"a": 1.25}
+    assert dict(iter_json_object_items([b'{"a": 12', b'e3, "b": tr', b'ue}'])) == {"a": 12e3, "b": True}
+    assert dict(iter_json_object_items([b'{"a": -', b'7 ', b' }'])) == {"a": -7}
+
+
+def test_iter_json_object_items_rejects_truncated_document():
+    with pytest.raises(ValueError):
+        dict(iter_json_object_items([b'{"a": 1, "b": ']))
+
+
+def test_fetch_json_asset_from_local_server(tmp_path):
+    rng = random.Random(1)
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    documents = {}
+    for name in ("vagas", "candidates"):
+        documents[name] = random_document(rng)
+        (assets / f"{name}.json").write_bytes(encode(documents[name], rng))
+
+    mirror = str(tmp_path / "mirror")
+    with local_asset_server(str(assets)) as base_url, create_session() as session:
+        for name, document in documents.items():
+            url = f"{base_url}/{name}.json"
+            digest, records = fetch_json_asset(session, url, lambda record: record, name=name,
+                                               mirror_dir=mirror, chunk_size=rng.randint(1, 16))
+            assert records == document
+
+            # Segunda chamada: revalidação condicional (304) servida pelo espelho
+            cached_digest, cached_records = fetch_json_asset(session, url, lambda record: record, name=name,
+                                                             mirror_dir=mirror, chunk_size=rng.randint(1, 16))
+            assert (cached_digest, cached_records) == (digest, document)
+    assert not [path for path in os.listdir(mirror) if path.endswith(".tmp")]
+
+
+class _DroppedConnection:
+    """Resposta 200 cuja conexão cai no meio do corpo"""
+
+    status_code = 200
+    headers = {}
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        yield self.data[:len(self.data) // 2]
+        raise requests.exceptions.ChunkedEncodingError("conexão interrompida")
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _DroppingSession:
+    def __init__(self, data):
+        self.data = data
+
+    def get(self, url, **kwargs):
+        return _DroppedConnection(self.data)
+
+
+def test_fetch_json_asset_falls_back_to_mirror_on_dropped_connection(tmp_path):
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    document = {"1": {"nome": "a"}, "2": {"nome": "b"}}
+    (assets / "vagas.json").write_bytes(json.dumps(document).encode('utf-8'))
+    mirror = str(tmp_path / "mirror")
+    with local_asset_server(str(assets)) as base_url, create_session() as session:
+        url = f"{base_url}/vagas.json"
+        digest, _ = fetch_json_asset(session, url, lambda record: record, name="vagas", mirror_dir=mirror)
+
+    updated = json.dumps({"3": {"nome": "c"}}).encode('utf-8')
+    fallback_digest, records = fetch_json_asset(_DroppingSession(updated), url, lambda record: record,
+                                                name="vagas", mirror_dir=mirror)
+    assert (fallback_digest, records) == (digest, document)
+    assert not [path for path in os.listdir(mirror) if path.endswith(".tmp")]
+
+    # Sem espelho, o erro de rede é propagado
+    with pytest.raises(requests.RequestException):
+        fetch_json_asset(_DroppingSession(updated), url, lambda record: record,
+                         name="vagas", mirror_dir=str(tmp_path / "empty"))
+    assert not os.listdir(tmp_path / "empty")
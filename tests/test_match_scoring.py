@@ -0,0 +1,144 @@
+"""
+Score detalhado vetorizado (data_processing.score_match_block) contra as
+fórmulas escalares por par que ele substituiu, copiadas abaixo.
+
+data_processing importa dependências pesadas do pipeline (spaCy, NLTK,
+sentence-transformers), então só o trecho das funções de score é carregado.
+"""
+
+import os
+import random
+
+import numpy as np
+
+DATA_PROCESSING_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data_processing.py")
+
+
+def load_scoring_functions():
+    with open(DATA_PROCESSING_PATH, 'r', encoding='utf-8') as f:
+        source = f.read()
+    start = source.index("# ==== Funções para Cálculo de Similaridade ====")
+    end = source.index("def refresh_match_details(")
+    namespace = {'np': np}
+    exec(source[start:end], namespace)
+    return namespace
+
+
+# ==== Fórmulas escalares anteriores ====
+def calculate_keyword_similarity(job_keywords, applicant_keywords):
+    if not job_keywords or not applicant_keywords:
+        return 0.0
+    job_keywords_set = set(job_keywords)
+    common_keywords = job_keywords_set.intersection(set(applicant_keywords))
+    return len(common_keywords) / len(job_keywords_set)
+
+
+def calculate_location_similarity(job_location, applicant_location):
+    job_city = job_location.get('cidade', '').lower()
+    job_state = job_location.get('estado', '').lower()
+    job_country = job_location.get('pais', '').lower()
+    app_city = applicant_location.get('cidade', '').lower()
+    app_state = applicant_location.get('estado', '').lower()
+    app_country = applicant_location.get('pais', '').lower()
+    if job_city and app_city and job_city == app_city:
+        return 1.0
+    elif job_state and app_state and job_state == app_state:
+        return 0.7
+    elif job_country and app_country and job_country == app_country:
+        return 0.3
+    else:
+        return 0.0
+
+
+def calculate_level_similarity(job_level, applicant_level):
+    levels = ["estagio", "estágio", "junior", "júnior", "pleno", "senior", "sênior"]
+    job_level = job_level.lower().strip()
+    applicant_level = applicant_level.lower().strip()
+    if job_level == applicant_level:
+        return 1.0
+    if not job_level or not applicant_level:
+        return 0.5
+    job_index = -1
+    app_index = -1
+    for i, level in enumerate(levels):
+        if level in job_level:
+            job_index = i
+        if level in applicant_level:
+            app_index = i
+    if job_index == -1 or app_index == -1:
+        return 0.5
+    if app_index >= job_index:
+        return 1.0
+    return 1.0 - ((job_index - app_index) / (len(levels) - 1))
+
+
+def calculate_text_level(job, applicant, field):
+    if job.get(field, '') and applicant.get(field, ''):
+        return 1.0 if job[field].lower() in applicant[field].lower() else 0.5
+    return 0.5
+
+
+def calculate_match_entry(job, applicant, similarity):
+    scores = {"semantic": similarity, "keywords": 0.0}
+    if 'keywords' in job and 'keywords' in applicant:
+        scores["keywords"] = calculate_keyword_similarity(job.get('keywords', []), applicant.get('keywords', []))
+    location_fields = ("cidade", "estado", "pais")
+    scores["location"] = calculate_location_similarity({field: job.get(field, '') for field in location_fields},
+                                                       {field: applicant.get(field, '') for field in location_fields})
+    scores["professional_level"] = calculate_level_similarity(job.get('nivel_profissional', ''),
+                                                              applicant.get('nivel_profissional', ''))
+    scores["academic_level"] = calculate_text_level(job, applicant, 'nivel_academico')
+    scores["english_level"] = calculate_text_level(job, applicant, 'nivel_ingles')
+    scores["spanish_level"] = calculate_text_level(job, applicant, 'nivel_espanhol')
+
+    weights = {"semantic": 0.4, "keywords": 0.2, "location": 0.1, "professional_level": 0.1,
+               "academic_level": 0.1, "english_level": 0.05, "spanish_level": 0.05}
+    scores["final_score"] = sum(score * weights[key] for key, score in scores.items())
+    return scores
+
+
+# ==== Amostra fixa ====
+LEVELS = ["", "Estagiário", "estagio", "Júnior", "pleno ", "Sênior", "Senior Especialista", "analista", "Pleno/Senior"]
+TEXT_LEVELS = ["", "Ensino Superior Completo", "superior", "Básico", "Fluente", "intermediário"]
+KEYWORDS = ["python", "java", "sql", "aws", "docker", "react"]
+CITIES = ["", "São Paulo", "são paulo", "Campinas"]
+STATES = ["", "SP", "sp", "RJ"]
+
+
+def make_record(rng, functions):
+    record = {
+        'cidade': rng.choice(CITIES),
+        'estado': rng.choice(STATES),
+        'pais': rng.choice(["", "Brasil"]),
+        'nivel_profissional': rng.choice(LEVELS),
+        'nivel_academico': rng.choice(TEXT_LEVELS),
+        'nivel_ingles': rng.choice(TEXT_LEVELS),
+        'nivel_espanhol': rng.choice(TEXT_LEVELS),
+        'keywords': rng.sample(KEYWORDS, rng.randint(0, 4))
+    }
+    if rng.random() < 0.1:
+        del record['keywords']
+    if rng.random() < 0.5:
+        # Ordinal gravado na extração (como em extract_applicant_features)
+        level = record['nivel_profissional'].lower().strip()
+        record['nivel_profissional_ordinal'] = functions['professional_level_ordinal'](level)
+    return record
+
+
+def test_score_match_block_matches_scalar_formulas():
+    functions = load_scoring_functions()
+    rng = random.Random(7)
+    applicants = {f"a{i}": make_record(rng, functions) for i in range(300)}
+    jobs = [make_record(rng, functions) for _ in range(40)]
+    applicant_ids = list(applicants)
+    encoded = functions['encode_match_features'](applicant_ids, applicants)
+    components = functions['MATCH_COMPONENTS'] + ["final_score"]
+
+    similarities = np.random.default_rng(7).random(len(applicant_ids)).astype(np.float32)
+    rows = np.arange(len(applicant_ids))
+    for job in jobs:
+        job_encoded = functions['encode_job_match_features'](job, encoded)
+        scores = functions['score_match_block'](job_encoded, encoded, rows, similarities)
+        for row, applicant_id in enumerate(applicant_ids):
+            expected = calculate_match_entry(job, applicants[applicant_id], float(similarities[row]))
+            assert scores[row].tolist() == [expected[component] for component in components]
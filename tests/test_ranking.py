@@ -0,0 +1,86 @@
+import os
+
+import numpy as np
+
+from ranking import (APP_WEIGHTS, RANKING_COMPONENTS, RankingCache, RecommendationIndex, UncachedRanking,
+                     load_recommendations, rank_job_candidates, save_recommendations)
+
+
+def make_ranking(score):
+    return [{'id': 'a1', 'score': score, 'details': {component: score for component in RANKING_COMPONENTS}}]
+
+
+def test_ranking_cache_reuses_computed_entries():
+    cache = RankingCache(maxsize=4)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return make_ranking(0.9)
+
+    first = cache.get_or_compute('vaga', compute)
+    second = cache.get_or_compute('vaga', compute)
+    assert len(calls) == 1
+    assert first is second
+    assert first[0] == ('a1',)
+
+
+def test_ranking_cache_does_not_store_degraded_rankings():
+    # Ex.: a busca vetorial falhou e o ranking foi calculado com semântica neutra
+    cache = RankingCache(maxsize=4)
+    results = [UncachedRanking(make_ranking(0.5)), make_ranking(0.9)]
+
+    degraded = cache.get_or_compute('vaga', lambda: results.pop(0))
+    assert degraded[1].tolist() == [0.5]
+    assert len(cache) == 0
+
+    # A busca voltou: a próxima chamada recalcula e só então o ranking entra no cache
+    recovered = cache.get_or_compute('vaga', lambda: results.pop(0))
+    assert recovered[1].tolist() == [0.9]
+    assert len(cache) == 1
+    assert cache.get_or_compute('vaga', lambda: make_ranking(0.1)) is recovered
+
+
+def make_index(score, source_version):
+    return RecommendationIndex(
+        ['v1'], ['a1', 'a2'],
+        np.array([[1, -1]], dtype=np.int32),
+        np.array([[score, 0.0]], dtype=np.float32),
+        np.full((1, 2, len(RANKING_COMPONENTS)), score, dtype=np.float32),
+        APP_WEIGHTS,
+        source_version
+    )
+
+
+def test_saved_recommendations_replace_the_published_version(tmp_path):
+    directory = str(tmp_path / "recommendations")
+    save_recommendations(make_index(0.5, 'a'), directory)
+    save_recommendations(make_index(0.75, 'b'), directory)
+
+    assert load_recommendations(directory, source_version='a') is None
+    index = load_recommendations(directory, source_version='b')
+    assert index.get('v1')[0]['id'] == 'a2'
+    assert index.get('v1')[0]['score'] == 0.75
+
+    save_recommendations(make_index(0.25, 'c'), directory)
+    assert len([entry for entry in os.listdir(directory) if entry.startswith("v-")]) == 2
+    assert load_recommendations(directory, source_version='c').get('v1')[0]['score'] == 0.25
+
+
+def test_rank_job_candidates_sums_weighted_scores_in_float64():
+    rng = np.random.default_rng(5)
+    applicant_ids = [f"a{i}" for i in range(500)]
+    applicant_embeddings = {applicant_id: rng.random(8).astype(np.float32) for applicant_id in applicant_ids}
+    job_embeddings = {'v1': rng.random(8).astype(np.float32)}
+    match_details = {'v1': {
+        applicant_id: {component: float(rng.random()) for component in RANKING_COMPONENTS[1:]}
+        for applicant_id in applicant_ids
+    }}
+    processed_applicants = {applicant_id: {} for applicant_id in applicant_ids}
+
+    results = rank_job_candidates('v1', job_embeddings, applicant_embeddings, match_details,
+                                  {'v1': {}}, processed_applicants, top_n=50)
+    for result in results:
+        expected = sum(result['details'][component] * APP_WEIGHTS[component] for component in RANKING_COMPONENTS)
+        assert abs(result['score'] - expected) < 1e-12
+    assert [result['score'] for result in results] == sorted((result['score'] for result in results), reverse=True)
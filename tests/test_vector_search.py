@@ -0,0 +1,21 @@
+import numpy as np
+
+from vector_search import top_k_indices
+
+
+def test_top_k_indices_matches_stable_full_sort():
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        rows, cols, k = rng.integers(1, 20), rng.integers(1, 50), int(rng.integers(0, 60))
+        # Poucos valores distintos: muitos empates, inclusive no limite do top-k
+        scores = rng.integers(0, 4, (rows, cols)).astype(np.float32)
+        indices, top_scores = top_k_indices(scores, k)
+        expected = np.argsort(-scores, axis=1, kind='stable')[:, :min(k, cols)]
+        assert np.array_equal(indices, expected)
+        assert np.array_equal(top_scores, np.take_along_axis(scores, expected, axis=1))
+
+
+def test_top_k_indices_ties_keep_original_order():
+    indices, top_scores = top_k_indices(np.array([1.0, 3.0, 2.0, 3.0, 3.0]), 2)
+    assert indices.tolist() == [[1, 3]]
+    assert top_scores.tolist() == [[3.0, 3.0]]
@@ -0,0 +1,438 @@
+"""
+Busca Vetorial - Decision Recruiter
+
+Funções de similaridade de cosseno em lote sobre matrizes de embeddings
+pré-normalizadas. Substituem o cálculo par a par (um candidato por vez)
+por multiplicações de matrizes e seleção parcial dos melhores resultados.
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+
+def normalize_rows(matrix):
+    """Normaliza cada linha da matriz (norma L2) in-place e retorna a própria matriz."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    # Vetores nulos permanecem nulos (similaridade 0 com qualquer outro vetor)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def build_embedding_matrix(embeddings, ids=None):
+    """
+    Empilha um dicionário {id: vetor} em uma única matriz float32 normalizada.
+
+    Retorna a lista de IDs (na ordem das linhas) e a matriz.
+    """
+    if ids is None:
+        ids = list(embeddings.keys())
+    else:
+        ids = list(ids)
+
+    if not ids:
+        return ids, np.zeros((0, 0), dtype=np.float32)
+
+    matrix = np.vstack([np.asarray(embeddings[item_id], dtype=np.float32) for item_id in ids])
+    return ids, normalize_rows(matrix)
+
+
+def top_k_indices(scores, k):
+    """
+    Seleciona os k maiores scores de cada linha sem ordenar a linha inteira.
+
+    Usa seleção parcial (partition) e ordena apenas os k escolhidos. O resultado
+    é o mesmo de uma ordenação estável completa: empates (inclusive no limite
+    do top-k) ficam na ordem original dos índices; NaN conta como o menor score.
+    Retorna (índices, scores), ambos com formato (n_linhas, k), em ordem decrescente.
+    """
+    scores = np.atleast_2d(scores)
+    n_rows, n_cols = scores.shape
+    k = min(k, n_cols)
+
+    if k <= 0:
+        empty = np.zeros((n_rows, 0), dtype=np.int64)
+        return empty, empty.astype(scores.dtype)
+
+    keys = scores
+    if np.issubdtype(scores.dtype, np.floating) and np.isnan(scores).any():
+        keys = np.where(np.isnan(scores), -np.inf, scores)
+
+    if k < n_cols:
+        # k-ésimo maior valor de cada linha: entram todos os maiores que ele e,
+        # entre os iguais a ele, os de menor índice até completar k
+        kth = -np.partition(-keys, k - 1, axis=1)[:, k - 1:k]
+        greater = keys > kth
+        ties = keys == kth
+        missing = k - greater.sum(axis=1, keepdims=True)
+        selected_mask = greater | (ties & (np.cumsum(ties, axis=1) <= missing))
+        indices = np.nonzero(selected_mask)[1].reshape(n_rows, k)
+    else:
+        indices = np.tile(np.arange(n_cols), (n_rows, 1))
+
+    # Ordenar somente os k selecionados por (-score, índice): os índices já estão
+    # em ordem crescente, então a ordenação estável desempata pelo índice
+    selected = np.take_along_axis(keys, indices, axis=1)
+    order = np.argsort(-selected, axis=1, kind='stable')
+    indices = np.take_along_axis(indices, order, axis=1)
+    return indices, np.take_along_axis(scores, indices, axis=1)
+
+
+def iter_top_k_cosine(query_matrix, candidate_matrix, k, block_size=256):
+    """
+    Percorre as consultas em blocos, calculando o cosseno com todos os candidatos
+    via uma única multiplicação de matrizes por bloco.
+
+    As duas matrizes devem estar normalizadas (ver build_embedding_matrix).
+    Gera tuplas (início_do_bloco, índices, scores) para cada bloco.
+    """
+    for start in range(0, query_matrix.shape[0], block_size):
+        block = query_matrix[start:start + block_size]
+        scores = block @ candidate_matrix.T
+        indices, top_scores = top_k_indices(scores, k)
+        yield start, indices, top_scores
+
+
+# ==== Armazenamento Compacto de Embeddings ====
+# float16 (metade do tamanho) ou int8 com uma escala por vetor (um quarto do tamanho).
+# Os kernels abaixo calculam produtos escalares direto sobre a forma comprimida,
+# convertendo apenas um bloco de linhas por vez para float32.
+EMBEDDING_STORAGE_DTYPES = ("float32", "float16", "int8")
+
+
+def compress_matrix(matrix, dtype="float32"):
+    """
+    Converte uma matriz float32 para o formato de armazenamento.
+
+    Retorna (matriz, escalas); as escalas (float32, uma por linha) só existem
+    no formato int8, em que linha ≈ matriz_int8[linha] * escalas[linha].
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if dtype == "float32":
+        return matrix, None
+    if dtype == "float16":
+        return matrix.astype(np.float16), None
+    if dtype == "int8":
+        scales = np.abs(matrix).max(axis=1) / 127.0 if matrix.size else np.zeros(matrix.shape[0], dtype=np.float32)
+        scales[scales == 0] = 1.0
+        quantized = np.rint(matrix / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+    raise ValueError(f"Formato de embeddings desconhecido: {dtype} (opções: {', '.join(EMBEDDING_STORAGE_DTYPES)})")
+
+
+def decompress_row(row, scale=None):
+    """Reconstrói um vetor float32 a partir de uma linha comprimida"""
+    row = np.asarray(row, dtype=np.float32)
+    return row * scale if scale is not None else row
+
+
+def compressed_dot(matrix, vector, scales=None, block_size=16384):
+    """Produto matriz-vetor sobre a forma comprimida (float32, float16 ou int8 + escalas)"""
+    vector = np.asarray(vector, dtype=np.float32)
+    if matrix.dtype == np.float32 and scales is None:
+        return matrix @ vector
+
+    result = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], block_size):
+        block = np.asarray(matrix[start:start + block_size], dtype=np.float32)
+        result[start:start + block_size] = block @ vector
+    if scales is not None:
+        result *= scales
+    return result
+
+
+def compressed_norms(matrix, scales=None, block_size=16384):
+    """Normas L2 das linhas reconstruídas, calculadas bloco a bloco"""
+    norms = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], block_size):
+        block = np.asarray(matrix[start:start + block_size], dtype=np.float32)
+        norms[start:start + block_size] = np.linalg.norm(block, axis=1)
+    if scales is not None:
+        norms *= scales
+    return norms
+
+
+def embedding_recall_report(job_embeddings, applicant_embeddings, hired_candidates,
+                            dtypes=("float16", "int8"), ks=(10, 50, 100)):
+    """
+    Compara o ranking por cosseno dos formatos compactos com o float32.
+
+    Para cada vaga com candidatos contratados, mede:
+    - hired_recall@k: fração dos contratados que aparece no top-k (verdade de campo);
+    - overlap@k: fração do top-k float32 preservada no formato compacto.
+    Retorna {'jobs': n, 'dtypes': {dtype: {'bytes', 'hired_recall', 'overlap'}}}.
+    """
+    applicant_ids, reference = build_embedding_matrix(applicant_embeddings)
+    position = {applicant_id: i for i, applicant_id in enumerate(applicant_ids)}
+
+    jobs = []
+    for job_id, hired_ids in hired_candidates.items():
+        hired = {position[applicant_id] for applicant_id in hired_ids if applicant_id in position}
+        if hired and job_id in job_embeddings:
+            jobs.append((job_id, hired))
+
+    compressed = {dtype: compress_matrix(reference, dtype) for dtype in dtypes}
+    norms = {dtype: compressed_norms(*compressed[dtype]) for dtype in dtypes}
+    for dtype in dtypes:
+        norms[dtype][norms[dtype] == 0] = 1.0
+
+    all_dtypes = ("float32",) + tuple(dtypes)
+    max_k = max(ks)
+    hired_recall = {dtype: dict.fromkeys(ks, 0.0) for dtype in all_dtypes}
+    overlap = {dtype: dict.fromkeys(ks, 0.0) for dtype in all_dtypes}
+
+    for job_id, hired in jobs:
+        query = np.asarray(job_embeddings[job_id], dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        query = query / query_norm if query_norm else query
+
+        reference_top = top_k_indices(reference @ query, max_k)[0][0]
+        for dtype in all_dtypes:
+            if dtype == "float32":
+                top = reference_top
+            else:
+                matrix, scales = compressed[dtype]
+                top = top_k_indices(compressed_dot(matrix, query, scales) / norms[dtype], max_k)[0][0]
+            for k in ks:
+                top_set = set(top[:k].tolist())
+                hired_recall[dtype][k] += len(top_set & hired) / len(hired)
+                overlap[dtype][k] += len(top_set & set(reference_top[:k].tolist())) / max(1, min(k, len(applicant_ids)))
+
+    report = {'jobs': len(jobs), 'dtypes': {}}
+    for dtype in all_dtypes:
+        matrix, scales = (reference, None) if dtype == "float32" else compressed[dtype]
+        report['dtypes'][dtype] = {
+            'bytes': int(matrix.nbytes + (scales.nbytes if scales is not None else 0)),
+            'hired_recall': {k: value / max(1, len(jobs)) for k, value in hired_recall[dtype].items()},
+            'overlap': {k: value / max(1, len(jobs)) for k, value in overlap[dtype].items()}
+        }
+    return report
+
+
+# ==== Backend de Busca Vetorial Local ====
+# Diretório padrão do índice local persistido
+LOCAL_INDEX_DIR = "decision_ann_index"
+
+
+def stack_prefixed_embeddings(job_embeddings, applicant_embeddings):
+    """
+    Junta embeddings de vagas e candidatos em uma única matriz normalizada,
+    com o mesmo esquema de IDs do Pinecone (job_<id> / candidate_<id>).
+    """
+    job_ids, job_matrix = build_embedding_matrix(job_embeddings)
+    applicant_ids, applicant_matrix = build_embedding_matrix(applicant_embeddings)
+    ids = [f"job_{job_id}" for job_id in job_ids] + [f"candidate_{applicant_id}" for applicant_id in applicant_ids]
+    matrices = [matrix for matrix in (job_matrix, applicant_matrix) if matrix.size]
+    return ids, np.vstack(matrices) if matrices else np.zeros((0, 0), dtype=np.float32)
+
+
+def spherical_kmeans(matrix, n_lists, iterations=10, seed=0, block_size=4096):
+    """K-means com similaridade de cosseno sobre linhas normalizadas; retorna (centróides, atribuições)"""
+    rng = np.random.default_rng(seed)
+    centroids = matrix[rng.choice(len(matrix), n_lists, replace=False)].astype(np.float32)
+
+    def assign(centroids):
+        assignments = np.empty(len(matrix), dtype=np.int64)
+        for start in range(0, len(matrix), block_size):
+            assignments[start:start + block_size] = np.argmax(matrix[start:start + block_size] @ centroids.T, axis=1)
+        return assignments
+
+    for _ in range(iterations):
+        assignments = assign(centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, matrix)
+        # Listas vazias recebem um vetor aleatório do conjunto
+        empty = np.bincount(assignments, minlength=n_lists) == 0
+        sums[empty] = matrix[rng.integers(len(matrix), size=int(empty.sum()))]
+        centroids = normalize_rows(sums)
+
+    return centroids, assign(centroids)
+
+
+class LocalVectorIndex:
+    """
+    Índice vetorial local (IVF) com a mesma interface de consulta do Pinecone.
+
+    Os vetores são agrupados em listas invertidas por k-means; cada consulta
+    compara o vetor apenas com as n_probe listas mais próximas. Os arrays
+    ficam contíguos em disco e podem ser abertos via memory-map.
+    """
+
+    def __init__(self, ids, vectors, centroids, offsets, n_probe=16):
+        self.ids = list(ids)
+        self.vectors = vectors
+        self.centroids = centroids
+        self.offsets = offsets
+        self.n_probe = n_probe
+        self.id_position = {item_id: i for i, item_id in enumerate(self.ids)}
+
+    @classmethod
+    def build(cls, ids, matrix, n_lists=None, n_probe=16, iterations=10):
+        """Constrói o índice a partir de uma matriz de embeddings normalizada"""
+        if n_lists is None:
+            n_lists = max(1, int(np.sqrt(len(ids))))
+        n_lists = min(n_lists, len(ids))
+        centroids, assignments = spherical_kmeans(matrix, n_lists, iterations)
+
+        # Reordenar os vetores por lista para que cada lista seja uma fatia contígua
+        order = np.argsort(assignments, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))])
+        return cls([ids[i] for i in order], np.ascontiguousarray(matrix[order]), centroids,
+                   offsets.astype(np.int64), n_probe)
+
+    def save(self, directory=LOCAL_INDEX_DIR):
+        """Persiste o índice em disco"""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "vectors.npy"), np.asarray(self.vectors, dtype=np.float32))
+        np.save(os.path.join(directory, "centroids.npy"), np.asarray(self.centroids, dtype=np.float32))
+        np.save(os.path.join(directory, "offsets.npy"), np.asarray(self.offsets, dtype=np.int64))
+        with open(os.path.join(directory, "ids.json"), 'w', encoding='utf-8') as f:
+            json.dump(self.ids, f)
+        with open(os.path.join(directory, "config.json"), 'w', encoding='utf-8') as f:
+            json.dump({"n_probe": self.n_probe}, f)
+
+    @classmethod
+    def load(cls, directory=LOCAL_INDEX_DIR, mmap=True):
+        """Carrega um índice persistido (vetores via memory-map por padrão)"""
+        mmap_mode = 'r' if mmap else None
+        with open(os.path.join(directory, "ids.json"), 'r', encoding='utf-8') as f:
+            ids = json.load(f)
+        with open(os.path.join(directory, "config.json"), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(
+            ids,
+            np.load(os.path.join(directory, "vectors.npy"), mmap_mode=mmap_mode),
+            np.load(os.path.join(directory, "centroids.npy")),
+            np.load(os.path.join(directory, "offsets.npy")),
+            config.get("n_probe", 16)
+        )
+
+    def search(self, vector, top_k=10, n_probe=None):
+        """Retorna (posições, scores) dos top_k vetores mais similares, em ordem decrescente"""
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+
+        # Listas invertidas mais próximas do vetor de consulta
+        n_probe = min(n_probe or self.n_probe, len(self.centroids))
+        probe_lists, _ = top_k_indices(self.centroids @ vector, n_probe)
+        candidate_positions = np.concatenate([
+            np.arange(self.offsets[list_idx], self.offsets[list_idx + 1]) for list_idx in probe_lists[0]
+        ])
+        if not len(candidate_positions):
+            return candidate_positions, np.zeros(0, dtype=np.float32)
+
+        scores = self.vectors[candidate_positions] @ vector
+        indices, top_scores = top_k_indices(scores, top_k)
+        return candidate_positions[indices[0]], top_scores[0]
+
+    def query(self, vector=None, id=None, top_k=10, include_values=False, include_metadata=False, **kwargs):
+        """
+        Consulta no formato do Pinecone: por vetor ou pelo ID de um vetor já indexado.
+        Retorna {'matches': [{'id', 'score', 'values'?, 'metadata'?}, ...]}.
+        """
+        if vector is None:
+            position = self.id_position.get(id)
+            if position is None:
+                return {'matches': []}
+            vector = self.vectors[position]
+
+        positions, scores = self.search(vector, top_k)
+        matches = []
+        for position, score in zip(positions, scores):
+            item_id = self.ids[position]
+            match = {'id': item_id, 'score': float(score)}
+            if include_values:
+                match['values'] = self.vectors[position].tolist()
+            if include_metadata:
+                item_type, _, raw_id = item_id.partition('_')
+                match['metadata'] = {'type': item_type, f"{item_type}_id": raw_id}
+            matches.append(match)
+        return {'matches': matches}
+
+
+def build_local_index(job_embeddings, applicant_embeddings, **kwargs):
+    """Constrói o índice local a partir dos embeddings de vagas e candidatos"""
+    ids, matrix = stack_prefixed_embeddings(job_embeddings, applicant_embeddings)
+    return LocalVectorIndex.build(ids, matrix, **kwargs)
+
+
+def local_index_exists(directory=LOCAL_INDEX_DIR):
+    """Verifica se há um índice local persistido no diretório"""
+    return os.path.exists(os.path.join(directory, "config.json"))
+
+
+def benchmark_backends(backends, job_ids, top_k=50, repeats=3):
+    """
+    Mede a latência da busca de candidatos por vaga em cada backend.
+
+    Reproduz o padrão do app (vetor da vaga por ID + busca por similaridade)
+    e retorna {nome: {'mean_ms', 'p50_ms', 'p95_ms', 'queries'}}.
+    """
+    results = {}
+    for name, index in backends.items():
+        latencies = []
+        for job_id in job_ids:
+            for _ in range(repeats):
+                start = time.perf_counter()
+                job_response = index.query(id=f"job_{job_id}", top_k=1, include_values=True)
+                if job_response['matches']:
+                    index.query(vector=job_response['matches'][0]['values'], top_k=top_k * 3, include_metadata=True)
+                latencies.append((time.perf_counter() - start) * 1000)
+        if latencies:
+            results[name] = {
+                'mean_ms': float(np.mean(latencies)),
+                'p50_ms': float(np.percentile(latencies, 50)),
+                'p95_ms': float(np.percentile(latencies, 95)),
+                'queries': len(latencies)
+            }
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from artifact_store import ARTIFACT_DIR, load_artifacts
+
+    parser = argparse.ArgumentParser(description="Índice vetorial local do Decision Recruiter")
+    parser.add_argument("command", choices=["build", "benchmark", "recall"])
+    parser.add_argument("--artifacts", default=ARTIFACT_DIR, help="diretório dos artefatos processados")
+    parser.add_argument("--index", default=LOCAL_INDEX_DIR, help="diretório do índice local")
+    parser.add_argument("--jobs", type=int, default=20, help="número de vagas usadas no benchmark")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        artifacts = load_artifacts(args.artifacts)
+        print("Construindo índice vetorial local...")
+        build_local_index(artifacts['job_embeddings'], artifacts['applicant_embeddings']).save(args.index)
+        print(f"Índice salvo em '{args.index}'")
+    elif args.command == "recall":
+        # Recall dos formatos compactos de embeddings (float16 / int8) contra o float32
+        artifacts = load_artifacts(args.artifacts)
+        if artifacts['applicant_embeddings'].matrix.dtype != np.float32:
+            print("Aviso: os artefatos já estão comprimidos; a referência deveria ser float32")
+        report = embedding_recall_report(artifacts['job_embeddings'], artifacts['applicant_embeddings'],
+                                         artifacts['hired_candidates'])
+        print(f"Vagas com contratados avaliadas: {report['jobs']}")
+        for dtype, stats in report['dtypes'].items():
+            recall = " | ".join(f"@{k}: {value:.3f}" for k, value in stats['hired_recall'].items())
+            overlap = " | ".join(f"@{k}: {value:.3f}" for k, value in stats['overlap'].items())
+            print(f"{dtype:>8}: {stats['bytes'] / 2**20:.1f} MB | recall contratados {recall} | overlap float32 {overlap}")
+    else:
+        local_index = LocalVectorIndex.load(args.index)
+        job_ids = [item_id[len("job_"):] for item_id in local_index.ids if item_id.startswith("job_")][:args.jobs]
+        backends = {"local": local_index}
+
+        # O Pinecone só entra no benchmark se houver chave configurada
+        api_key = os.environ.get("PINECONE_API_KEY")
+        if api_key:
+            from pinecone import Pinecone
+            backends["pinecone"] = Pinecone(api_key=api_key).Index("decision-recruiter")
+
+        for name, stats in benchmark_backends(backends, job_ids).items():
+            print(f"{name}: média {stats['mean_ms']:.1f} ms | p50 {stats['p50_ms']:.1f} ms | "
+                  f"p95 {stats['p95_ms']:.1f} ms ({stats['queries']} consultas)")